@@ -0,0 +1,322 @@
+from collections import OrderedDict, deque
+
+from algorithms import PageReplacementAlgorithm
+from registry import register
+
+'''
+-------------------------------------------------------------------------------------
+ POLÍTICAS ADAPTATIVAS (resistentes a varreduras)
+
+ - LRU, LFU e CLOCK deixam uma varredura sequencial expulsar o conjunto quente:
+   cada página da varredura é usada uma vez e mesmo assim ocupa um frame.
+ - As três políticas abaixo separam páginas vistas uma vez (recência) das vistas
+   mais de uma vez (frequência) e guardam "fantasmas": só o ID de páginas expulsas
+   recentemente, sem frame. Um acerto no fantasma revela que a página foi expulsa
+   cedo demais.
+ - ARC (Megiddo e Modha, 2003): T1/T2 residentes e B1/B2 fantasmas em LRU; o alvo p
+   (tamanho desejado de T1) cresce a cada acerto em B1 e diminui a cada acerto em B2.
+ - CAR (Bansal e Modha, 2004): o ARC com T1/T2 em relógio (bit R), sem mover nada
+   no HIT, como o CLOCK.
+ - 2Q (Johnson e Shasha, 1994): A1in (FIFO das páginas novas), A1out (fantasmas
+   das que saíram de A1in) e Am (LRU das páginas que voltaram enquanto fantasmas).
+ Todas em O(1) por referência (CAR: O(1) amortizado nos giros do relógio).
+-------------------------------------------------------------------------------------
+'''
+
+@register('ARC')
+class ARC(PageReplacementAlgorithm):
+    """
+    Adaptive Replacement Cache. T1/T2 guardam página -> frame em ordem de uso (a
+    primeira chave é a LRU); B1/B2 só as páginas fantasmas. |T1| + |T2| <= c e
+    |T1| + |T2| + |B1| + |B2| <= 2c.
+    """
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0.0  # Tamanho alvo de T1
+
+    def access(self, page_id, is_write=None):
+        # 1. HIT: qualquer acerto promove a página para T2 (MRU)
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            if page_id in self.t1:
+                del self.t1[page_id]
+                self.t2[page_id] = idx
+            else:
+                self.t2.move_to_end(page_id)
+            if is_write:
+                self.modified[idx] = 1
+            return True
+
+        # 2. MISS
+        self.page_faults += 1
+        capacity = self.capacity
+
+        if page_id in self.b1:
+            # Fantasma de T1: a recência merece mais espaço
+            self.p = min(capacity, self.p + max(len(self.b2) / len(self.b1), 1))
+            del self.b1[page_id]
+            frame_idx = self._replace(False)
+            target = self.t2
+        elif page_id in self.b2:
+            # Fantasma de T2: a frequência merece mais espaço
+            self.p = max(0.0, self.p - max(len(self.b1) / len(self.b2), 1))
+            del self.b2[page_id]
+            frame_idx = self._replace(True)
+            target = self.t2
+        else:
+            target = self.t1
+            l1 = len(self.t1) + len(self.b1)
+            if l1 == capacity:
+                if len(self.t1) < capacity:
+                    self.b1.popitem(last=False)
+                    frame_idx = self._replace(False)
+                else:
+                    # B1 vazio e T1 ocupa tudo: a LRU de T1 sai sem virar fantasma
+                    self.evictions += 1
+                    _victim, frame_idx = self.t1.popitem(last=False)
+            else:
+                total = l1 + len(self.t2) + len(self.b2)
+                if total >= 2 * capacity:
+                    self.b2.popitem(last=False)
+                frame_idx = self._replace(False)
+
+        self._load(frame_idx, page_id, is_write)
+        target[page_id] = frame_idx
+        return False
+
+    def _replace(self, in_b2):
+        # Frame livre enquanto a memória não encheu; depois a vítima vira fantasma
+        if self.free_frames:
+            return self.free_frames.pop()
+        self.evictions += 1
+        return self._demote(in_b2)
+
+    def _demote(self, in_b2, keep=None):
+        t1_size = len(self.t1)
+        from_t1 = t1_size and (t1_size > self.p or (in_b2 and t1_size == self.p) or not self.t2)
+        if keep is not None:
+            source = self.t1 if from_t1 else self.t2
+            if len(source) == 1 and keep in source:
+                # keep é a única da lista escolhida: a vítima sai da outra
+                from_t1 = not from_t1
+        if from_t1:
+            victim = self._oldest(self.t1, keep)
+            frame_idx = self.t1.pop(victim)
+            self.b1[victim] = None
+        else:
+            victim = self._oldest(self.t2, keep)
+            frame_idx = self.t2.pop(victim)
+            self.b2[victim] = None
+        return frame_idx
+
+    def _evict_victim(self, keep=None):
+        return self._demote(False, keep)
+
+    def _admitted(self, page_id, frame_idx):
+        # Pré-busca não é referência: um fantasma só sai do diretório (p não muda)
+        # e a página entra em T1 como nova
+        self.b1.pop(page_id, None)
+        self.b2.pop(page_id, None)
+        self.t1[page_id] = frame_idx
+        _trim_ghosts(self, self.capacity)
+
+    def _remap(self, order, new_capacity):
+        new_frame_of = {frame: new_frame for new_frame, frame in enumerate(order)}
+        for resident in (self.t1, self.t2):
+            for page_id, frame_idx in resident.items():
+                resident[page_id] = new_frame_of[frame_idx]
+        _trim_ghosts(self, new_capacity)
+
+
+def _trim_ghosts(policy, capacity):
+    # Depois de encolher: |T1| + |B1| <= c e o diretório inteiro <= 2c de novo
+    while len(policy.t1) + len(policy.b1) > capacity and policy.b1:
+        policy.b1.popitem(last=False)
+    while len(policy.t1) + len(policy.t2) + len(policy.b1) + len(policy.b2) > 2 * capacity and policy.b2:
+        policy.b2.popitem(last=False)
+    policy.p = min(policy.p, capacity)
+
+
+@register('CAR')
+class CAR(PageReplacementAlgorithm):
+    """
+    Clock with Adaptive Replacement. T1/T2 são relógios (deque: a cabeça é o
+    ponteiro, girar = tirar da cabeça e pôr no fim) com o bit R em bytearray por
+    frame; B1/B2 são fantasmas em LRU como no ARC. O HIT só liga o bit R.
+    """
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.t1 = deque()
+        self.t2 = deque()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.r_bits = bytearray(capacity)
+        self.p = 0.0
+
+    def access(self, page_id, is_write=None):
+        # 1. HIT
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            self.r_bits[idx] = 1
+            if is_write:
+                self.modified[idx] = 1
+            return True
+
+        # 2. MISS
+        self.page_faults += 1
+        capacity = self.capacity
+        in_b1 = page_id in self.b1
+        in_b2 = not in_b1 and page_id in self.b2
+
+        if self.free_frames:
+            frame_idx = self.free_frames.pop()
+        else:
+            self.evictions += 1
+            frame_idx = self._replace()
+            # Mantém o diretório (residentes + fantasmas) dentro de 2c
+            if not in_b1 and not in_b2:
+                if len(self.t1) + len(self.b1) == capacity:
+                    self.b1.popitem(last=False)
+                elif len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) == 2 * capacity:
+                    self.b2.popitem(last=False)
+
+        if in_b1:
+            self.p = min(capacity, self.p + max(len(self.b2) / len(self.b1), 1))
+            del self.b1[page_id]
+            self.t2.append(page_id)
+        elif in_b2:
+            self.p = max(0.0, self.p - max(len(self.b1) / len(self.b2), 1))
+            del self.b2[page_id]
+            self.t2.append(page_id)
+        else:
+            self.t1.append(page_id)
+
+        self._load(frame_idx, page_id, is_write)
+        self.r_bits[frame_idx] = 0
+        return False
+
+    def _replace(self, keep=None):
+        # Gira os relógios até achar uma página com R = 0; páginas com R = 1 de T1
+        # foram usadas de novo e passam para T2 (keep é tratada como R = 1; um T2
+        # só com keep não tem vítima e a vez é de T1)
+        page_table = self.page_table
+        r_bits = self.r_bits
+        t2 = self.t2
+        while True:
+            if self.t1 and (len(self.t1) >= max(1, self.p) or not t2 or (len(t2) == 1 and t2[0] == keep)):
+                page_id = self.t1.popleft()
+                frame_idx = page_table[page_id]
+                if not r_bits[frame_idx] and page_id != keep:
+                    self.b1[page_id] = None
+                    return frame_idx
+                r_bits[frame_idx] = 0
+                self.t2.append(page_id)
+            else:
+                page_id = self.t2.popleft()
+                frame_idx = page_table[page_id]
+                if not r_bits[frame_idx] and page_id != keep:
+                    self.b2[page_id] = None
+                    return frame_idx
+                r_bits[frame_idx] = 0
+                self.t2.append(page_id)
+
+    def _evict_victim(self, keep=None):
+        return self._replace(keep)
+
+    def _admitted(self, page_id, frame_idx):
+        # Como no ARC: fantasma sai sem mexer em p, a página entra em T1 com R = 0
+        self.b1.pop(page_id, None)
+        self.b2.pop(page_id, None)
+        self.t1.append(page_id)
+        self.r_bits[frame_idx] = 0
+        _trim_ghosts(self, self.capacity)
+
+    def _remap(self, order, new_capacity):
+        self.r_bits = bytearray(self.r_bits[frame] for frame in order) + bytearray(new_capacity - len(order))
+        _trim_ghosts(self, new_capacity)
+
+
+@register('2Q', aliases=('TWOQ',))
+class TWOQUEUE(PageReplacementAlgorithm):
+    """
+    2Q completo. Página nova entra em A1in (FIFO); ao sair de A1in vira fantasma em
+    A1out; se for referenciada enquanto fantasma, volta direto para Am (LRU).
+    Uma varredura passa só por A1in e A1out, sem tocar no conjunto quente em Am.
+    kin / kout: tamanhos de A1in e A1out como fração da capacidade (25% e 50%,
+    os valores sugeridos pelos autores).
+    """
+    def __init__(self, capacity, kin=0.25, kout=0.5):
+        super().__init__(capacity)
+        self.a1in = OrderedDict()   # página -> frame, em ordem de chegada
+        self.a1out = OrderedDict()  # fantasmas, em ordem de saída
+        self.am = OrderedDict()     # página -> frame, em ordem de uso
+        self.kin_ratio = kin
+        self.kout_ratio = kout
+        self.kin = max(1, int(capacity * kin))
+        self.kout = max(1, int(capacity * kout))
+
+    def access(self, page_id, is_write=None):
+        # 1. HIT: só Am reordena; A1in é FIFO e não muda no acerto
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            if page_id in self.am:
+                self.am.move_to_end(page_id)
+            if is_write:
+                self.modified[idx] = 1
+            return True
+
+        # 2. MISS
+        self.page_faults += 1
+        # O fantasma é consultado antes de liberar o frame: a evicção empurra um
+        # fantasma novo e poderia descartar justamente esta página
+        if page_id in self.a1out:
+            del self.a1out[page_id]
+            frame_idx = self._reclaim()
+            self.am[page_id] = frame_idx
+        else:
+            frame_idx = self._reclaim()
+            self.a1in[page_id] = frame_idx
+        self._load(frame_idx, page_id, is_write)
+        return False
+
+    def _reclaim(self):
+        if self.free_frames:
+            return self.free_frames.pop()
+        self.evictions += 1
+        return self._evict_victim()
+
+    def _evict_victim(self, keep=None):
+        from_a1in = len(self.a1in) > self.kin or not self.am
+        if keep is not None:
+            source = self.a1in if from_a1in else self.am
+            if len(source) == 1 and keep in source:
+                # keep é a única da fila escolhida: a vítima sai da outra
+                from_a1in = not from_a1in
+        if from_a1in:
+            victim = self._oldest(self.a1in, keep)
+            frame_idx = self.a1in.pop(victim)
+            self.a1out[victim] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            frame_idx = self.am.pop(self._oldest(self.am, keep))
+        return frame_idx
+
+    def _admitted(self, page_id, frame_idx):
+        # Sem referência a página não volta para Am: o fantasma some e ela entra em A1in
+        self.a1out.pop(page_id, None)
+        self.a1in[page_id] = frame_idx
+
+    def _remap(self, order, new_capacity):
+        new_frame_of = {frame: new_frame for new_frame, frame in enumerate(order)}
+        for resident in (self.a1in, self.am):
+            for page_id, frame_idx in resident.items():
+                resident[page_id] = new_frame_of[frame_idx]
+        self.kin = max(1, int(new_capacity * self.kin_ratio))
+        self.kout = max(1, int(new_capacity * self.kout_ratio))
+        while len(self.a1out) > self.kout:
+            self.a1out.popitem(last=False)
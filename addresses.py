@@ -0,0 +1,124 @@
+from array import array
+
+import numpy as np
+
+from traces import TraceFormatError, map_binary_file, open_trace
+
+'''
+-------------------------------------------------------------------------------------
+ TRACES DE ENDEREÇOS VIRTUAIS (NumPy)
+
+ - O traçador grava endereços, não páginas: um endereço por linha, decimal ou
+   hexadecimal com 0x (com --hex, hexadecimal mesmo sem o prefixo), opcionalmente
+   seguido de R/W como nos traces de páginas. O formato binário de traces.py também
+   serve, com os endereços no lugar das páginas (largura 8).
+ - Os endereços são lidos uma única vez num np.ndarray uint64; cada tamanho de
+   página só aplica máscara e deslocamento vetorizados sobre esse mesmo buffer:
+   página = (endereço & máscara do espaço virtual) >> log2(tamanho da página).
+ - Na varredura a memória física é fixa em bytes: com páginas de P bytes cabem
+   memória // P frames. O custo memória x tempo sai em bytes (resident_time * P),
+   comparável entre tamanhos de página.
+-------------------------------------------------------------------------------------
+'''
+
+SIZE_SUFFIXES = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+DEFAULT_PAGE_SIZES = '4K,16K,64K,2M'
+
+def parse_size(text):
+    """'4096', '4K', '2M', '1G' -> bytes."""
+    text = text.strip().upper().removesuffix('B')
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    digits = text[:-1] if text[-1:] in SIZE_SUFFIXES else text
+    if not digits.isdigit() or int(digits) < 1:
+        raise ValueError(f"tamanho inválido '{text}'")
+    return int(digits) * multiplier
+
+
+def parse_page_sizes(text):
+    """Lista 'A,B,...' de tamanhos de página (potências de 2), em bytes."""
+    sizes = [parse_size(part) for part in text.split(',')]
+    for size in sizes:
+        # Com páginas de 2 bytes ou mais o número da página sempre cabe em int64
+        if size < 2 or size & (size - 1):
+            raise ValueError(f"o tamanho de página {format_size(size)} não é potência de 2 (>= 2)")
+    return sizes
+
+
+def format_size(size):
+    for suffix, multiplier in sorted(SIZE_SUFFIXES.items(), key=lambda item: -item[1]):
+        if size % multiplier == 0:
+            return f"{size // multiplier}{suffix}"
+    return str(size)
+
+
+def load_address_records(path, hex_addresses=False):
+    """
+    Lê o trace de endereços: (endereços em np.ndarray uint64, escritas ou None),
+    com as escritas nas mesmas regras de traces.load_trace_records.
+    Binário: visão direta do mmap (sem parsing).
+    """
+    trace_file, binary = open_trace(path)
+    if binary:
+        with trace_file:
+            addresses, writes = map_binary_file(trace_file)
+        return np.asarray(addresses).astype(np.uint64, copy=False), writes
+
+    addresses = array('Q')
+    write_positions = []
+    marked = False
+    with trace_file:
+        for line_number, line in enumerate(trace_file, 1):
+            parts = line.split()
+            if not parts:
+                continue
+            if len(parts) > 2 or (len(parts) == 2 and parts[1].upper() not in (b'R', b'W')):
+                raise TraceFormatError(line_number, line.decode(errors='replace').strip())
+            # Base 16 só com o prefixo 0x (ou --hex): 0100 é decimal, não octal
+            token = parts[0]
+            try:
+                addresses.append(int(token, 16 if hex_addresses or token[:2] in (b'0x', b'0X') else 10))
+            except (ValueError, OverflowError):
+                raise TraceFormatError(line_number, line.decode(errors='replace').strip()) from None
+            if len(parts) == 2:
+                marked = True
+                if parts[1].upper() == b'W':
+                    write_positions.append(len(addresses) - 1)
+
+    writes = None
+    if marked:
+        writes = bytearray(len(addresses))
+        for pos in write_positions:
+            writes[pos] = 1
+    return np.frombuffer(addresses, dtype=np.uint64), writes
+
+
+def address_pages(addresses, page_size, va_bits=64):
+    """
+    Números de página de todos os endereços (máscara + deslocamento vetorizados).
+    Devolve uma memoryview de int64, que os simuladores percorrem como o trace
+    binário mapeado.
+    """
+    shift = page_size.bit_length() - 1
+    if va_bits < 64:
+        pages = addresses & np.uint64((1 << va_bits) - 1)
+        pages >>= np.uint64(shift)
+    else:
+        pages = addresses >> np.uint64(shift)
+    return memoryview(pages.view(np.int64))
+
+
+def distinct_page_counts(addresses, page_sizes, va_bits=64):
+    """
+    Páginas distintas para cada tamanho de página. Os endereços (mascarados) são
+    ordenados uma vez só; o deslocamento preserva a ordem, então cada tamanho custa
+    uma passada contando as trocas de página no vetor ordenado.
+    """
+    if len(addresses) == 0:
+        return [0] * len(page_sizes)
+    ordered = addresses & np.uint64((1 << va_bits) - 1) if va_bits < 64 else addresses.copy()
+    ordered.sort()
+    counts = []
+    for page_size in page_sizes:
+        pages = ordered >> np.uint64(page_size.bit_length() - 1)
+        counts.append(1 + int(np.count_nonzero(pages[1:] != pages[:-1])))
+    return counts
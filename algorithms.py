@@ -1,4 +1,15 @@
+import heapq
+import pickle
+import zlib
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from itertools import repeat
+
+from registry import register
+
+# Atributos que attach_events() põe na instância (ficam fora do snapshot)
+EVENT_ATTRIBUTES = ('events', 'run', '_release')
 
 ''' 
 -------------------------------------------------------------------------------------
@@ -14,25 +25,322 @@ class PageReplacementAlgorithm(ABC):
         # Memória física fixa: preenchida com -1 para indicar vazio
         # O índice da lista representa o ID DO FRAME (0, 1, 2...)
         self.memory = [-1] * capacity 
+        # Índice página -> frame: detecta HIT em O(1) sem varrer self.memory
+        self.page_table = {}
+        # Pilha de frames livres. O topo (fim da lista) é sempre o menor índice livre,
+        # o mesmo frame que self.memory.index(-1) devolveria
+        self.free_frames = list(range(capacity - 1, -1, -1))
         self.page_faults = 0
         self.evictions = 0
+        # Bit M (modificada) de cada frame: uma vítima suja precisa ser gravada no disco
+        self.modified = bytearray(capacity)
+        self.writebacks = 0
+        # Conjunto residente ao longo do tempo (ver run_metered): soma, referência a
+        # referência, das páginas residentes (produto memória x tempo) e o pico
+        self.resident_time = 0
+        self.peak_resident = 0
+        self.metered_refs = 0
+
+    # Políticas que mudam o conjunto residente por conta própria (Working-Set, PFF)
+    # medem a residência dentro do access()
+    dynamic_residency = False
+    # Filas circulares (SECONDCHANCE) exibem a memória a partir da cabeça da fila
+    display_from_head = False
     
     @abstractmethod
-    def access(self, page_id):
+    def access(self, page_id, is_write=None):
+        # is_write: True/False vindo do trace (R/W) ou None quando o trace não informa
         pass
 
+    def _load(self, frame_idx, page_id, is_write=None):
+        # Coloca a página no frame, tirando do índice a página que estava lá (vítima)
+        old_page = self.memory[frame_idx]
+        if old_page != -1:
+            del self.page_table[old_page]
+            if self.modified[frame_idx]:
+                self.writebacks += 1
+        self.memory[frame_idx] = page_id
+        self.page_table[page_id] = frame_idx
+        self.modified[frame_idx] = 1 if is_write else 0
+
+    def run(self, references, hit_map=None, writes=None):
+        """
+        Simula um lote de referências de uma vez e devolve quantas foram HIT.
+        Se hit_map (bytearray) for passado, recebe 1 (HIT) ou 0 (MISS) por referência.
+        writes (opcional) traz 1 (escrita) ou 0 (leitura) para cada referência.
+        Esta versão genérica só chama access(); as subclasses podem sobrescrever
+        com um laço apertado em variáveis locais, sem despacho de método por referência.
+        """
+        access = self.access
+        flags = writes if writes is not None else repeat(None)
+        hits = 0
+        if hit_map is None:
+            for page_id, is_write in zip(references, flags):
+                if access(page_id, is_write):
+                    hits += 1
+        else:
+            record = hit_map.append
+            for page_id, is_write in zip(references, flags):
+                if access(page_id, is_write):
+                    hits += 1
+                    record(1)
+                else:
+                    record(0)
+        return hits
+
+    def io_time(self, read_latency, write_latency):
+        # Custo de E/S estimado: cada falta lê a página do disco e cada vítima suja é gravada
+        return self.page_faults * read_latency + self.writebacks * write_latency
+
+    def run_metered(self, references, writes=None):
+        """
+        run() que também mede o conjunto residente (resident_time / peak_resident).
+        Com capacidade fixa o conjunto residente só cresce, uma página por falta,
+        até encher: com a memória cheia o lote vai inteiro pelo run() normal; senão
+        o hit_map do lote diz em que referência cada frame foi ocupado.
+        """
+        if self.dynamic_residency:
+            return self.run(references, writes=writes)
+
+        resident = len(self.page_table)
+        capacity = self.capacity
+        if resident == capacity:
+            hits = self.run(references, writes=writes)
+            self.resident_time += resident * len(references)
+        else:
+            hit_map = bytearray()
+            hits = self.run(references, hit_map, writes)
+            total = 0
+            for hit in hit_map:
+                if not hit and resident < capacity:
+                    resident += 1
+                total += resident
+            self.resident_time += total
+        self.metered_refs += len(references)
+        self.peak_resident = max(self.peak_resident, len(self.page_table))
+        return hits
+
+    def _meter(self):
+        # Uma referência das políticas com residência dinâmica
+        resident = len(self.page_table)
+        self.resident_time += resident
+        self.metered_refs += 1
+        if resident > self.peak_resident:
+            self.peak_resident = resident
+
+    def average_resident(self):
+        return self.resident_time / self.metered_refs if self.metered_refs else 0.0
+
+    # --- Capacidade variável ---
+    def resize(self, new_capacity):
+        """
+        Muda a quantidade de frames em tempo de execução.
+        Encolher abaixo do conjunto residente expulsa páginas escolhidas pela própria
+        política (_evict_victim), como numa falta comum; as vítimas contam como
+        evicções e as sujas como writebacks. Depois as páginas que sobraram são
+        realocadas nos frames 0..k-1 na ordem da política (_frame_order) e os frames
+        restantes ficam livres.
+        """
+        if new_capacity < 1:
+            raise ValueError("a capacidade deve ser pelo menos 1 frame")
+        resident = len(self.page_table)
+        if new_capacity == self.capacity:
+            return
+        if new_capacity < resident:
+            # Compacta para a memória ficar cheia: as políticas só escolhem vítimas
+            # com a memória cheia (sem frames vazios no meio do relógio/fila)
+            if resident < self.capacity:
+                self._relayout(resident)
+            for _ in range(resident - new_capacity):
+                self._release(self._evict_victim())
+        self._relayout(new_capacity)
+
+    def _frame_pages(self):
+        # Página de cada frame físico (o SECONDCHANCE guarda num anel próprio)
+        return self.memory
+
+    def _release(self, frame_idx):
+        # Tira a página do frame (evicção sem substituta); quem chama cuida do frame livre
+        pages = self._frame_pages()
+        del self.page_table[pages[frame_idx]]
+        pages[frame_idx] = -1
+        self.evictions += 1
+        if self.modified[frame_idx]:
+            self.writebacks += 1
+            self.modified[frame_idx] = 0
+
+    def _evict_victim(self, keep=None):
+        # Escolhe a vítima com a memória cheia, tira-a das estruturas da política e
+        # devolve o frame (page_table e memory ficam para _release). A página keep
+        # (se residente) nunca é escolhida
+        raise NotImplementedError(f"{type(self).__name__} não suporta resize")
+
+    def _oldest(self, queue, keep=None):
+        # Primeira chave (a mais antiga) de um dict ordenado que não seja keep
+        keys = iter(queue)
+        key = next(keys)
+        return next(keys) if key == keep else key
+
+    def _frame_order(self):
+        # Frames ocupados na ordem em que devem ficar depois do resize (padrão: a atual)
+        return [frame for frame, page in enumerate(self._frame_pages()) if page != -1]
+
+    def _circular_order(self, start):
+        # Frames ocupados numa volta a partir de start (políticas de fila/relógio)
+        pages = self._frame_pages()
+        capacity = self.capacity
+        return [frame for frame in (start + i if start + i < capacity else start + i - capacity
+                                    for i in range(capacity)) if pages[frame] != -1]
+
+    def _relayout(self, new_capacity):
+        order = self._frame_order()
+        pages = self._frame_pages()
+        kept = [pages[frame] for frame in order]
+        free = new_capacity - len(kept)
+
+        self.modified = bytearray(self.modified[frame] for frame in order) + bytearray(free)
+        self.memory = kept + [-1] * free
+        # Atribuição em chave existente não muda a ordem (o LRU usa a ordem do dict)
+        page_table = self.page_table
+        for frame_idx, page in enumerate(kept):
+            page_table[page] = frame_idx
+        self.free_frames = list(range(new_capacity - 1, len(kept) - 1, -1))
+        self.capacity = new_capacity
+        self._remap(order, new_capacity)
+
+    def _remap(self, order, new_capacity):
+        # Estado da política indexado por frame: order[i] é o frame antigo do novo frame i
+        pass
+
+    # --- Pré-busca ---
+    def admit(self, page_id, keep=None):
+        """
+        Traz page_id para a memória sem contar uma referência (pré-busca): não é
+        falta e nenhum relógio, contador ou janela da política anda. A página entra
+        sem bit R e com contador 0 onde a política tiver essas marcas. Com a memória
+        cheia a vítima é a da própria política (_evict_victim) e conta como evicção,
+        mas nunca é keep (a página que acabou de ser pedida).
+        Devolve False se a página já estava na memória ou se só keep poderia sair.
+        """
+        if self.spec.needs_trace:
+            raise ValueError(f"{self.spec.name} olha o futuro e não aceita pré-busca")
+        page_table = self.page_table
+        if page_id in page_table:
+            return False
+        if self.free_frames:
+            frame_idx = self.free_frames.pop()
+        else:
+            if len(page_table) == 1 and keep in page_table:
+                return False
+            frame_idx = self._evict_victim(keep)
+            self._release(frame_idx)
+        self._frame_pages()[frame_idx] = page_id
+        page_table[page_id] = frame_idx
+        self.modified[frame_idx] = 0
+        self._admitted(page_id, frame_idx)
+        return True
+
+    def _admitted(self, page_id, frame_idx):
+        # Registra a página pré-buscada nas estruturas da política (padrão: nada; no
+        # LRU entrar no fim do page_table já é a posição dela)
+        pass
+
+    # --- Snapshot / restauração ---
+    # Atributos que não entram no snapshot: derivados do trace e refeitos pelo construtor
+    snapshot_exclude = ()
+
+    def snapshot(self):
+        """
+        Estado completo do simulador (frames, bits, contadores, ponteiros, histórico)
+        em bytes: pickle dos atributos da instância, comprimido com zlib. Referências
+        compartilhadas (ex.: NRU.m_bits, que é o próprio modified) continuam
+        compartilhadas depois do restore.
+        """
+        state = {key: value for key, value in vars(self).items()
+                 if key not in self.snapshot_exclude and key not in EVENT_ATTRIBUTES}
+        return zlib.compress(pickle.dumps((type(self).__name__, state), pickle.HIGHEST_PROTOCOL), 1)
+
+    def restore(self, data):
+        """
+        Volta ao estado de snapshot() numa instância da mesma classe, criada com os
+        mesmos parâmetros (e o mesmo trace, para quem olha o futuro). Usa pickle:
+        só restaure snapshots gerados por você.
+        """
+        name, state = pickle.loads(zlib.decompress(data))
+        if name != type(self).__name__:
+            raise ValueError(f"snapshot de {name} não serve para {type(self).__name__}")
+        self._check_snapshot(state)
+        vars(self).update(state)
+        if 'events' in vars(self):
+            self.events.sync(self._frame_pages())
+
+    def _check_snapshot(self, state):
+        # Validação extra da política antes de aplicar o estado (padrão: nenhuma)
+        pass
+
+    # --- Eventos (instrumentação opcional) ---
+    def attach_events(self, log):
+        """
+        Passa a registrar HIT / FAULT / EVICT no log (events.EventLog).
+        Custo zero sem log: nada muda na classe; só esta instância ganha um run() e
+        um _release() instrumentados como atributos, que escondem os da classe.
+        O run() instrumentado vai referência a referência pelo access() (os laços
+        rápidos dão o mesmo resultado) e descobre a vítima comparando o frame da
+        página nova com o espelho frame -> página mantido pelo log.
+        """
+        self.events = log
+        log.sync(self._frame_pages())
+        self.run = self._run_recorded
+        self._release = self._release_recorded
+
+    def detach_events(self):
+        for name in EVENT_ATTRIBUTES:
+            vars(self).pop(name, None)
+
+    def _run_recorded(self, references, hit_map=None, writes=None):
+        access = self.access
+        log = self.events
+        flags = writes if writes is not None else repeat(None)
+        record = hit_map.append if hit_map is not None else None
+        hits = 0
+        for page_id, is_write in zip(references, flags):
+            capacity = self.capacity
+            hit = access(page_id, is_write)
+            if self.capacity != capacity:
+                # resize() realocou os frames
+                log.relayout(self._frame_pages(), self.page_table)
+            frame_idx = self.page_table[page_id]
+            if hit:
+                hits += 1
+                log.hit(page_id, frame_idx)
+            else:
+                log.fault(page_id, frame_idx)
+            if record is not None:
+                record(1 if hit else 0)
+            log.advance()
+        return hits
+
+    def _release_recorded(self, frame_idx):
+        # Evicção sem página substituta (Working-Set, resize)
+        self.events.evict(self._frame_pages()[frame_idx], frame_idx)
+        type(self)._release(self, frame_idx)
+
     def get_resident_set(self):
         # Retorna apenas as páginas válidas (diferentes de -1)
         return self.memory
 
+@register('FIFO')
 class FIFO(PageReplacementAlgorithm):
     def __init__(self, capacity):
         super().__init__(capacity)
         self.pointer = 0  # Aponta para o próximo frame a ser substituído (Circular)
 
-    def access(self, page_id):
+    def access(self, page_id, is_write=None):
         # 1. HIT: Verifica se a página já está em algum frame
-        if page_id in self.memory:
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            if is_write:
+                self.modified[idx] = 1
             return True 
 
         # 2. MISS
@@ -40,70 +348,208 @@ class FIFO(PageReplacementAlgorithm):
 
         # Verifica se vai ocorrer evicção (se o slot atual não está vazio)
         # Nota: No FIFO circular, se voltamos ao início e ele está ocupado, é evicção.
-        # Uma forma simples é verificar se há -1 na memória antes de contar evicção.
-        if -1 not in self.memory:
+        # Enquanto há frames livres o ponteiro coincide com o topo da pilha de livres.
+        if self.free_frames:
+            self.free_frames.pop()
+        else:
             self.evictions += 1
         
         # Substitui a página no frame apontado pelo ponteiro
-        self.memory[self.pointer] = page_id
+        self._load(self.pointer, page_id, is_write)
         
         # Move o ponteiro para o próximo frame (circular: 0, 1, 2 -> 0, 1...)
         self.pointer = (self.pointer + 1) % self.capacity
         
         return False
 
+    def run(self, references, hit_map=None, writes=None):
+        # Trace com escritas usa o caminho genérico; aqui todas as referências são leituras
+        if writes is not None:
+            return super().run(references, hit_map, writes)
+
+        # Mesma lógica do access() em variáveis locais
+        memory = self.memory
+        page_table = self.page_table
+        free_frames = self.free_frames
+        modified = self.modified
+        capacity = self.capacity
+        pointer = self.pointer
+        record = hit_map.append if hit_map is not None else None
+        hits = faults = evictions = writebacks = 0
+
+        for page_id in references:
+            if page_id in page_table:
+                hits += 1
+                if record is not None:
+                    record(1)
+                continue
+
+            faults += 1
+            if free_frames:
+                free_frames.pop()
+            else:
+                evictions += 1
+                del page_table[memory[pointer]]
+                if modified[pointer]:
+                    writebacks += 1
+                    modified[pointer] = 0
+            memory[pointer] = page_id
+            page_table[page_id] = pointer
+            pointer += 1
+            if pointer == capacity:
+                pointer = 0
+            if record is not None:
+                record(0)
+
+        self.pointer = pointer
+        self.page_faults += faults
+        self.evictions += evictions
+        self.writebacks += writebacks
+        return hits
+
+    def _evict_victim(self, keep=None):
+        # A mais antiga está no ponteiro (os frames já liberados ficam para trás;
+        # o de keep também, e ela passa a valer como recém-chegada)
+        keep_idx = self.page_table.get(keep)
+        while self.memory[self.pointer] == -1 or self.pointer == keep_idx:
+            self.pointer = (self.pointer + 1) % self.capacity
+        victim_idx = self.pointer
+        self.pointer = (victim_idx + 1) % self.capacity
+        return victim_idx
+
+    def _admitted(self, page_id, frame_idx):
+        # Entra no fim da fila, como numa falta
+        self.pointer = (frame_idx + 1) % self.capacity
+
+    def _frame_order(self):
+        # Da mais antiga para a mais nova; o ponteiro volta a apontar a próxima posição
+        return self._circular_order(self.pointer)
+
+    def _remap(self, order, new_capacity):
+        self.pointer = len(order) % new_capacity
+
+@register('LRU', stack=True)
 class LRU(PageReplacementAlgorithm):
+    """
+    LRU em O(1) por referência (mapa hash encadeado).
+    O próprio índice página -> frame é um OrderedDict mantido em ordem de uso:
+    a primeira chave é a "Menos Recentemente Usada", a última a mais recente.
+    """
     def __init__(self, capacity):
         super().__init__(capacity)
-        # Lista auxiliar para controlar a ordem de uso (apenas lógica)
-        # O índice 0 dessa lista será o "Menos Recentemente Usado"
-        self.usage_history = [] 
+        self.page_table = OrderedDict()
 
-    def access(self, page_id):
+    def access(self, page_id, is_write=None):
         # 1. HIT
-        if page_id in self.memory:
-            # Atualiza a prioridade: remove da posição antiga e põe no fim (mais recente)
-            self.usage_history.remove(page_id)
-            self.usage_history.append(page_id)
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            # Atualiza a prioridade: move a página para o fim (mais recente)
+            self.page_table.move_to_end(page_id)
+            if is_write:
+                self.modified[idx] = 1
             return True
 
         # 2. MISS
         self.page_faults += 1
         
-        if -1 in self.memory:
+        if self.free_frames:
             # Se tem espaço vazio, coloca no primeiro frame livre
-            empty_frame_idx = self.memory.index(-1)
-            self.memory[empty_frame_idx] = page_id
-            self.usage_history.append(page_id)
+            # (_load insere a página no fim da ordem de uso)
+            empty_frame_idx = self.free_frames.pop()
+            self._load(empty_frame_idx, page_id, is_write)
         else:
             # Memória Cheia -> EVICÇÃO
             self.evictions += 1
             
-            # Descobre quem é a vítima (o primeiro da lista de histórico)
-            victim_page = self.usage_history.pop(0)
+            # A vítima é a primeira chave do histórico; o valor é o FRAME onde ela está
+            victim_page = next(iter(self.page_table))
+            frame_idx = self.page_table[victim_page]
             
-            # Descobre em qual FRAME a vítima estava
-            frame_idx = self.memory.index(victim_page)
-            
-            # Substitui no frame correto
-            self.memory[frame_idx] = page_id
-            
-            # Adiciona o novo no final do histórico
-            self.usage_history.append(page_id)
+            # Substitui no frame correto (a vítima sai do histórico e a nova entra no fim)
+            self._load(frame_idx, page_id, is_write)
             
         return False
 
+    def run(self, references, hit_map=None, writes=None):
+        # Trace com escritas usa o caminho genérico; aqui todas as referências são leituras
+        if writes is not None:
+            return super().run(references, hit_map, writes)
+
+        # Mesma lógica do access() em variáveis locais
+        memory = self.memory
+        page_table = self.page_table
+        move_to_end = page_table.move_to_end
+        pop_lru = page_table.popitem
+        free_frames = self.free_frames
+        modified = self.modified
+        record = hit_map.append if hit_map is not None else None
+        hits = faults = evictions = writebacks = 0
+
+        for page_id in references:
+            if page_id in page_table:
+                move_to_end(page_id)
+                hits += 1
+                if record is not None:
+                    record(1)
+                continue
+
+            faults += 1
+            if free_frames:
+                frame_idx = free_frames.pop()
+            else:
+                evictions += 1
+                _victim, frame_idx = pop_lru(last=False)
+                if modified[frame_idx]:
+                    writebacks += 1
+                    modified[frame_idx] = 0
+            memory[frame_idx] = page_id
+            page_table[page_id] = frame_idx
+            if record is not None:
+                record(0)
+
+        self.page_faults += faults
+        self.evictions += evictions
+        self.writebacks += writebacks
+        return hits
+
+    def _evict_victim(self, keep=None):
+        return self.page_table[self._oldest(self.page_table, keep)]
+
+@register('OTIMO', aliases=('OPT', 'OPTIMAL'), needs_trace=True, stack=True)
 class OTIMO(PageReplacementAlgorithm):
+    """
+    Algoritmo Ótimo (Belady) com índice de próximo uso pré-computado.
+    - Uma única passada de trás pra frente monta next_use[i]: a posição da próxima
+      ocorrência de full_trace[i] (ou len(full_trace) se ela nunca mais aparece).
+    - As páginas residentes ficam num max-heap chaveado pelo próximo uso, então a
+      vítima sai em O(log F) sem fatiar o futuro a cada passo.
+    """
     # O construtor recebe a lista completa de referências
     def __init__(self, capacity, full_trace):
         super().__init__(capacity)
         self.full_trace = full_trace
         self.current_index = 0 # Contador para saber em qual passo da simulação estamos
 
-    def access(self, page_id):
+        # Passada de trás pra frente: last_seen guarda a próxima aparição de cada página
+        trace_len = len(full_trace)
+        self.never = trace_len
+        self.next_use = array('q', [trace_len]) * trace_len
+        last_seen = {}
+        for i in range(trace_len - 1, -1, -1):
+            page = full_trace[i]
+            self.next_use[i] = last_seen.get(page, trace_len)
+            last_seen[page] = i
+
+        # Próximo uso da página de cada frame e heap de (-próximo uso, frame).
+        # Empates (páginas que não voltam mais) saem pelo menor frame, como antes.
+        # Entradas antigas não são removidas: são descartadas ao chegar no topo.
+        self.frame_next_use = [trace_len] * capacity
+        self.heap = []
+
+    def access(self, page_id, is_write=None):
         # OTIMO calcula o futuro internamente usando o contador
-        # O futuro é tudo que está APÓS o índice atual
-        future_references = self.full_trace[self.current_index + 1:]
+        step = self.current_index
+        next_use = self.next_use[step] if step < self.never else self.never
         
         # Incrementamos o contador para a próxima chamada
         self.current_index += 1
@@ -111,96 +557,172 @@ class OTIMO(PageReplacementAlgorithm):
         # --- Lógica Padrão de Acesso ---
         
         # 1. HIT
-        if page_id in self.memory:
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            self._schedule(idx, next_use)
+            if is_write:
+                self.modified[idx] = 1
             return True
 
         # 2. MISS
         self.page_faults += 1
         
-        if -1 in self.memory:
-            idx = self.memory.index(-1)
-            self.memory[idx] = page_id
+        if self.free_frames:
+            idx = self.free_frames.pop()
+            self._load(idx, page_id, is_write)
+            self._schedule(idx, next_use)
             return False
 
         # 3. EVICÇÃO
         self.evictions += 1
         
-        victim_idx = -1
-        farthest_distance = -1
-        
-        for i in range(len(self.memory)):
-            candidate = self.memory[i]
-            
-            if candidate not in future_references:
-                victim_idx = i
+        # A vítima é a página residente cujo próximo uso está mais distante
+        heap = self.heap
+        while True:
+            neg_next_use, victim_idx = heapq.heappop(heap)
+            if self.frame_next_use[victim_idx] == -neg_next_use:
                 break
-            
-            # Distância até a próxima aparição
-            dist = future_references.index(candidate)
-            if dist > farthest_distance:
-                farthest_distance = dist
-                victim_idx = i
                 
-        self.memory[victim_idx] = page_id
+        self._load(victim_idx, page_id, is_write)
+        self._schedule(victim_idx, next_use)
         return False
 
-# Mantenha as importações e a classe base PageReplacementAlgorithm como estavam
+    def _schedule(self, frame_idx, next_use):
+        # Atualiza o próximo uso do frame e o registra no heap
+        self.frame_next_use[frame_idx] = next_use
+        heapq.heappush(self.heap, (-next_use, frame_idx))
+
+        # Evita que as entradas antigas façam o heap crescer com o trace:
+        # reconstrói só com as entradas válidas (custo amortizado O(1))
+        if len(self.heap) > 2 * self.capacity + 64:
+            self.heap = [(-self.frame_next_use[frame], frame) for frame in self.page_table.values()]
+            heapq.heapify(self.heap)
+
+    def _evict_victim(self):
+        heap = self.heap
+        while True:
+            neg_next_use, victim_idx = heapq.heappop(heap)
+            if self.frame_next_use[victim_idx] == -neg_next_use:
+                break
+        self.frame_next_use[victim_idx] = -1  # Invalida as outras entradas do frame
+        return victim_idx
+
+    # O índice de próximo uso sai do trace: o snapshot guarda só a posição nele
+    snapshot_exclude = ('full_trace', 'next_use')
+
+    def _check_snapshot(self, state):
+        if state['never'] != self.never:
+            raise ValueError("snapshot do OTIMO feito sobre outro trace")
+
+    def _remap(self, order, new_capacity):
+        self.frame_next_use = ([self.frame_next_use[frame] for frame in order]
+                               + [self.never] * (new_capacity - len(order)))
+        self.heap = [(-self.frame_next_use[frame], frame) for frame in range(len(order))]
+        heapq.heapify(self.heap)
 
+@register('SEGUNDACHANCE', aliases=('SC', 'SECONDCHANCE'), label='SC')
 class SECONDCHANCE(PageReplacementAlgorithm):
     """
     Implementação baseada na Seção 3.4.4:
-    Usa uma lista encadeada (aqui simulada com list do Python).
-    Se R=1, move a página para o FIM da lista (atualiza tempo de chegada).
+    Fila FIFO onde, se R=1, a página vai para o FIM da fila (atualiza tempo de chegada).
+    A fila é um buffer circular: slots (array) com as páginas, r_bits (bytearray)
+    e head apontando a cabeça. Com a memória cheia, "tirar da frente e pôr no fim"
+    é só avançar head, então nada é copiado nem realocado.
+    Aqui page_table mapeia página -> slot do anel; self.memory é materializada sob
+    demanda na ordem da fila (cabeça primeiro), igual à lista da Fig 3.15.
     """
+    display_from_head = True
+
     def __init__(self, capacity):
         super().__init__(capacity)
-        # Aqui self.memory vai funcionar como a Fila descrita na Fig 3.15
-        # Vamos guardar dicionários para ter o ID e o bit R juntos: {'id': 7, 'r': 1}
-        self.queue = [] 
+        self.r_bits = bytearray(capacity)
+        self.head = 0  # Slot da página mais antiga (cabeça da fila)
+
+    @property
+    def memory(self):
+        # Fila na ordem cabeça -> fim; enquanto não enche, head = 0 e os vazios (-1) ficam no fim
+        slots = self.slots.tolist()
+        return slots[self.head:] + slots[:self.head]
 
-    def access(self, page_id):
-        # 1. HIT: Procura na fila
-        for page in self.queue:
-            if page['id'] == page_id:
-                page['r'] = 1  # Apenas seta o bit R, não move nada ainda
-                return True
+    @memory.setter
+    def memory(self, frames):
+        self.slots = array('q', frames)
+
+    def access(self, page_id, is_write=None):
+        # 1. HIT: Procura no índice
+        slot = self.page_table.get(page_id)
+        if slot is not None:
+            self.r_bits[slot] = 1  # Apenas seta o bit R, não move nada ainda
+            if is_write:
+                self.modified[slot] = 1
+            return True
 
         # 2. MISS
         self.page_faults += 1
 
         # Se tem espaço, apenas adiciona no fim (como recém-chegado)
-        if len(self.queue) < self.capacity:
-            self.queue.append({'id': page_id, 'r': 1})
-            # Atualiza a memória visual para o relatório
-            self.memory = [p['id'] for p in self.queue] + [-1]*(self.capacity - len(self.queue))
+        if self.free_frames:
+            slot = self.free_frames.pop()
+            self.slots[slot] = page_id
+            self.r_bits[slot] = 1
+            self.modified[slot] = 1 if is_write else 0
+            self.page_table[page_id] = slot
             return False
 
         # 3. EVICÇÃO (Memória Cheia)
         self.evictions += 1
 
-        while True:
-            # Olha o candidato mais antigo (cabeça da fila)
-            candidate = self.queue[0]
-            
-            if candidate['r'] == 0:
-                # Se R=0: É a vítima! Remove da frente.
-                self.queue.pop(0)
-                # Insere a nova página no final (recém-chegada)
-                self.queue.append({'id': page_id, 'r': 1})
-                break
-            else:
-                # Se R=1: Segunda Chance!
-                # "O bit é limpo e a página é colocada no fim da lista" (Texto 3.4.4)
-                candidate['r'] = 0
-                removed = self.queue.pop(0) # Tira da frente
-                self.queue.append(removed)  # Joga pro fim (atualiza tempo)
-                # O loop continua e vai testar a nova "cabeça" da fila
-
-        # Atualiza a visualização da memória
-        self.memory = [p['id'] for p in self.queue]
+        r_bits = self.r_bits
+        head = self.head
+        # Olha o candidato mais antigo (cabeça da fila)
+        while r_bits[head]:
+            # Se R=1: Segunda Chance!
+            # "O bit é limpo e a página é colocada no fim da lista" (Texto 3.4.4)
+            # Com o anel cheio, o fim da fila é o slot logo antes da cabeça: basta avançar
+            r_bits[head] = 0
+            head = (head + 1) % self.capacity
+
+        # Se R=0: É a vítima! A nova página ocupa o slot dela e vira o fim da fila
+        del self.page_table[self.slots[head]]
+        if self.modified[head]:
+            self.writebacks += 1
+        self.slots[head] = page_id
+        r_bits[head] = 1
+        self.modified[head] = 1 if is_write else 0
+        self.page_table[page_id] = head
+        self.head = (head + 1) % self.capacity
         return False
 
+    def _frame_pages(self):
+        return self.slots
+
+    def _evict_victim(self, keep=None):
+        # Mesma fila da falta comum; slots já liberados pelo resize são pulados e keep
+        # ganha mais uma chance como se tivesse R = 1
+        slots = self.slots
+        r_bits = self.r_bits
+        head = self.head
+        keep_slot = self.page_table.get(keep)
+        while slots[head] == -1 or r_bits[head] or head == keep_slot:
+            r_bits[head] = 0
+            head = (head + 1) % self.capacity
+        self.head = (head + 1) % self.capacity
+        return head
+
+    def _admitted(self, page_id, frame_idx):
+        # Fim da fila com R = 0: sem referência, não ganha segunda chance
+        self.r_bits[frame_idx] = 0
+
+    def _frame_order(self):
+        # A fila a partir da cabeça vira os slots 0..k-1 (cabeça no slot 0)
+        return self._circular_order(self.head)
+
+    def _remap(self, order, new_capacity):
+        self.r_bits = bytearray(self.r_bits[slot] for slot in order) + bytearray(new_capacity - len(order))
+        self.head = 0
 
+
+@register('CLOCK')
 class CLOCK(PageReplacementAlgorithm):
     """
     Implementação baseada na Seção 3.4.5:
@@ -210,22 +732,24 @@ class CLOCK(PageReplacementAlgorithm):
     def __init__(self, capacity):
         super().__init__(capacity)
         self.pointer = 0  # O "ponteiro do relógio"
-        self.reference_bits = [0] * capacity # Bits R separados para facilitar
+        self.reference_bits = bytearray(capacity) # Bits R separados (1 byte por frame)
 
-    def access(self, page_id):
+    def access(self, page_id, is_write=None):
         # 1. HIT
-        if page_id in self.memory:
-            idx = self.memory.index(page_id)
+        idx = self.page_table.get(page_id)
+        if idx is not None:
             self.reference_bits[idx] = 1 # Apenas liga o bit
+            if is_write:
+                self.modified[idx] = 1
             return True
 
         # 2. MISS
         self.page_faults += 1
 
         # Caso A: Espaço vazio (preenchimento linear inicial)
-        if -1 in self.memory:
-            empty_idx = self.memory.index(-1)
-            self.memory[empty_idx] = page_id
+        if self.free_frames:
+            empty_idx = self.free_frames.pop()
+            self._load(empty_idx, page_id, is_write)
             self.reference_bits[empty_idx] = 1
             # O texto 3.4.5 diz: "insere no relógio... e ponteiro é avançado"
             self.pointer = (self.pointer + 1) % self.capacity
@@ -242,38 +766,152 @@ class CLOCK(PageReplacementAlgorithm):
                 self.pointer = (self.pointer + 1) % self.capacity
             else:
                 # "Se R for 0, a página é removida, a nova é inserida... e ponteiro avança"
-                self.memory[self.pointer] = page_id
+                self._load(self.pointer, page_id, is_write)
                 self.reference_bits[self.pointer] = 1
                 self.pointer = (self.pointer + 1) % self.capacity
                 break
         
         return False
 
+    def run(self, references, hit_map=None, writes=None):
+        # Trace com escritas usa o caminho genérico; aqui todas as referências são leituras
+        if writes is not None:
+            return super().run(references, hit_map, writes)
+
+        # Mesma lógica do access() em variáveis locais
+        memory = self.memory
+        page_table = self.page_table
+        free_frames = self.free_frames
+        bits = self.reference_bits
+        modified = self.modified
+        capacity = self.capacity
+        pointer = self.pointer
+        record = hit_map.append if hit_map is not None else None
+        hits = faults = evictions = writebacks = 0
+
+        for page_id in references:
+            idx = page_table.get(page_id)
+            if idx is not None:
+                bits[idx] = 1
+                hits += 1
+                if record is not None:
+                    record(1)
+                continue
+
+            faults += 1
+            if free_frames:
+                idx = free_frames.pop()
+            else:
+                evictions += 1
+                # Varre zerando os bits R até achar R = 0
+                while bits[pointer]:
+                    bits[pointer] = 0
+                    pointer += 1
+                    if pointer == capacity:
+                        pointer = 0
+                idx = pointer
+                del page_table[memory[idx]]
+                if modified[idx]:
+                    writebacks += 1
+                    modified[idx] = 0
+            memory[idx] = page_id
+            page_table[page_id] = idx
+            bits[idx] = 1
+            pointer += 1
+            if pointer == capacity:
+                pointer = 0
+            if record is not None:
+                record(0)
+
+        self.pointer = pointer
+        self.page_faults += faults
+        self.evictions += evictions
+        self.writebacks += writebacks
+        return hits
+
+    def _evict_victim(self, keep=None):
+        # Mesma varredura da falta comum; frames já liberados pelo resize são pulados
+        # e o de keep é tratado como R = 1
+        bits = self.reference_bits
+        memory = self.memory
+        pointer = self.pointer
+        keep_idx = self.page_table.get(keep)
+        while memory[pointer] == -1 or bits[pointer] or pointer == keep_idx:
+            bits[pointer] = 0
+            pointer = (pointer + 1) % self.capacity
+        self.pointer = (pointer + 1) % self.capacity
+        return pointer
+
+    def _admitted(self, page_id, frame_idx):
+        self.reference_bits[frame_idx] = 0
+        self.pointer = (frame_idx + 1) % self.capacity
+
+    def _frame_order(self):
+        # A volta do relógio a partir do ponteiro vira os frames 0..k-1
+        return self._circular_order(self.pointer)
+
+    def _remap(self, order, new_capacity):
+        bits = self.reference_bits
+        self.reference_bits = bytearray(bits[frame] for frame in order) + bytearray(new_capacity - len(order))
+        self.pointer = len(order) % new_capacity
+
+# Predicados de escrita do NRU (quais referências modificam a página, M=1).
+# Funções de módulo (e não lambdas) para o simulador continuar serializável.
+def write_even(page_id):
+    return page_id % 2 == 0
+
+def write_odd(page_id):
+    return page_id % 2 == 1
+
+def write_all(page_id):
+    return True
+
+def write_none(page_id):
+    return False
+
+WRITE_PREDICATES = {'even': write_even, 'odd': write_odd, 'all': write_all, 'none': write_none}
+
+@register('NRU', params=('reset_interval', 'write_predicate'))
 class NRU(PageReplacementAlgorithm):
-    def __init__(self, capacity):
+    """
+    Not Recently Used com bits R e M em bytearray.
+    - A cada reset_interval referências os bits R são zerados no próprio buffer.
+    - A vítima sai de uma única varredura circular a partir do ponteiro, que guarda o
+      primeiro candidato de cada classe e para assim que acha um de classe 0.
+    - write_predicate decide quais referências são escritas (padrão: páginas pares)
+      quando o trace não informa R/W; com R/W no trace vale o que ele diz. Aceita
+      a função ou o nome dela em WRITE_PREDICATES ('even', 'odd', 'all', 'none').
+    - Os bits M são os próprios bits de página modificada da classe base.
+    """
+    def __init__(self, capacity, reset_interval=10, write_predicate=write_even):
         super().__init__(capacity)
         self.pointer = 0
-        self.r_bits = [0] * capacity
-        self.m_bits = [0] * capacity
+        self.r_bits = bytearray(capacity)
+        self.m_bits = self.modified
+        self.zero_bits = bytes(capacity)  # Molde para zerar R sem realocar
         
         # Auxiliares para simulação
         self.access_counter = 0
-        self.RESET_INTERVAL = 10 # Intervalo para zerar R (definir "Recentemente")
+        self.RESET_INTERVAL = reset_interval # Intervalo para zerar R (definir "Recentemente")
+        if isinstance(write_predicate, str):
+            write_predicate = WRITE_PREDICATES[write_predicate]
+        self.write_predicate = write_predicate
 
-    def access(self, page_id):
+    def access(self, page_id, is_write=None):
         self.access_counter += 1
         
         # --- Simulação de Hardware ---
         # 1. Periodicamente, o SO zera os bits R para atualizar o "Recentemente"
         if self.access_counter % self.RESET_INTERVAL == 0:
-            self.r_bits = [0] * self.capacity
+            self.r_bits[:] = self.zero_bits
 
-        # 2. Simulação de Escrita: Páginas pares modificam o conteúdo (M=1)
-        is_write = (page_id % 2 == 0)
+        # 2. Simulação de Escrita (padrão: páginas pares modificam o conteúdo, M=1)
+        if is_write is None:
+            is_write = self.write_predicate(page_id)
 
         # --- Lógica de Acesso (HIT) ---
-        if page_id in self.memory:
-            idx = self.memory.index(page_id)
+        idx = self.page_table.get(page_id)
+        if idx is not None:
             self.r_bits[idx] = 1      # Referenciada
             if is_write:
                 self.m_bits[idx] = 1  # Modificada
@@ -283,163 +921,343 @@ class NRU(PageReplacementAlgorithm):
         self.page_faults += 1
 
         # Caso A: Existe espaço vazio na memória
-        if -1 in self.memory:
-            empty_idx = self.memory.index(-1)
-            self.memory[empty_idx] = page_id
+        if self.free_frames:
+            empty_idx = self.free_frames.pop()
+            self._load(empty_idx, page_id, is_write)  # _load já define o bit M
             self.r_bits[empty_idx] = 1
-            self.m_bits[empty_idx] = 1 if is_write else 0
             
             # Avança o ponteiro para manter a circularidade
             self.pointer = (self.pointer + 1) % self.capacity
             return False
 
         # Caso B: EVICÇÃO (Memória Cheia)
-        # O texto diz: "tentar substituir primeiro páginas do nível 0... 
-        # Pode ser necessário percorrer várias vezes a lista circular"
+        # O texto diz: "tentar substituir primeiro páginas do nível 0..."
+        # Em vez de percorrer a lista circular uma vez por classe, uma única volta
+        # guarda o primeiro frame de cada classe: (R*2) + M
+        # R=0, M=0 -> Classe 0 | R=0, M=1 -> Classe 1 | R=1, M=0 -> Classe 2 | R=1, M=1 -> Classe 3
         self.evictions += 1
         
-        victim_idx = -1
-        
-        # Tenta encontrar uma vítima percorrendo as classes em ordem: 0 -> 1 -> 2 -> 3
-        for priority_class in [0, 1, 2, 3]:
-            found = False
-            # Varre a lista circular começando do ponteiro atual
-            for i in range(self.capacity):
-                curr_idx = (self.pointer + i) % self.capacity
-                
-                r = self.r_bits[curr_idx]
-                m = self.m_bits[curr_idx]
-                
-                # Calcula a classe da página atual: (R*2) + M
-                # R=0, M=0 -> Classe 0
-                # R=0, M=1 -> Classe 1
-                # R=1, M=0 -> Classe 2
-                # R=1, M=1 -> Classe 3
-                current_page_class = (r * 2) + m
-                
-                if current_page_class == priority_class:
-                    victim_idx = curr_idx
-                    found = True
-                    break
-            
-            if found:
-                break # Encontrou a menor classe possível, para a busca
+        victim_idx = self._select_victim()
 
         # Substitui a página encontrada
-        self.memory[victim_idx] = page_id
+        self._load(victim_idx, page_id, is_write)
         self.r_bits[victim_idx] = 1
-        self.m_bits[victim_idx] = 1 if is_write else 0
         
         # Atualiza o ponteiro para a posição seguinte à substituição
         self.pointer = (victim_idx + 1) % self.capacity
         
         return False
 
+    def _select_victim(self, skip_empty=False, keep_idx=None):
+        r_bits = self.r_bits
+        m_bits = self.m_bits
+        memory = self.memory
+        capacity = self.capacity
+        first_of_class = [-1, -1, -1, -1]
+
+        curr_idx = self.pointer
+        for _ in range(capacity):
+            if (skip_empty and memory[curr_idx] == -1) or curr_idx == keep_idx:
+                curr_idx += 1
+                if curr_idx == capacity:
+                    curr_idx = 0
+                continue
+            page_class = (r_bits[curr_idx] << 1) | m_bits[curr_idx]
+            if page_class == 0:
+                return curr_idx  # Classe 0 é a melhor possível: para a busca
+            if first_of_class[page_class] < 0:
+                first_of_class[page_class] = curr_idx
+            curr_idx += 1
+            if curr_idx == capacity:
+                curr_idx = 0
+
+        # Menor classe encontrada (na ordem da varredura a partir do ponteiro)
+        for victim_idx in first_of_class:
+            if victim_idx >= 0:
+                return victim_idx
+
+    def _evict_victim(self, keep=None):
+        # Frames já liberados pelo resize são pulados (R = M = 0 pareceria classe 0)
+        victim_idx = self._select_victim(True, self.page_table.get(keep))
+        self.pointer = (victim_idx + 1) % self.capacity
+        return victim_idx
+
+    def _admitted(self, page_id, frame_idx):
+        # R = M = 0 e access_counter parado: a pré-busca não é referência nem escrita
+        self.r_bits[frame_idx] = 0
+        self.pointer = (frame_idx + 1) % self.capacity
+
+    def _frame_order(self):
+        return self._circular_order(self.pointer)
+
+    def _remap(self, order, new_capacity):
+        free = new_capacity - len(order)
+        self.r_bits = bytearray(self.r_bits[frame] for frame in order) + bytearray(free)
+        self.m_bits = self.modified
+        self.zero_bits = bytes(new_capacity)
+        self.pointer = len(order) % new_capacity
+
+
+# --- Estrutura de frequências (LFU / MFU) em O(1) ---
+class FrequencyNode:
+    """
+    Nó da lista de frequências: todas as páginas residentes com o mesmo contador.
+    pages é um dict página -> frame (conjunto com ordem de inserção).
+    heap guarda (frame, página) para o desempate pelo menor frame; entradas de
+    páginas que já saíram do nó são descartadas ao chegar no topo.
+    """
+    __slots__ = ('freq', 'pages', 'heap', 'prev', 'next')
+
+    def __init__(self, freq):
+        self.freq = freq
+        self.pages = {}
+        self.heap = []
+        self.prev = None
+        self.next = None
+
+
+class FrequencyList:
+    """
+    Lista duplamente encadeada de nós de frequência em ordem crescente
+    (head = menor contador, tail = maior). Incrementar um contador só move a página
+    para o nó vizinho, então LFU e MFU acham a vítima sem varrer a memória.
+
+    Desempate entre páginas com o mesmo contador (tie_break):
+    - 'frame': menor índice de frame, igual à varredura original (O(log F) pelo heap do nó)
+    - 'fifo': a página que está há mais tempo com esse contador (O(1))
+    """
+    TIE_BREAKS = ('frame', 'fifo')
+
+    def __init__(self, tie_break='frame'):
+        if tie_break not in self.TIE_BREAKS:
+            raise ValueError(f"desempate desconhecido: {tie_break}")
+        self.by_frame = tie_break == 'frame'
+        self.head = None
+        self.tail = None
+        self.node_of = {}  # página -> nó
+
+    def count(self, page_id):
+        return self.node_of[page_id].freq
+
+    def insert(self, page_id, frame_idx, freq=1):
+        # Página nova entra com contador 1 (o acesso atual); a pré-buscada, com 0
+        prev, node = None, self.head
+        if node is not None and node.freq < freq:
+            prev, node = node, node.next
+        if node is None or node.freq != freq:
+            node = self._link_after(prev, freq)
+        self._add(node, page_id, frame_idx)
+
+    def increment(self, page_id):
+        node = self.node_of[page_id]
+        frame_idx = node.pages.pop(page_id)
+        target = node.next
+        if target is None or target.freq != node.freq + 1:
+            target = self._link_after(node, node.freq + 1)
+        self._add(target, page_id, frame_idx)
+        if not node.pages:
+            self._unlink(node)
+
+    def pop_least(self, keep=None):
+        node = self.head
+        if len(node.pages) == 1 and keep in node.pages:
+            node = node.next
+        return self._pop(node, keep)
+
+    def pop_most(self, keep=None):
+        node = self.tail
+        if len(node.pages) == 1 and keep in node.pages:
+            node = node.prev
+        return self._pop(node, keep)
+
+    def _pop(self, node, keep=None):
+        # Remove e devolve a vítima do nó pelo critério de desempate (nunca keep)
+        if self.by_frame:
+            kept = None
+            while True:
+                frame_idx, page_id = heapq.heappop(node.heap)
+                if node.pages.get(page_id) == frame_idx:
+                    if page_id != keep:
+                        break
+                    kept = (frame_idx, page_id)
+            if kept is not None:
+                heapq.heappush(node.heap, kept)
+        else:
+            pages = iter(node.pages)
+            page_id = next(pages)
+            if page_id == keep:
+                page_id = next(pages)
+        del node.pages[page_id]
+        del self.node_of[page_id]
+        if not node.pages:
+            self._unlink(node)
+        return page_id
+
+    def remap(self, new_frame_of):
+        # Troca os frames das páginas (resize); a ordem de cada nó é mantida
+        node = self.head
+        while node is not None:
+            node.pages = {page: new_frame_of[frame] for page, frame in node.pages.items()}
+            if self.by_frame:
+                node.heap = [(frame, page) for page, frame in node.pages.items()]
+                heapq.heapify(node.heap)
+            node = node.next
+
+    def __getstate__(self):
+        # A lista encadeada vira uma lista de nós (o pickle recursivo de prev/next
+        # estouraria a pilha com muitas frequências distintas)
+        nodes = []
+        node = self.head
+        while node is not None:
+            nodes.append((node.freq, node.pages, node.heap))
+            node = node.next
+        return {'by_frame': self.by_frame, 'nodes': nodes}
+
+    def __setstate__(self, state):
+        self.by_frame = state['by_frame']
+        self.head = self.tail = None
+        self.node_of = {}
+        for freq, pages, heap in state['nodes']:
+            node = self._link_after(self.tail, freq)
+            node.pages = pages
+            node.heap = heap
+            for page_id in pages:
+                self.node_of[page_id] = node
+
+    def _add(self, node, page_id, frame_idx):
+        node.pages[page_id] = frame_idx
+        self.node_of[page_id] = node
+        if self.by_frame:
+            heapq.heappush(node.heap, (frame_idx, page_id))
+            # Descarta de vez as entradas velhas quando elas dominam o heap
+            if len(node.heap) > 2 * len(node.pages) + 16:
+                node.heap = [(frame, page) for page, frame in node.pages.items()]
+                heapq.heapify(node.heap)
+
+    def _link_after(self, node, freq):
+        # Cria um nó logo depois de node (None = no início da lista)
+        new_node = FrequencyNode(freq)
+        new_node.prev = node
+        new_node.next = self.head if node is None else node.next
+        if new_node.next is not None:
+            new_node.next.prev = new_node
+        else:
+            self.tail = new_node
+        if node is None:
+            self.head = new_node
+        else:
+            node.next = new_node
+        return new_node
+
+    def _unlink(self, node):
+        if node.prev is not None:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+
 
 # --- LFU (Least Frequently Used) ---
+@register('LFU', params=('tie_break',))
 class LFU(PageReplacementAlgorithm):
-    def __init__(self, capacity):
+    def __init__(self, capacity, tie_break='frame'):
         super().__init__(capacity)
-        # Dicionário para guardar o contador de referências
-        # Chave: Page ID, Valor: Quantidade de acessos
-        self.counts = {} 
+        # Contadores de referência das páginas residentes, agrupados por frequência
+        # "keep a counter of the number of references"
+        self.frequencies = FrequencyList(tie_break)
 
-    def access(self, page_id):
+    def access(self, page_id, is_write=None):
         # 1. HIT: Página já está na memória
-        if page_id in self.memory:
-            # "keep a counter of the number of references"
-            self.counts[page_id] += 1
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            self.frequencies.increment(page_id)
+            if is_write:
+                self.modified[idx] = 1
             return True
 
         # 2. MISS
         self.page_faults += 1
-        
-        # Página nova entra com contador inicial. 
-        # Geralmente inicia-se em 1 (o acesso atual).
-        self.counts[page_id] = 1
 
         # Caso A: Existe espaço vazio
-        if -1 in self.memory:
-            idx = self.memory.index(-1)
-            self.memory[idx] = page_id
+        if self.free_frames:
+            idx = self.free_frames.pop()
+            self._load(idx, page_id, is_write)
+            self.frequencies.insert(page_id, idx)
             return False
 
         # Caso B: EVICÇÃO (Memória Cheia)
         self.evictions += 1
         
         # LFU: "requires that the page with the smallest count be replaced"
+        # A vítima sai do nó de menor frequência; o contador dela é descartado, então
+        # se ela voltar começa do 1 (evitando o problema de "remaining in memory").
+        page_to_remove = self.frequencies.pop_least()
+        victim_idx = self.page_table[page_to_remove]
         
-        # Vamos buscar a vítima APENAS entre as páginas que estão na memória física.
-        # (Não podemos olhar contadores de páginas que já saíram)
-        victim_idx = -1
-        min_count = float('inf')
-        
-        # Varre a memória para achar quem tem o menor contador
-        for i, current_page in enumerate(self.memory):
-            current_count = self.counts[current_page]
-            
-            if current_count < min_count:
-                min_count = current_count
-                victim_idx = i
-            # Em caso de empate, mantemos o primeiro encontrado (comportamento estável)
-        
-        # Remove a vítima
-        page_to_remove = self.memory[victim_idx]
+        # Insere a nova página (contador 1) no lugar da vítima
+        self._load(victim_idx, page_id, is_write)
+        self.frequencies.insert(page_id, victim_idx)
         
-        # Nota: Normalmente removemos o contador da vítima para economizar memória 
-        # e para que, se ela voltar, comece do 1 (evitando o problema de "remaning in memory").
-        del self.counts[page_to_remove]
-        
-        # Insere a nova página no lugar da vítima
-        self.memory[victim_idx] = page_id
-        
-        return 
+        return False
+
+    def _evict_victim(self, keep=None):
+        return self.page_table[self.frequencies.pop_least(keep)]
+
+    def _admitted(self, page_id, frame_idx):
+        self.frequencies.insert(page_id, frame_idx, 0)
+
+    def _remap(self, order, new_capacity):
+        self.frequencies.remap({frame: new_frame for new_frame, frame in enumerate(order)})
     
 
 # --- MFU (Most Frequently Used) ---
+@register('MFU', params=('tie_break',))
 class MFU(PageReplacementAlgorithm):
-    def __init__(self, capacity):
+    def __init__(self, capacity, tie_break='frame'):
         super().__init__(capacity)
-        self.counts = {}
+        self.frequencies = FrequencyList(tie_break)
 
-    def access(self, page_id):
+    def access(self, page_id, is_write=None):
         # 1. HIT
-        if page_id in self.memory:
-            self.counts[page_id] += 1
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            self.frequencies.increment(page_id)
+            if is_write:
+                self.modified[idx] = 1
             return True
 
         # 2. MISS
         self.page_faults += 1
-        self.counts[page_id] = 1
 
         # Caso A: Espaço vazio
-        if -1 in self.memory:
-            idx = self.memory.index(-1)
-            self.memory[idx] = page_id
+        if self.free_frames:
+            idx = self.free_frames.pop()
+            self._load(idx, page_id, is_write)
+            self.frequencies.insert(page_id, idx)
             return False
 
         # Caso B: EVICÇÃO
         self.evictions += 1
         
         # MFU: "page with the smallest count was probably just brought in"
-        # Portanto, removemos a que tem o MAIOR contador.
-        
-        victim_idx = -1
-        max_count = -1
-        
-        for i, current_page in enumerate(self.memory):
-            current_count = self.counts[current_page]
-            
-            # Procura o maior contador
-            if current_count > max_count:
-                max_count = current_count
-                victim_idx = i
-        
-        # Remove a vítima
-        page_to_remove = self.memory[victim_idx]
-        del self.counts[page_to_remove]
+        # Portanto, removemos a que tem o MAIOR contador (nó do fim da lista).
+        page_to_remove = self.frequencies.pop_most()
+        victim_idx = self.page_table[page_to_remove]
         
         # Insere a nova
-        self.memory[victim_idx] = page_id
+        self._load(victim_idx, page_id, is_write)
+        self.frequencies.insert(page_id, victim_idx)
         
-        return False
\ No newline at end of file
+        return False
+
+    def _evict_victim(self, keep=None):
+        return self.page_table[self.frequencies.pop_most(keep)]
+
+    def _admitted(self, page_id, frame_idx):
+        self.frequencies.insert(page_id, frame_idx, 0)
+
+    def _remap(self, order, new_capacity):
+        self.frequencies.remap({frame: new_frame for new_frame, frame in enumerate(order)})
@@ -0,0 +1,247 @@
+import os
+import warnings
+
+import numpy as np
+
+from traces import is_binary_trace, load_trace, map_binary_trace
+
+'''
+-------------------------------------------------------------------------------------
+ ANÁLISE DO TRACE (NumPy)
+
+ Características do trace para escolher a política antes de simular. Tudo é
+ calculado com operações vetorizadas a partir de uma única ordenação estável do
+ trace por página (O(N log N)); nenhum laço Python passa pelas referências.
+
+ - Páginas distintas.
+ - Histograma da distância de reúso (quantas páginas distintas entre dois acessos
+   à mesma página; é a distância de pilha do LRU menos 1), em faixas de potência
+   de 2. A referência i reusa a página acessada em p = prev(i); as páginas
+   distintas em (p, i) são as posições j do intervalo cujo próximo uso vem depois
+   de i, ou seja (i - p - 1) menos os reúsos aninhados (p < j e next_use[j] < i).
+   Contar os aninhados é uma contagem de dominância 2D, feita para todas as
+   referências de uma vez com uma wavelet matrix sobre next_use: log2(N) passadas
+   vetorizadas, cada uma com uma soma acumulada e uma partição estável. É a
+   métrica mais cara da análise (~10x o resto: 7 s de 8 s com 5M referências),
+   por isso só é calculada a pedido (reuse_distance=True, --reuse-distance).
+ - Histograma do tempo de reúso (referências entre os dois acessos à mesma
+   página), sempre calculado: sai da mesma ordenação, de graça.
+ - Conjunto de trabalho de Denning: tamanho médio de W(t, τ), as páginas distintas
+   entre as referências t - τ + 1 e t (janela truncada no início do trace).
+ - Footprint: média de páginas distintas em todas as janelas de w referências
+   (fórmula de Xiang et al.: basta somar os "buracos" entre acessos à mesma página).
+-------------------------------------------------------------------------------------
+'''
+
+def load_trace_array(path):
+    """
+    Carrega o trace como np.ndarray de inteiros.
+    Binário: visão direta do mmap (sem cópia). Texto: parsing em C pelo np.fromfile;
+    se ele não conseguir ler o arquivo inteiro cai no leitor normal, que aponta a linha inválida.
+    Pipe: o leitor normal direto, que lê a entrada uma única vez.
+    """
+    if not os.path.isfile(path):
+        return np.asarray(load_trace(path)).astype(np.int64, copy=False)
+    if is_binary_trace(path):
+        return np.asarray(map_binary_trace(path)).astype(np.int64, copy=False)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        try:
+            return np.fromfile(path, dtype=np.int64, sep='\n')
+        except (ValueError, DeprecationWarning):
+            pass
+
+    return np.frombuffer(load_trace(path), dtype=np.int64)
+
+
+def _sort_by_page(trace):
+    """
+    Ordena as posições por (página, tempo). Quando página * n cabe em int64, ordena
+    a chave composta página * n + tempo por valor (muito mais rápido que argsort
+    estável) e recupera posição e página com divisão inteira.
+    """
+    n = len(trace)
+    min_page = int(trace.min())
+    max_page = int(trace.max())
+    if min_page >= 0 and (max_page + 1) * n < (1 << 63):
+        keys = trace * n
+        keys += np.arange(n, dtype=np.int64)
+        keys.sort()
+        sorted_pages = keys // n
+        keys -= sorted_pages * n  # a própria chave vira a posição (sem outro array)
+        return keys, sorted_pages
+
+    order = np.argsort(trace, kind='stable')
+    return order, trace[order]
+
+
+def occurrence_links(trace):
+    """
+    Liga cada referência à próxima ocorrência da mesma página.
+    Retorna (next_use, first_pos, last_pos, reuse_times):
+    - next_use[i]: posição da próxima ocorrência (len(trace) se não há)
+    - first_pos / last_pos: primeira e última posição de cada página distinta
+    - reuse_times: distâncias (em referências) entre acessos consecutivos à mesma página
+    """
+    n = len(trace)
+    order, sorted_pages = _sort_by_page(trace)
+
+    # boundary[k]: order[k] é o primeiro acesso da sua página
+    boundary = np.empty(n, dtype=bool)
+    boundary[:1] = True
+    np.not_equal(sorted_pages[1:], sorted_pages[:-1], out=boundary[1:])
+    del sorted_pages
+
+    # Dentro do mesmo grupo a ordenação estável mantém a ordem no tempo
+    same_page = ~boundary[1:]
+    current = order[:-1][same_page]
+    following = order[1:][same_page]
+
+    next_use = np.full(n, n, dtype=np.int64)
+    next_use[current] = following
+
+    is_last = np.empty(n, dtype=bool)
+    is_last[:-1] = boundary[1:]
+    is_last[-1:] = True
+
+    return next_use, order[boundary], order[is_last], following - current
+
+
+def count_less_before(values, limits, bounds):
+    """
+    Para cada consulta q: #{j < limits[q] : values[j] < bounds[q]} (valores >= 0).
+    Wavelet matrix percorrida do bit mais alto para o mais baixo: em cada nível o
+    intervalo [início, fim) de cada consulta é remapeado para a metade do bit de
+    bounds[q], e quando esse bit é 1 os valores com bit 0 no intervalo são todos
+    menores e entram na conta.
+    """
+    n = len(values)
+    bits = int(max(values.max(), bounds.max())).bit_length()
+    start = np.zeros(len(limits), dtype=np.int64)
+    end = limits.astype(np.int64)
+    counts = np.zeros(len(limits), dtype=np.int64)
+    ones_before = np.zeros(n + 1, dtype=np.int64)
+    sequence = values.astype(np.int64)
+    for b in range(bits - 1, -1, -1):
+        bit = (sequence >> b) & 1
+        np.cumsum(bit, out=ones_before[1:])
+        zeros = n - ones_before[n]
+        take = ((bounds >> b) & 1).astype(bool)
+        ones_start = ones_before[start]
+        ones_end = ones_before[end]
+        start -= ones_start  # Posição entre os zeros do nível
+        end -= ones_end
+        np.add(counts, end - start, out=counts, where=take)
+        np.add(ones_start, zeros, out=start, where=take)
+        np.add(ones_end, zeros, out=end, where=take)
+        # Próximo nível: zeros antes dos uns, ordem estável
+        ones = bit.astype(bool)
+        sequence = np.concatenate((sequence.compress(~ones), sequence.compress(ones)))
+    return counts
+
+
+def reuse_distances(next_use):
+    """Distância de reúso de cada reúso (na ordem do acesso anterior, ver docstring do módulo)."""
+    n = len(next_use)
+    previous = np.flatnonzero(next_use < n)
+    if len(previous) == 0:
+        return np.zeros(0, dtype=np.int64)
+    current = next_use[previous]
+
+    # Reúsos que terminam antes de cada i (os next_use são distintos)
+    ends = np.zeros(n, dtype=np.int64)
+    ends[current] = 1
+    ends_before = np.cumsum(ends)[current] - 1
+    nested = ends_before - count_less_before(next_use, previous, current)
+    return current - previous - 1 - nested
+
+
+def log2_histogram(values):
+    """
+    Histograma em faixas [2^k, 2^(k+1)), mais a faixa [0, 0] quando há zeros.
+    Retorna lista de (início, fim, quantidade).
+    """
+    if len(values) == 0:
+        return []
+    zeros = int(np.count_nonzero(values == 0))
+    _, exponents = np.frexp(values[values > 0].astype(np.float64))
+    counts = np.bincount(exponents - 1)
+    buckets = [(0, 0, zeros)] if zeros else []
+    return buckets + [(1 << k, (1 << (k + 1)) - 1, int(c)) for k, c in enumerate(counts) if c]
+
+
+def working_set_sizes(next_use, taus):
+    """
+    Tamanho médio de W(t, τ) para cada τ.
+    A referência i é a última da sua página nas janelas que terminam em
+    t = i .. i + min(τ, next_use[i] - i) - 1, então soma(|W(t, τ)|) = soma(min(g_i, τ)),
+    com g_i = next_use[i] - i. Ordenando g, cada τ sai com uma busca binária.
+    """
+    n = len(next_use)
+    gaps = np.sort(next_use - np.arange(n, dtype=np.int64))
+    prefix = np.concatenate(([0], np.cumsum(gaps)))
+    taus = np.asarray(taus, dtype=np.int64)
+    below = np.searchsorted(gaps, taus, side='left')
+    totals = prefix[below] + taus * (n - below)
+    return totals / n
+
+
+def footprint(first_pos, last_pos, reuse_times, n, windows):
+    """
+    Footprint médio fp(w) para cada tamanho de janela w <= n.
+    Uma janela não contém a página p sse cabe inteira num "buraco" entre acessos a p
+    (antes do primeiro, entre dois consecutivos ou depois do último). Um buraco de L
+    referências contém max(L - w + 1, 0) janelas, logo
+    fp(w) = m - soma_buracos(max(L - w + 1, 0)) / (n - w + 1).
+    """
+    distinct = len(first_pos)
+    holes = np.sort(np.concatenate((first_pos, reuse_times - 1, n - 1 - last_pos)))
+    suffix = np.concatenate((np.cumsum(holes[::-1])[::-1], [0]))
+    windows = np.asarray(windows, dtype=np.int64)
+    start = np.searchsorted(holes, windows, side='left')
+    missing = suffix[start] - (windows - 1) * (len(holes) - start)
+    return distinct - missing / (n - windows + 1)
+
+
+def default_windows(n):
+    """Potências de 2 de 1 até n (escala log para τ e w)."""
+    windows = []
+    w = 1
+    while w <= n:
+        windows.append(w)
+        w *= 2
+    return windows
+
+
+def analyze(trace, windows=None, reuse_distance=False):
+    """
+    Calcula as métricas e devolve um dicionário pronto para JSON. A distância de
+    reúso (a parte cara) só entra com reuse_distance=True; sem ela,
+    mean_reuse_distance e reuse_distance_histogram ficam None.
+    """
+    trace = np.asarray(trace, dtype=np.int64)
+    n = len(trace)
+    if n == 0:
+        return {'references': 0, 'unique_pages': 0,
+                'reuse_distance_histogram': [] if reuse_distance else None, 'reuse_time_histogram': [],
+                'working_set': [], 'footprint': []}
+
+    windows = [w for w in (windows or default_windows(n)) if 1 <= w <= n]
+    next_use, first_pos, last_pos, reuse_times = occurrence_links(trace)
+    ws = working_set_sizes(next_use, windows)
+    fp = footprint(first_pos, last_pos, reuse_times, n, windows)
+    distances = reuse_distances(next_use) if reuse_distance else None
+
+    return {
+        'references': n,
+        'unique_pages': len(first_pos),
+        'reuses': len(reuse_times),
+        'mean_reuse_distance': float(distances.mean()) if distances is not None and len(distances) else None,
+        'mean_reuse_time': float(reuse_times.mean()) if len(reuse_times) else None,
+        'reuse_distance_histogram': ([{'from': lo, 'to': hi, 'count': c} for lo, hi, c in log2_histogram(distances)]
+                                     if distances is not None else None),
+        'reuse_time_histogram': [{'from': lo, 'to': hi, 'count': c} for lo, hi, c in log2_histogram(reuse_times)],
+        'working_set': [{'tau': int(w), 'mean_size': float(s)} for w, s in zip(windows, ws)],
+        'footprint': [{'window': int(w), 'pages': float(f)} for w, f in zip(windows, fp)],
+    }
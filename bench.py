@@ -0,0 +1,324 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import registry
+from algorithms import LRU
+from traces import dump_binary_trace
+from workloads import WORKLOADS, generate
+
+'''
+-------------------------------------------------------------------------------------
+ BENCHMARKS
+
+ - Suíte (padrão): roda cada algoritmo sobre cargas sintéticas reprodutíveis
+   (workloads.py) para várias quantidades de frames. Cada medição tem rodadas de
+   aquecimento (descartadas) e várias repetições; o tempo cobre a construção do
+   simulador e o run() do trace inteiro (o pré-processamento do OTIMO entra).
+   Reporta referências/segundo da melhor repetição, a mediana e o pico de memória
+   (tracemalloc, numa rodada separada para não distorcer o tempo).
+ - compare: compara dois JSON da suíte (ex.: antes/depois de um commit) e aponta
+   as medições que ficaram mais lentas que o limite ou cujas faltas mudaram.
+ - generate: grava uma carga sintética como trace (texto ou binário) para o pager.
+ - scaling: custo por referência do LRU variando o número de frames (4 -> 1M).
+   Cada rodada usa páginas sorteadas entre 2 * frames páginas distintas, então
+   metade dos acessos (em média) é falta com evicção, o pior caso para o histórico.
+   Com o histórico em O(1) o tempo por referência deve ficar praticamente constante.
+-------------------------------------------------------------------------------------
+'''
+
+def time_algorithm(factory, frames, references, warmup=1, repeats=5):
+    """
+    Mede uma combinação (algoritmo, frames, trace); factory(frames, references)
+    constrói o simulador (ex.: AlgorithmSpec.create).
+    Retorna (tempos em segundos das repetições, faltas, pico de memória em bytes).
+    """
+    for _ in range(warmup):
+        factory(frames, references).run(references)
+
+    timings = []
+    faults = None
+    for _ in range(repeats):
+        start_time = time.perf_counter_ns()
+        simulator = factory(frames, references)
+        simulator.run(references)
+        end_time = time.perf_counter_ns()
+        timings.append((end_time - start_time) / 1e9)
+        faults = simulator.page_faults
+
+    # O tracemalloc deixa cada alocação bem mais cara: rodada própria, fora do tempo
+    tracemalloc.start()
+    try:
+        factory(frames, references).run(references)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return timings, faults, peak
+
+
+def run_suite(workloads, algorithms, frame_options, num_refs, num_pages, skew, seed,
+              warmup, repeats, progress=None):
+    """Roda a suíte completa e devolve a lista de resultados (um dicionário por medição)."""
+    results = []
+    for workload in workloads:
+        params = {'skew': skew} if workload == 'zipf' else {}
+        references = generate(workload, num_refs, num_pages, seed, **params)
+        for algo_name in algorithms:
+            for frames in frame_options:
+                # PFF limitado aos frames da medição, como as demais políticas
+                spec = registry.get_spec(algo_name)
+                factory = lambda frames, references: spec.create(frames, references, max_frames=frames)
+                timings, faults, peak = time_algorithm(factory, frames, references, warmup, repeats)
+                best = min(timings)
+                result = {
+                    'workload': workload,
+                    'algorithm': algo_name,
+                    'frames': frames,
+                    'references': num_refs,
+                    'faults': faults,
+                    'best_s': best,
+                    'median_s': statistics.median(timings),
+                    'refs_per_sec': num_refs / best if best else None,
+                    'peak_bytes': peak,
+                }
+                results.append(result)
+                if progress:
+                    progress(result)
+    return results
+
+
+def result_key(result):
+    return result['workload'], result['algorithm'], result['frames']
+
+
+def compare_results(baseline, current):
+    """
+    Casa as medições pelas chaves (carga, algoritmo, frames).
+    Retorna lista de (chave, razão de velocidade atual/base, faltas mudaram?).
+    """
+    base_by_key = {result_key(r): r for r in baseline}
+    rows = []
+    for result in current:
+        base = base_by_key.get(result_key(result))
+        if base is None or not base['refs_per_sec'] or not result['refs_per_sec']:
+            continue
+        ratio = result['refs_per_sec'] / base['refs_per_sec']
+        rows.append((result_key(result), ratio, result['faults'] != base['faults']))
+    return rows
+
+
+def lru_scaling(max_frames, num_refs, seed=42):
+    """
+    Retorna uma lista de (frames, ns_por_referencia, faltas) para frames = 4, 16, 64, ...
+    """
+    results = []
+    rng = random.Random(seed)
+    frames = 4
+
+    while frames <= max_frames:
+        references = [rng.randrange(2 * frames) for _ in range(num_refs)]
+        simulator = LRU(frames)
+
+        # Aquecimento: enche a memória antes de medir (não entra no tempo)
+        for page in range(frames):
+            simulator.access(page)
+        warmup_faults = simulator.page_faults
+
+        start_time = time.perf_counter_ns()
+        for page in references:
+            simulator.access(page)
+        end_time = time.perf_counter_ns()
+
+        results.append((frames, (end_time - start_time) / num_refs, simulator.page_faults - warmup_faults))
+        frames *= 4
+
+    return results
+
+
+def parse_list(text, choices, option):
+    names = [name.strip() for name in text.split(',') if name.strip()]
+    unknown = [name for name in names if name not in choices]
+    if unknown or not names:
+        print(f"Erro: {option} aceita {', '.join(choices)} (recebido '{text}').")
+        sys.exit(1)
+    return names
+
+
+def registry_names(specs):
+    # Nomes canônicos e apelidos aceitos em --algos
+    return [name for spec in specs for name in (spec.name,) + spec.aliases]
+
+
+def suite_main(argv):
+    parser = argparse.ArgumentParser(prog='bench.py', description='Benchmark dos algoritmos sobre cargas sintéticas')
+    parser.add_argument('--workloads', default=','.join(WORKLOADS),
+                        help=f"Cargas separadas por vírgula (padrão: {','.join(WORKLOADS)})")
+    parser.add_argument('--algos', help='Algoritmos separados por vírgula (padrão: todos os registrados)')
+    parser.add_argument('--frames', default='16,256,4096', help='Quantidades de frames separadas por vírgula (padrão: 16,256,4096)')
+    parser.add_argument('--refs', type=int, default=50000, help='Referências por trace (padrão: 50000)')
+    parser.add_argument('--pages', type=int, default=8192, help='Páginas distintas das cargas (padrão: 8192)')
+    parser.add_argument('--skew', type=float, default=1.0, help='Expoente da carga zipf (padrão: 1.0)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente dos geradores (padrão: 42)')
+    parser.add_argument('--warmup', type=int, default=1, help='Rodadas de aquecimento descartadas (padrão: 1)')
+    parser.add_argument('--repeats', type=int, default=3, help='Repetições medidas (padrão: 3)')
+    parser.add_argument('--json', help="Grava os resultados em JSON ('-' para a saída padrão)")
+    args = parser.parse_args(argv)
+
+    workloads = parse_list(args.workloads, list(WORKLOADS), '--workloads')
+    specs = registry.available()
+    if args.algos:
+        algorithms = [registry.get_spec(name).name for name in
+                      parse_list(args.algos.upper(), registry_names(specs), '--algos')]
+    else:
+        algorithms = [spec.name for spec in specs]
+    try:
+        frame_options = [int(f) for f in args.frames.split(',')]
+    except ValueError:
+        frame_options = []
+    if not frame_options or min(frame_options) < 1 or args.refs < 1 or args.pages < 1 or args.repeats < 1 or args.warmup < 0:
+        print("Erro: frames, referências, páginas e repetições devem ser positivos.")
+        sys.exit(1)
+
+    # Com --json - a tabela vai para a saída de erros, para não misturar com o JSON
+    out = sys.stderr if args.json == '-' else sys.stdout
+
+    def progress(result):
+        print(f"{result['workload']:<8} | {result['algorithm']:<14} | {result['frames']:<8} | "
+              f"{result['faults']:<8} | {result['refs_per_sec']:<12.0f} | {result['median_s'] * 1e3:<10.2f} | "
+              f"{result['peak_bytes'] / 1024:<10.1f} |", file=out)
+
+    print(f"{'Carga':<8} | {'Algoritmo':<14} | {'Frames':<8} | {'Faltas':<8} | {'refs/s':<12} | "
+          f"{'mediana ms':<10} | {'pico KiB':<10} |", file=out)
+    print("-" * 93, file=out)
+    results = run_suite(workloads, algorithms, frame_options, args.refs, args.pages, args.skew, args.seed,
+                        args.warmup, args.repeats, progress)
+
+    if args.json:
+        document = {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'params': {
+                'refs': args.refs, 'pages': args.pages, 'skew': args.skew, 'seed': args.seed,
+                'warmup': args.warmup, 'repeats': args.repeats,
+            },
+            'results': results,
+        }
+        text = json.dumps(document, indent=2)
+        if args.json == '-':
+            print(text)
+        else:
+            with open(args.json, 'w') as f:
+                f.write(text + '\n')
+
+
+def compare_main(argv):
+    """
+    Subcomando 'compare': diferença entre dois JSON da suíte.
+    Sai com código 1 se alguma medição ficou mais lenta que o limite ou mudou as faltas.
+    """
+    parser = argparse.ArgumentParser(prog='bench.py compare', description='Compara dois resultados da suíte')
+    parser.add_argument('baseline', help='JSON de referência (ex.: commit anterior)')
+    parser.add_argument('current', help='JSON novo')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Queda relativa de refs/s considerada regressão (padrão: 0.10 = 10%%)')
+    args = parser.parse_args(argv)
+
+    documents = []
+    for path in (args.baseline, args.current):
+        try:
+            with open(path) as f:
+                documents.append(json.load(f)['results'])
+        except FileNotFoundError:
+            print(f"Erro: O arquivo '{path}' não foi encontrado.")
+            sys.exit(1)
+        except (ValueError, KeyError):
+            print(f"Erro: '{path}' não é um resultado do bench.py (--json).")
+            sys.exit(1)
+
+    rows = compare_results(documents[0], documents[1])
+    if not rows:
+        print("Erro: nenhuma medição em comum entre os dois arquivos.")
+        sys.exit(1)
+
+    regressions = 0
+    print(f"{'Carga':<8} | {'Algoritmo':<14} | {'Frames':<8} | {'Velocidade':<10} | Situação")
+    print("-" * 64)
+    for (workload, algo_name, frames), ratio, faults_changed in rows:
+        status = ''
+        if faults_changed:
+            status = 'FALTAS MUDARAM'
+        elif ratio < 1 - args.threshold:
+            status = 'REGRESSÃO'
+        if status:
+            regressions += 1
+        print(f"{workload:<8} | {algo_name:<14} | {frames:<8} | {ratio:<10.2f} | {status}")
+
+    print("-" * 64)
+    print(f"{len(rows)} medições comparadas, {regressions} com problema (velocidade = atual / base)")
+    if regressions:
+        sys.exit(1)
+
+
+def generate_main(argv):
+    """
+    Subcomando 'generate': grava uma carga sintética como trace para o pager.py.
+    """
+    parser = argparse.ArgumentParser(prog='bench.py generate', description='Gera um trace sintético')
+    parser.add_argument('workload', choices=list(WORKLOADS), help='Tipo de carga')
+    parser.add_argument('output', help='Arquivo de saída')
+    parser.add_argument('--refs', type=int, default=100000, help='Quantidade de referências (padrão: 100000)')
+    parser.add_argument('--pages', type=int, default=1024, help='Páginas distintas (padrão: 1024)')
+    parser.add_argument('--skew', type=float, default=1.0, help='Expoente da carga zipf (padrão: 1.0)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do gerador (padrão: 42)')
+    parser.add_argument('--binary', action='store_true', help='Grava no formato binário em vez de texto')
+    args = parser.parse_args(argv)
+
+    if args.refs < 1 or args.pages < 1:
+        print("Erro: --refs e --pages devem ser positivos.")
+        sys.exit(1)
+
+    params = {'skew': args.skew} if args.workload == 'zipf' else {}
+    references = generate(args.workload, args.refs, args.pages, args.seed, **params)
+    if args.binary:
+        dump_binary_trace(references, args.output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write('\n'.join(map(str, references)) + '\n')
+    print(f"Gravadas {len(references)} referências ({args.workload}) em '{args.output}'")
+
+
+def scaling_main(argv):
+    parser = argparse.ArgumentParser(prog='bench.py scaling', description='Benchmark de escalabilidade do LRU')
+    parser.add_argument('--max-frames', type=int, default=1 << 20, help='Maior número de frames testado (padrão: 1M)')
+    parser.add_argument('--refs', type=int, default=200000, help='Referências medidas por rodada')
+    args = parser.parse_args(argv)
+
+    print(f"{'Frames':<12} | {'ns/ref':<12} | {'Faltas':<12} |")
+    print("-" * 44)
+    for frames, ns_per_ref, faults in lru_scaling(args.max_frames, args.refs):
+        print(f"{frames:<12} | {ns_per_ref:<12.1f} | {faults:<12} |")
+
+
+SUBCOMMANDS = {
+    'compare': compare_main,
+    'generate': generate_main,
+    'scaling': scaling_main,
+}
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+    suite_main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import pickle
+
+'''
+-------------------------------------------------------------------------------------
+ CHECKPOINT DE SIMULAÇÕES LONGAS
+
+ - Um checkpoint guarda o snapshot do simulador (PageReplacementAlgorithm.snapshot)
+   junto com a posição no trace (iter_trace_segments) e o que identifica a
+   simulação: algoritmo, frames iniciais, opções e o trace.
+ - Retomar (--resume) recria o simulador com os mesmos parâmetros, aplica o
+   snapshot e continua a leitura da posição salva. Um trace que continua crescendo
+   pode ser processado aos poucos: cada execução consome o que foi acrescentado e
+   grava um checkpoint novo no fim.
+ - A gravação é atômica (arquivo temporário + os.replace): uma interrupção no meio
+   deixa o checkpoint anterior intacto.
+-------------------------------------------------------------------------------------
+'''
+
+CHECKPOINT_VERSION = 1
+
+class CheckpointError(ValueError):
+    """Checkpoint ilegível ou de outra simulação."""
+
+
+def save_checkpoint(path, simulator, header, position, marked, total_refs, duration_ns):
+    """
+    Grava o checkpoint. header identifica a simulação (algo, frames, opções, trace);
+    position / marked vêm de iter_trace_segments; total_refs e duration_ns são os
+    acumulados até aqui.
+    """
+    payload = {
+        'version': CHECKPOINT_VERSION,
+        'header': header,
+        'position': position,
+        'marked': marked,
+        'total_refs': total_refs,
+        'duration_ns': duration_ns,
+        'state': simulator.snapshot(),
+    }
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(payload, f, pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path, header):
+    """
+    Lê o checkpoint e confere se é da mesma simulação (header igual).
+    FileNotFoundError se não existir; CheckpointError se não servir.
+    """
+    with open(path, 'rb') as f:
+        try:
+            payload = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as exc:
+            raise CheckpointError(f"checkpoint '{path}' ilegível ({exc})") from None
+
+    if not isinstance(payload, dict) or payload.get('version') != CHECKPOINT_VERSION:
+        raise CheckpointError(f"checkpoint '{path}' de versão desconhecida")
+    saved = payload['header']
+    for key, value in header.items():
+        if saved.get(key) != value:
+            raise CheckpointError(f"checkpoint '{path}' é de outra simulação ({key}: {saved.get(key)!r}, agora {value!r})")
+    return payload
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+
+from algorithms import LRU, PageReplacementAlgorithm
+from registry import register
+
+'''
+-------------------------------------------------------------------------------------
+ ALOCAÇÃO DINÂMICA (o conjunto residente cresce e encolhe)
+
+ - As políticas de algorithms.py ocupam todos os frames e ficam cheias; aqui a
+   quantidade de páginas residentes acompanha o comportamento do programa, e o que
+   se paga é o produto memória x tempo (resident_time, ver run_metered).
+ - Working-Set (Denning): ficam na memória exatamente as páginas referenciadas nas
+   últimas τ referências (tempo virtual). capacity é só o limite físico: se o
+   conjunto de trabalho não couber, sai a página usada há mais tempo.
+ - PFF (Page-Fault Frequency): um LRU cuja quantidade de frames é ajustada por
+   resize() a cada janela de referências: taxa de faltas acima de `high` ganha 25%
+   de frames, abaixo de `low` perde 12,5% (as vítimas são as do próprio LRU).
+-------------------------------------------------------------------------------------
+'''
+
+@register('WS', aliases=('WORKINGSET',), params=('tau',))
+class WORKINGSET(PageReplacementAlgorithm):
+    """
+    Working-Set exato em O(1) amortizado: last_use guarda página -> instante do
+    último uso em ordem de uso, então as páginas que saíram da janela estão sempre
+    no início. Os frames liberados voltam para o topo da pilha de livres (aqui a
+    ordem dos frames livres não importa).
+    """
+    dynamic_residency = True
+
+    def __init__(self, capacity, tau=100):
+        super().__init__(capacity)
+        if tau < 1:
+            raise ValueError("a janela τ deve ter pelo menos 1 referência")
+        self.tau = tau
+        self.last_use = OrderedDict()
+        self.time = 0
+
+    def access(self, page_id, is_write=None):
+        self.time += 1
+        now = self.time
+        last_use = self.last_use
+
+        # 1. HIT
+        idx = self.page_table.get(page_id)
+        if idx is not None:
+            last_use[page_id] = now
+            last_use.move_to_end(page_id)
+            if is_write:
+                self.modified[idx] = 1
+            hit = True
+        else:
+            # 2. MISS
+            self.page_faults += 1
+            if self.free_frames:
+                idx = self.free_frames.pop()
+            else:
+                # Conjunto de trabalho maior que a memória física
+                self.evictions += 1
+                idx = self._evict_victim()
+            self._load(idx, page_id, is_write)
+            last_use[page_id] = now
+            hit = False
+
+        # 3. Sai quem não foi referenciado nas últimas τ referências
+        horizon = now - self.tau
+        while True:
+            oldest, used = next(iter(last_use.items()))
+            if used > horizon:
+                break
+            del last_use[oldest]
+            frame_idx = self.page_table[oldest]
+            self._release(frame_idx)
+            self.free_frames.append(frame_idx)
+
+        self._meter()
+        return hit
+
+    def _evict_victim(self, keep=None):
+        victim = self._oldest(self.last_use, keep)
+        del self.last_use[victim]
+        return self.page_table[victim]
+
+    def _admitted(self, page_id, frame_idx):
+        # Entra como usada agora, sem avançar o tempo virtual
+        self.last_use[page_id] = self.time
+
+
+@register('PFF', params=(('window', 'pff_window'), ('low', 'pff_low'), ('high', 'pff_high'), 'max_frames'))
+class PFF(LRU):
+    """
+    Controlador de frequência de faltas sobre o LRU. A cada `window` referências
+    compara a taxa de faltas da janela com os limites e chama resize(); max_frames
+    (opcional) limita o crescimento à memória física.
+    """
+    dynamic_residency = True
+    # O laço rápido do LRU pularia o controlador: volta para o run() genérico
+    run = PageReplacementAlgorithm.run
+
+    def __init__(self, capacity, window=100, low=0.02, high=0.10, max_frames=None):
+        super().__init__(capacity)
+        if window < 1 or not 0 <= low <= high:
+            raise ValueError("PFF precisa de janela >= 1 e 0 <= low <= high")
+        self.window = window
+        self.low = low
+        self.high = high
+        self.max_frames = max_frames
+        self.window_refs = 0
+        self.window_faults = 0
+        self.resizes = 0
+
+    def access(self, page_id, is_write=None):
+        hit = super().access(page_id, is_write)
+        self._meter()
+
+        self.window_refs += 1
+        if not hit:
+            self.window_faults += 1
+        if self.window_refs == self.window:
+            rate = self.window_faults / self.window
+            new_capacity = self.capacity
+            # Com frames livres as faltas são compulsórias: crescer não adiantaria
+            if rate > self.high and not self.free_frames:
+                new_capacity += max(1, self.capacity // 4)
+                if self.max_frames is not None:
+                    new_capacity = min(new_capacity, self.max_frames)
+            elif rate < self.low:
+                new_capacity = max(1, new_capacity - max(1, self.capacity // 8))
+            if new_capacity != self.capacity:
+                self.resize(new_capacity)
+                self.resizes += 1
+            self.window_refs = 0
+            self.window_faults = 0
+        return hit
@@ -0,0 +1,188 @@
+import csv
+import struct
+import sys
+from array import array
+
+'''
+-------------------------------------------------------------------------------------
+ LOG DE EVENTOS
+
+ - EventLog guarda os eventos de um simulador (ver attach_events) em colunas
+   tipadas pré-alocadas: referência (seq), tipo, página e frame. Cada referência
+   gera um HIT ou um FAULT; a página expulsa sai num EVICT logo depois do FAULT
+   que tomou o frame dela. Frames liberados sem substituta (Working-Set, resize)
+   saem em EVICTs com o mesmo seq, que podem vir antes do HIT/FAULT.
+ - resize() (PFF) gera RESIZE (página -1, frame = nova capacidade) seguido de um
+   MOVE (página, novo frame) por página residente, já que as páginas são realocadas.
+ - Quando as colunas enchem, o bloco vai para `flush` (ex.: EventWriter.write) e
+   o buffer é reaproveitado; sem flush, as colunas dobram de tamanho.
+ - Formato colunar (.pgev): cabeçalho com mágica e versão, seguido de grupos
+   "quantidade + coluna seq (int64) + coluna tipo (uint8) + coluna página (int64)
+   + coluna frame (int32)", tudo little-endian. Cada grupo é um bloco do log, então
+   o arquivo é gravado em fluxo e lido sem parsing (frombytes por coluna).
+ - CSV: seq,event,page,frame.
+-------------------------------------------------------------------------------------
+'''
+
+HIT, FAULT, EVICT, RESIZE, MOVE = 0, 1, 2, 3, 4
+EVENT_NAMES = ('hit', 'fault', 'evict', 'resize', 'move')
+
+EVENT_MAGIC = b'PGEVENT\0'
+EVENT_VERSION = 1
+EVENT_HEADER = struct.Struct('<8sH')
+GROUP_HEADER = struct.Struct('<I')
+COLUMNS = (('seq', 'q'), ('kind', 'B'), ('page', 'q'), ('frame', 'i'))
+
+class EventLog:
+    """
+    Colunas seq / kind / page / frame com `capacity` posições pré-alocadas.
+    mirror é a página de cada frame segundo os próprios eventos (é por ele que o
+    FAULT descobre a vítima).
+    """
+    def __init__(self, capacity=1 << 16, flush=None):
+        self.capacity = capacity
+        self.flush = flush
+        self.seq = array('q', bytes(8 * capacity))
+        self.kind = bytearray(capacity)
+        self.page = array('q', bytes(8 * capacity))
+        self.frame = array('i', bytes(4 * capacity))
+        self.count = 0       # Eventos no buffer
+        self.flushed = 0     # Eventos já entregues ao flush
+        self.position = 0    # Referência atual (seq)
+        self.mirror = []
+
+    def _append(self, kind, page_id, frame_idx):
+        count = self.count
+        if count == self.capacity:
+            self._spill()
+            count = self.count
+        self.seq[count] = self.position
+        self.kind[count] = kind
+        self.page[count] = page_id
+        self.frame[count] = frame_idx
+        self.count = count + 1
+
+    def _spill(self):
+        if self.flush is not None:
+            self.flush(self)
+            self.flushed += self.count
+            self.count = 0
+            return
+        # Sem destino: dobra as colunas (a metade nova é sobrescrita pelos próximos eventos)
+        self.seq.extend(self.seq)
+        self.kind.extend(self.kind)
+        self.page.extend(self.page)
+        self.frame.extend(self.frame)
+        self.capacity *= 2
+
+    def hit(self, page_id, frame_idx):
+        self._append(HIT, page_id, frame_idx)
+
+    def fault(self, page_id, frame_idx):
+        mirror = self.mirror
+        if frame_idx >= len(mirror):
+            mirror.extend([-1] * (frame_idx + 1 - len(mirror)))
+        victim = mirror[frame_idx]
+        self._append(FAULT, page_id, frame_idx)
+        if victim != -1 and victim != page_id:
+            self._append(EVICT, victim, frame_idx)
+        mirror[frame_idx] = page_id
+
+    def evict(self, page_id, frame_idx):
+        self._append(EVICT, page_id, frame_idx)
+        self.mirror[frame_idx] = -1
+
+    def advance(self):
+        self.position += 1
+
+    def sync(self, frame_pages):
+        # Refaz o espelho (attach_events, restore)
+        self.mirror = list(frame_pages)
+
+    def relayout(self, frame_pages, resident):
+        # Depois de um resize: quem saiu do espelho foi expulso, o resto mudou de frame
+        for frame_idx, page_id in enumerate(self.mirror):
+            if page_id != -1 and page_id not in resident:
+                self._append(EVICT, page_id, frame_idx)
+        self.mirror = list(frame_pages)
+        self._append(RESIZE, -1, len(self.mirror))
+        for frame_idx, page_id in enumerate(self.mirror):
+            if page_id != -1:
+                self._append(MOVE, page_id, frame_idx)
+
+    def columns(self):
+        """
+        Colunas com os eventos ainda no buffer (memoryviews, sem cópia). Solte as
+        views antes de registrar mais eventos: as colunas não crescem enquanto exportadas.
+        """
+        count = self.count
+        return {'seq': memoryview(self.seq)[:count], 'kind': memoryview(self.kind)[:count],
+                'page': memoryview(self.page)[:count], 'frame': memoryview(self.frame)[:count]}
+
+    def __len__(self):
+        return self.flushed + self.count
+
+
+class EventWriter:
+    """Grava os blocos do EventLog em .pgev (colunar) ou CSV; use write como flush."""
+    def __init__(self, path, fmt=None):
+        self.format = fmt or ('csv' if path.endswith('.csv') else 'columnar')
+        if self.format == 'csv':
+            self.file = open(path, 'w', newline='')
+            self.csv = csv.writer(self.file)
+            self.csv.writerow(('seq', 'event', 'page', 'frame'))
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(EVENT_HEADER.pack(EVENT_MAGIC, EVENT_VERSION))
+
+    def write(self, log):
+        columns = log.columns()
+        count = log.count
+        if not count:
+            return
+        if self.format == 'csv':
+            names = EVENT_NAMES
+            self.csv.writerows(zip(columns['seq'], (names[kind] for kind in columns['kind']),
+                                   columns['page'], columns['frame']))
+            return
+        self.file.write(GROUP_HEADER.pack(count))
+        for name, code in COLUMNS:
+            column = columns[name]
+            if sys.byteorder != 'little' and code != 'B':
+                column = array(code, column)
+                column.byteswap()
+            self.file.write(column)
+
+    def close(self, log=None):
+        # Grava o que sobrou no buffer do log
+        if log is not None:
+            self.write(log)
+            log.flushed += log.count
+            log.count = 0
+        self.file.close()
+
+
+def read_event_log(path):
+    """Lê um .pgev e devolve {coluna: array} com todos os grupos concatenados."""
+    result = {name: array(code) for name, code in COLUMNS}
+    with open(path, 'rb') as f:
+        header = f.read(EVENT_HEADER.size)
+        if len(header) < EVENT_HEADER.size or EVENT_HEADER.unpack(header) != (EVENT_MAGIC, EVENT_VERSION):
+            raise ValueError(f"'{path}' não é um log de eventos")
+        while True:
+            raw = f.read(GROUP_HEADER.size)
+            if not raw:
+                break
+            (count,) = GROUP_HEADER.unpack(raw)
+            for name, code in COLUMNS:
+                column = result[name]
+                size = count * column.itemsize
+                data = f.read(size)
+                if len(data) < size:
+                    raise ValueError(f"log de eventos '{path}' truncado")
+                column.frombytes(data)
+    if sys.byteorder != 'little':
+        for name, code in COLUMNS:
+            if code != 'B':
+                result[name].byteswap()
+    return result
@@ -0,0 +1,321 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from array import array
+
+from traces import CHUNK_SIZE, TraceFormatError
+
+'''
+-------------------------------------------------------------------------------------
+ INGESTÃO AO VIVO (asyncio)
+
+ - As referências chegam num fluxo de texto, no mesmo formato dos traces ("7",
+   "7 R", "7 W"), pela entrada padrão, por um socket Unix ou por uma porta TCP em
+   localhost. Vários simuladores consomem o mesmo fluxo ao mesmo tempo.
+ - O leitor corta o fluxo em blocos que nunca atravessam uma janela de métricas
+   (K referências) e entrega o mesmo bloco (só leitura) à fila de cada simulador.
+   Cada simulador roda numa thread do executor, para o laço de eventos continuar
+   lendo e publicando enquanto as políticas trabalham.
+ - Contrapressão: as filas são limitadas (max_pending blocos). Se uma política
+   atrasa, o put() do leitor espera, o leitor para de ler e o buffer do socket (ou
+   do pipe) enche até o produtor bloquear. A memória fica limitada a
+   max_pending * tamanho do bloco, qualquer que seja a velocidade do produtor.
+ - A cada K referências sai a taxa de faltas da janela de cada simulador (e a
+   acumulada), na tela e, opcionalmente, em JSON lines.
+ - feed: produtor de teste que manda um trace (ou uma carga sintética) para o
+   mesmo tipo de destino, respeitando a contrapressão (drain).
+-------------------------------------------------------------------------------------
+'''
+
+READ_SIZE = 1 << 16
+LOCALHOSTS = ('localhost', '127.0.0.1', '::1')
+
+def parse_endpoint(text):
+    """
+    '-' (entrada/saída padrão), 'unix:CAMINHO', 'tcp:PORTA' ou 'tcp:HOST:PORTA'
+    (só localhost). Devolve ('stdio', None), ('unix', caminho) ou ('tcp', (host, porta)).
+    """
+    if text == '-':
+        return 'stdio', None
+    kind, _sep, rest = text.partition(':')
+    if kind == 'unix' and rest:
+        return 'unix', rest
+    if kind == 'tcp' and rest:
+        host, _sep, port = rest.rpartition(':')
+        host = host.strip('[]') or '127.0.0.1'
+        if host not in LOCALHOSTS:
+            raise ValueError(f"só aceito conexões em localhost, não '{host}'")
+        if not port.isdigit() or not 0 < int(port) < 65536:
+            raise ValueError(f"porta inválida '{port}'")
+        return 'tcp', (host, int(port))
+    raise ValueError(f"destino inválido '{text}' (use -, unix:CAMINHO ou tcp:PORTA)")
+
+
+class LineParser:
+    """
+    Converte blocos de bytes em (páginas, escritas) com as regras de traces.py;
+    guarda a linha incompleta do fim de cada bloco para o próximo. Único leitor
+    que não enxerga o fluxo inteiro: as linhas sem marca que chegam antes da
+    primeira marca R/W ficam sem informação de escrita (escritas = None).
+    """
+    def __init__(self):
+        self.partial = b''
+        self.marked = False
+        self.line_number = 0
+
+    def feed(self, data, final=False):
+        lines = (self.partial + data).split(b'\n')
+        self.partial = b'' if final else lines.pop()
+        pages = array('q')
+        write_positions = []
+        for line in lines:
+            self.line_number += 1
+            if not line.strip():
+                continue
+            try:
+                pages.append(int(line))
+            except ValueError:
+                parts = line.split()
+                if len(parts) != 2 or parts[1].upper() not in (b'R', b'W'):
+                    raise TraceFormatError(self.line_number, line.decode(errors='replace').strip()) from None
+                try:
+                    page = int(parts[0])
+                except ValueError:
+                    raise TraceFormatError(self.line_number, line.decode(errors='replace').strip()) from None
+                if parts[1].upper() == b'W':
+                    write_positions.append(len(pages))
+                self.marked = True
+                pages.append(page)
+
+        if not self.marked:
+            return pages, None
+        writes = bytearray(len(pages))
+        for pos in write_positions:
+            writes[pos] = 1
+        return pages, writes
+
+
+class LiveSession:
+    """
+    Simuladores alimentados pelo mesmo fluxo. simulators: lista de (nome, simulador).
+    report_every: K (referências por janela); max_pending: blocos em fila por
+    simulador; json_out: arquivo aberto para as métricas em JSON lines (ou None).
+    """
+    def __init__(self, simulators, report_every=10000, max_pending=8, chunk_size=CHUNK_SIZE, json_out=None):
+        self.simulators = simulators
+        self.report_every = report_every
+        self.chunk_size = min(chunk_size, report_every)
+        self.max_pending = max_pending
+        self.json_out = json_out
+        self.queues = []
+        self.total_refs = 0
+        self.window_fill = 0          # Referências já entregues na janela atual
+        self.faults = [0] * len(simulators)
+        self.refs = [0] * len(simulators)
+        self.pending_windows = {}     # janela -> {simulador: (refs, faltas, acumulados)}
+        self.max_queued = 0           # Maior fila observada (contrapressão funcionando)
+        self.start_time = None
+
+    async def run(self, source):
+        """Consome `source` (gerador assíncrono de bytes) até o fim e fecha as filas."""
+        self.start_time = time.perf_counter()
+        self.queues = [asyncio.Queue(self.max_pending) for _ in self.simulators]
+        consumers = [asyncio.create_task(self._consume(i)) for i in range(len(self.simulators))]
+        self._print_header()
+        parser = LineParser()
+        try:
+            async for data in source:
+                await self._dispatch(*parser.feed(data))
+            await self._dispatch(*parser.feed(b'', final=True))
+        finally:
+            for queue in self.queues:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+
+    async def _dispatch(self, pages, writes):
+        # Fatia sem atravessar a fronteira da janela nem passar de chunk_size
+        start = 0
+        while start < len(pages):
+            room = min(self.chunk_size, self.report_every - self.window_fill)
+            end = min(start + room, len(pages))
+            item = (pages[start:end], writes[start:end] if writes is not None else None)
+            self.window_fill = (self.window_fill + end - start) % self.report_every
+            for queue in self.queues:
+                self.max_queued = max(self.max_queued, queue.qsize())
+                await queue.put(item)  # Fila cheia: o leitor espera (contrapressão)
+            self.total_refs += end - start
+            start = end
+
+    async def _consume(self, index):
+        loop = asyncio.get_running_loop()
+        _name, simulator = self.simulators[index]
+        queue = self.queues[index]
+        window = 0
+        window_refs = 0
+        window_faults = 0
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            pages, writes = item
+            hits = await loop.run_in_executor(None, simulator.run_metered, pages, writes)
+            window_refs += len(pages)
+            window_faults += len(pages) - hits
+            self.refs[index] += len(pages)
+            self.faults[index] += len(pages) - hits
+            if window_refs == self.report_every:
+                self._publish(window, index, (window_refs, window_faults, self.refs[index], self.faults[index]))
+                window += 1
+                window_refs = window_faults = 0
+        if window_refs:
+            self._publish(window, index, (window_refs, window_faults, self.refs[index], self.faults[index]))
+
+    def _publish(self, window, index, counts):
+        # A linha da janela sai quando todos os simuladores passaram por ela; cada
+        # simulador fecha as janelas em ordem, então as linhas também saem em ordem
+        reported = self.pending_windows.setdefault(window, {})
+        reported[index] = counts
+        if len(reported) < len(self.simulators):
+            return
+        del self.pending_windows[window]
+
+        window_refs, _faults, end_ref, _total_faults = counts
+        cells = []
+        record = {'refs': end_ref, 'window': window_refs, 'elapsed': round(time.perf_counter() - self.start_time, 3),
+                  'fault_rate': {}, 'total_fault_rate': {}}
+        for i, (name, _simulator) in enumerate(self.simulators):
+            refs, faults, total_refs, total_faults = reported[i]
+            rate = faults / refs
+            total_rate = total_faults / total_refs
+            record['fault_rate'][name] = rate
+            record['total_fault_rate'][name] = total_rate
+            cells.append(f"{f'{rate * 100:.2f}% ({total_rate * 100:.2f}%)':<18}")
+        print(f"{end_ref:<14} | " + " | ".join(cells) + " |", flush=True)
+        if self.json_out is not None:
+            self.json_out.write(json.dumps(record) + '\n')
+            self.json_out.flush()
+
+    def _print_header(self):
+        names = " | ".join(f"{name:<18}" for name, _simulator in self.simulators)
+        print(f"Taxa de faltas a cada {self.report_every} referências: janela (acumulada)")
+        print(f"{'Referências':<14} | {names} |")
+        print("-" * (17 + 21 * len(self.simulators)), flush=True)
+
+    def print_summary(self):
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0.0
+        print("-" * (17 + 21 * len(self.simulators)))
+        print(f"Total: {self.total_refs} referências em {elapsed:.2f} s (maior fila: {self.max_queued} de {self.max_pending} blocos)")
+        for (name, simulator), refs, faults in zip(self.simulators, self.refs, self.faults):
+            taxa = (faults / refs) * 100 if refs else 0.0
+            print(f"{name:<10} | faltas {faults:<12} | taxa {taxa:.2f}% | writebacks {simulator.writebacks}")
+
+
+async def stdin_source():
+    # read1 numa thread: só lê o próximo bloco quando o anterior foi entregue
+    loop = asyncio.get_running_loop()
+    while True:
+        data = await loop.run_in_executor(None, sys.stdin.buffer.read1, READ_SIZE)
+        if not data:
+            return
+        yield data
+
+
+async def stream_source(reader):
+    while True:
+        data = await reader.read(READ_SIZE)
+        if not data:
+            return
+        yield data
+
+
+async def serve(session, endpoint, keep_listening=False, on_ready=None):
+    """
+    Roda a sessão sobre o destino de parse_endpoint. Sockets atendem um produtor
+    por vez (o fluxo é um só); sem keep_listening o servidor fecha quando o
+    primeiro produtor desconecta.
+    """
+    kind, address = endpoint
+    if kind == 'stdio':
+        if on_ready:
+            on_ready()
+        await session.run(stdin_source())
+        return
+
+    # Blocos de bytes das conexões para a sessão; fila cheia = a conexão para de ler
+    incoming = asyncio.Queue(2)
+    busy = asyncio.Lock()
+
+    async def handle(reader, writer):
+        async with busy:
+            try:
+                async for data in stream_source(reader):
+                    await incoming.put(data)
+            finally:
+                writer.close()
+            # Fecha a última linha do produtor (se veio sem quebra de linha)
+            await incoming.put(b'\n')
+            if not keep_listening:
+                await incoming.put(None)
+
+    async def incoming_source():
+        while True:
+            data = await incoming.get()
+            if data is None:
+                return
+            yield data
+
+    if kind == 'unix':
+        server = await asyncio.start_unix_server(handle, path=address)
+    else:
+        server = await asyncio.start_server(handle, host=address[0], port=address[1])
+    try:
+        async with server:
+            if on_ready:
+                on_ready()
+            await session.run(incoming_source())
+    finally:
+        # Versões antigas do asyncio deixam o arquivo do socket para trás
+        if kind == 'unix' and os.path.exists(address):
+            os.unlink(address)
+
+
+async def feed(endpoint, references, writes=None, rate=None, batch=4096):
+    """
+    Produtor de teste: manda as referências (com R/W se houver escritas) para o
+    destino, em lotes; rate limita as referências por segundo. drain() segura o
+    produtor quando o consumidor não acompanha.
+    """
+    kind, address = endpoint
+    if kind == 'unix':
+        _reader, writer = await asyncio.open_unix_connection(address)
+    elif kind == 'tcp':
+        _reader, writer = await asyncio.open_connection(address[0], address[1])
+    else:
+        writer = None
+
+    start = time.perf_counter()
+    for offset in range(0, len(references), batch):
+        pages = references[offset:offset + batch]
+        if writes is None:
+            text = '\n'.join(map(str, pages))
+        else:
+            text = '\n'.join(f"{page} {'W' if written else 'R'}"
+                             for page, written in zip(pages, writes[offset:offset + batch]))
+        data = (text + '\n').encode()
+        if writer is None:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        else:
+            writer.write(data)
+            await writer.drain()
+        if rate:
+            # Dorme o que falta para não passar de `rate` referências por segundo
+            ahead = (offset + len(pages)) / rate - (time.perf_counter() - start)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+
+    if writer is not None:
+        writer.close()
+        await writer.wait_closed()
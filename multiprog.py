@@ -0,0 +1,135 @@
+from array import array
+from collections import deque
+
+import registry
+
+'''
+-------------------------------------------------------------------------------------
+ MULTIPROGRAMAÇÃO
+
+ - Vários processos, cada um com o seu trace (espaço de endereçamento próprio),
+   disputam a mesma memória física. Um escalonador round-robin entrega a CPU a cada
+   processo por um quantum de `quantum` referências (quantum 1 = alternância a cada
+   referência; maior = fatias de tempo); processo que termina sai da fila.
+ - Substituição global: um único simulador com todos os frames; a vítima pode ser
+   de qualquer processo. As páginas ganham o processo nos bits altos
+   (processo << PID_SHIFT | página), então não colidem e mantêm a paridade (NRU).
+ - Substituição local: cada processo tem o seu simulador com uma cota fixa de
+   frames, dividida igualmente (fixed) ou proporcional ao tamanho do processo em
+   páginas distintas (proportional, a_i = s_i / S * m).
+ - Qualquer política do registro serve; o OTIMO recebe o trace intercalado
+   (global) ou o do próprio processo (local), já que o escalonamento é determinístico.
+-------------------------------------------------------------------------------------
+'''
+
+PID_SHIFT = 40
+ALLOCATIONS = ('global', 'fixed', 'proportional')
+
+class Process:
+    def __init__(self, name, pages, writes=None):
+        self.name = name
+        self.pages = pages
+        self.writes = writes
+
+
+def schedule(lengths, quantum=1):
+    """Gera as fatias (processo, início, fim) do round-robin com até `quantum` referências."""
+    positions = [0] * len(lengths)
+    queue = deque(i for i, length in enumerate(lengths) if length)
+    while queue:
+        proc = queue.popleft()
+        start = positions[proc]
+        end = min(start + quantum, lengths[proc])
+        yield proc, start, end
+        positions[proc] = end
+        if end < lengths[proc]:
+            queue.append(proc)
+
+
+def allocate_frames(processes, total_frames, allocation):
+    """
+    Cota de frames de cada processo na substituição local (pelo menos 1 cada).
+    Sobras do arredondamento vão para os maiores restos.
+    """
+    count = len(processes)
+    if total_frames < count:
+        raise ValueError(f"{total_frames} frames não bastam para {count} processos (mínimo 1 cada)")
+
+    if allocation == 'fixed':
+        shares = [total_frames / count] * count
+    else:
+        sizes = [len(set(proc.pages)) or 1 for proc in processes]
+        total_size = sum(sizes)
+        shares = [total_frames * size / total_size for size in sizes]
+
+    frames = [max(1, int(share)) for share in shares]
+    # Ajusta para somar exatamente total_frames
+    by_remainder = sorted(range(count), key=lambda i: shares[i] - int(shares[i]), reverse=True)
+    step = 0
+    while sum(frames) < total_frames:
+        frames[by_remainder[step % count]] += 1
+        step += 1
+    while sum(frames) > total_frames:
+        largest = max(range(count), key=lambda i: frames[i])
+        frames[largest] -= 1
+    return frames
+
+
+def _encode(proc_index, pages):
+    if len(pages) and (min(pages) < 0 or max(pages) >= (1 << PID_SHIFT)):
+        raise ValueError(f"páginas do processo {proc_index} fora de 0..2^{PID_SHIFT}-1")
+    base = proc_index << PID_SHIFT
+    return array('q', (base + page for page in pages))
+
+
+def simulate(processes, algo_name, total_frames, allocation='global', quantum=1, options=None):
+    """
+    Roda os processos intercalados e devolve um dicionário com, por processo,
+    'references', 'faults' e 'frames' (cota local, ou páginas residentes no fim na
+    substituição global), mais 'writebacks' no total.
+    """
+    spec = registry.get_spec(algo_name)
+    options = options or {}
+    lengths = [len(proc.pages) for proc in processes]
+    slices = list(schedule(lengths, quantum))
+    faults = [0] * len(processes)
+
+    if allocation == 'global':
+        # memoryview: as fatias do escalonador não copiam o trace
+        encoded = [memoryview(_encode(i, proc.pages)) for i, proc in enumerate(processes)]
+        interleaved = None
+        if spec.needs_trace:
+            interleaved = array('q')
+            for proc, start, end in slices:
+                interleaved.extend(encoded[proc][start:end])
+        simulator = spec.create(total_frames, interleaved, **options, max_frames=total_frames)
+
+        for proc, start, end in slices:
+            writes = processes[proc].writes
+            hits = simulator.run(encoded[proc][start:end],
+                                 writes=writes[start:end] if writes is not None else None)
+            faults[proc] += (end - start) - hits
+
+        frames = [0] * len(processes)
+        for page in simulator.page_table:
+            frames[page >> PID_SHIFT] += 1
+        writebacks = simulator.writebacks
+    else:
+        frames = allocate_frames(processes, total_frames, allocation)
+        simulators = [spec.create(num_frames, proc.pages, **options, max_frames=num_frames)
+                      for num_frames, proc in zip(frames, processes)]
+        views = [memoryview(proc.pages) for proc in processes]
+
+        for proc, start, end in slices:
+            writes = processes[proc].writes
+            hits = simulators[proc].run(views[proc][start:end],
+                                        writes=writes[start:end] if writes is not None else None)
+            faults[proc] += (end - start) - hits
+        writebacks = sum(simulator.writebacks for simulator in simulators)
+
+    return {
+        'references': lengths,
+        'faults': faults,
+        'frames': frames,
+        'writebacks': writebacks,
+    }
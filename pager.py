@@ -1,156 +1,1058 @@
 import argparse
+import json
+import os
 import sys
+import tempfile
 import time
-from algorithms import FIFO, LRU, OTIMO, SECONDCHANCE, CLOCK, NRU, LFU, MFU 
+from concurrent.futures import ProcessPoolExecutor
+import registry
+from traces import (CHUNK_SIZE, TraceFormatError, dump_binary_trace, is_binary_trace, iter_trace_records,
+                    iter_trace_segments, load_pid_trace, load_trace_records, map_binary_records, write_binary_trace)
 
-def run_comparison_table(references):
+def parse_frames_range(text):
     """
-    Roda todos os algoritmos para 3 e 4 frames e imprime a tabela
+    Converte 'INICIO:FIM[:PASSO]' (ou só 'FIM', que equivale a 1:FIM) numa lista de frames
     """
-    algorithms_list = ['FIFO', 'LRU', 'OTIMO', 'CLOCK', 'SC', 'NRU', 'LFU', 'MFU']
-    frame_options = [3, 4]
+    parts = [int(p) for p in text.split(':')]
+    if len(parts) == 1:
+        parts = [1, parts[0]]
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) > 2 else 1
+    if start < 1 or stop < start or step < 1:
+        raise ValueError(text)
+    return list(range(start, stop + 1, step))
+
+# Nomes aceitos por --nru-writes (o NRU resolve o nome em algorithms.WRITE_PREDICATES)
+WRITE_PREDICATE_NAMES = ['all', 'even', 'none', 'odd']
+
+def simulate_table_cell(algo_name, num_frames, references, writes=None, options=None):
+    """
+    Roda um algoritmo com uma quantidade de frames e devolve as faltas de página
+    """
+    # Instanciação pelo registro (nome canônico ou apelido); a coluna é uma memória
+    # de num_frames frames, então o PFF não pode crescer além dela
+    simulator = registry.create(algo_name, num_frames, references, **(options or {}), max_frames=num_frames)
+    
+    # --- Execução Silenciosa (em lote) ---
+    simulator.run(references, writes=writes)
+    
+    # Guarda o resultado de faltas de página
+    return simulator.page_faults
+
+def _table_cell_worker(algo_name, num_frames, binary_path, options):
+    # Roda no processo filho: mapeia o trace binário em vez de receber o trace picklado
+    references, writes = map_binary_records(binary_path)
+    return simulate_table_cell(algo_name, num_frames, references, writes, options)
+
+def _run_cells_parallel(cells, references, writes, jobs, trace_path=None, options=None):
+    """
+    Distribui as células (algoritmo, frames) entre processos. O trace é entregue
+    aos workers como arquivo binário mapeado em memória (o próprio --trace quando já
+    é binário, senão uma cópia temporária), e os resultados voltam na ordem das células.
+    Devolve None quando o trace não cabe no formato binário (páginas negativas).
+    """
+    temp_path = None
+    if trace_path and is_binary_trace(trace_path):
+        binary_path = trace_path
+    else:
+        fd, temp_path = tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+        binary_path = temp_path
+
+    try:
+        if temp_path:
+            try:
+                dump_binary_trace(references, temp_path, writes=writes)
+            except TraceFormatError as exc:
+                print(f"Aviso: --jobs ignorado ({exc.line}), rodando em série.", file=sys.stderr)
+                return None
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_table_cell_worker, algo_name, num_frames, binary_path, options)
+                       for algo_name, num_frames in cells]
+            return [future.result() for future in futures]
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+
+def run_comparison_table(references, frame_options=(3, 4), jobs=1, trace_path=None, writes=None, options=None):
+    """
+    Roda todos os algoritmos registrados para cada quantidade de frames (padrão: 3 e 4)
+    e imprime a tabela.
+    Com jobs > 1 as células (algoritmo, frames) rodam em paralelo num pool de processos.
+    """
+    specs = registry.available()
+    cells = [(spec.name, num_frames) for spec in specs for num_frames in frame_options]
+    all_faults = _run_cells_parallel(cells, references, writes, jobs, trace_path, options) if jobs > 1 else None
+    if all_faults is None:
+        all_faults = [simulate_table_cell(algo_name, num_frames, references, writes, options)
+                      for algo_name, num_frames in cells]
 
     # Cabeçalho da tabela
-    print(f"{'Page Faults':<20} | {'3 Frames':<20} | {'4 Frames':<20} |")
-    print("-" * 68)
+    header = " | ".join(f"{f'{n} Frames':<20}" for n in frame_options)
+    print(f"{'Page Faults':<20} | {header} |")
+    print("-" * (22 + 23 * len(frame_options)))
 
-    for algo_name in algorithms_list:
-        results = []
-        
-        for num_frames in frame_options:
-            
-            # Instanciação
-            if algo_name == 'FIFO':
-                simulator = FIFO(num_frames)
-            elif algo_name == 'LRU':
-                simulator = LRU(num_frames)
-            elif algo_name == 'OTIMO':
-                simulator = OTIMO(num_frames, references)
-            elif algo_name == 'CLOCK':
-                simulator = CLOCK(num_frames)
-            elif algo_name == 'SC':
-                simulator = SECONDCHANCE(num_frames)
-            elif algo_name == 'NRU':
-                simulator = NRU(num_frames)
-            elif algo_name == 'LFU':
-                simulator = LFU(num_frames) 
-            elif algo_name == 'MFU':
-                simulator = MFU(num_frames)
-            
-            # --- Execução Silenciosa ---
-            for page in references:
-                simulator.access(page)
-            
-            # Guarda o resultado de faltas de página
-            results.append(simulator.page_faults)
+    for row_idx, spec in enumerate(specs):
+        results = all_faults[row_idx * len(frame_options):(row_idx + 1) * len(frame_options)]
         
-        # Imprime a linha da tabela
-        # results[0] é para 3 frames, results[1] é para 4 frames
-        print(f"{algo_name:<20} | {results[0]:<20} | {results[1]:<20} |")
+        # Imprime a linha da tabela (uma coluna por quantidade de frames)
+        row = " | ".join(f"{faults:<20}" for faults in results)
+        print(f"{spec.label:<20} | {row} |")
 
-def run_visual_simulation(simulator, references):
+def run_curve(algo_name, references, frame_options, output_path=None):
+    """
+    Curva de faltas (miss-ratio curve) de um algoritmo de pilha numa única passada
+    pelo trace: calcula o histograma de distâncias de pilha e deriva as faltas de
+    todas as quantidades de frames de uma vez. Opcionalmente exporta em CSV.
+    """
+    from stack_distance import STACK_ENGINES, fault_curve
+
+    histogram, cold_misses = STACK_ENGINES[algo_name](references)
+    faults = fault_curve(histogram, cold_misses, max(frame_options))
+    total_refs = len(references)
+
+    print(f"Curva de faltas: {algo_name} ({total_refs} referências, {cold_misses} compulsórias)")
+    print(f"{'Frames':<10} | {'Faltas':<12} | {'Taxa de faltas':<15}")
+    print("-" * 40)
+    for num_frames in frame_options:
+        taxa = (faults[num_frames] / total_refs) * 100 if total_refs else 0.0
+        print(f"{num_frames:<10} | {faults[num_frames]:<12} | {taxa:.2f}%")
+
+    if output_path:
+        with open(output_path, 'w') as f:
+            f.write("frames,faults,miss_ratio\n")
+            for num_frames in frame_options:
+                ratio = faults[num_frames] / total_refs if total_refs else 0.0
+                f.write(f"{num_frames},{faults[num_frames]},{ratio:.6f}\n")
+        print(f"Curva exportada para '{output_path}'")
+
+VISUAL_BATCH = 256
+
+def run_visual_simulation(simulator, records, max_rate=500):
     """
     Imprime o passo a passo da memória.
+    O simulador roda em lotes com o log de eventos ligado (attach_events) e a
+    memória de cada passo é refeita a partir dos eventos; as linhas de um lote saem
+    num único write. max_rate limita as linhas por segundo (balde de fichas com
+    rajada de max_rate linhas; 0 = sem limite): o excesso vira uma linha "...".
     Substitui -1 por '_' .
     """
+    from events import EVICT, FAULT, MOVE, RESIZE, EventLog
+
     print(f"Simulação Visual: {type(simulator).__name__} ({simulator.capacity} Frames)")
     print(f"{'Ref':<5} | {'Status':<10} | {'Memória'}")
     print("-" * 40)
 
-    for page in references:
-        # O método access retorna True (Está na memoria) ou False (Não está na memória)
-        is_hit = simulator.access(page)
-        
-        status = " " if is_hit else "X"
-        
-        # Formata a memória: troca -1 por um sublinhado visual
-        mem_str = "[ " + " ".join(str(p) if p != -1 else "_" for p in simulator.memory) + " ]"
-        
-        # Imprime a linha
-        print(f"{page:<5} | {status:<10} | {mem_str}")
-    
+    log = EventLog(VISUAL_BATCH * 2)
+    simulator.attach_events(log)
+    frames = [-1] * simulator.capacity
+    head = 0
+    tokens = float(max_rate)
+    last_time = time.perf_counter()
+    omitted = omitted_faults = 0
+
+    for pages, writes in records:
+        for start in range(0, len(pages), VISUAL_BATCH):
+            batch = pages[start:start + VISUAL_BATCH]
+            simulator.run(batch, writes=writes[start:start + VISUAL_BATCH] if writes is not None else None)
+
+            columns = log.columns()
+            seqs, kinds, event_pages, event_frames = columns['seq'], columns['kind'], columns['page'], columns['frame']
+            count = log.count
+            if max_rate:
+                now = time.perf_counter()
+                tokens = min(float(max_rate), tokens + (now - last_time) * max_rate)
+                last_time = now
+
+            lines = []
+            for i in range(count):
+                kind = kinds[i]
+                frame_idx = event_frames[i]
+                if kind == FAULT or kind == MOVE:
+                    frames[frame_idx] = event_pages[i]
+                elif kind == EVICT:
+                    if frames[frame_idx] == event_pages[i]:
+                        frames[frame_idx] = -1  # Liberado sem substituta
+                    else:
+                        head = (frame_idx + 1) % len(frames)  # Vítima de uma falta
+                elif kind == RESIZE:
+                    frames = [-1] * frame_idx
+                    head = 0
+                if kind <= FAULT:
+                    first = i  # O HIT/FAULT da referência (os outros eventos vêm junto)
+                if i + 1 < count and seqs[i + 1] == seqs[i]:
+                    continue
+
+                # Fim dos eventos da referência: imprime o estado depois dela
+                is_hit = kinds[first] != FAULT
+                if max_rate and tokens < 1:
+                    omitted += 1
+                    omitted_faults += not is_hit
+                    continue
+                if omitted:
+                    lines.append(f"... {omitted} referências omitidas ({omitted_faults} faltas)")
+                    omitted = omitted_faults = 0
+                tokens -= 1
+
+                status = " " if is_hit else "X"
+                shown = frames[head:] + frames[:head] if simulator.display_from_head else frames
+                # Formata a memória: troca -1 por um sublinhado visual
+                mem_str = "[ " + " ".join(str(p) if p != -1 else "_" for p in shown) + " ]"
+                lines.append(f"{event_pages[first]:<5} | {status:<10} | {mem_str}")
+
+            # Solta as views antes do próximo lote: o log não cresce com buffers exportados
+            del columns, seqs, kinds, event_pages, event_frames
+            log.count = 0
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+
+    if omitted:
+        print(f"... {omitted} referências omitidas ({omitted_faults} faltas)")
+    simulator.detach_events()
     print("-" * 40)
     print(f"Total Faltas: {simulator.page_faults}")
 
+def run_analysis(trace_path, windows_text=None, json_path=None, reuse_distance=False):
+    """
+    Características do trace (módulo analytics, vetorizado com NumPy)
+    """
+    try:
+        from analytics import analyze, load_trace_array
+    except ImportError:
+        print("Erro: --analyze requer o NumPy (pip install numpy).")
+        sys.exit(1)
+
+    try:
+        windows = [int(w) for w in windows_text.split(',')] if windows_text else None
+    except ValueError:
+        print(f"Erro: janelas inválidas '{windows_text}' (use números separados por vírgula).")
+        sys.exit(1)
+
+    try:
+        result = analyze(load_trace_array(trace_path), windows, reuse_distance)
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{trace_path}' não foi encontrado.")
+        sys.exit(1)
+    except TraceFormatError as exc:
+        print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
+        sys.exit(1)
+
+    if json_path == '-':
+        print(json.dumps(result, indent=2))
+        return
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    print(f"Análise do trace: {trace_path}")
+    print("-" * 40)
+    print(f"Referências: {result['references']}")
+    print(f"Páginas distintas: {result['unique_pages']}")
+    if result.get('mean_reuse_distance') is not None:
+        print(f"Distância média de reúso: {result['mean_reuse_distance']:.2f} páginas distintas")
+    if result.get('mean_reuse_time') is not None:
+        print(f"Tempo médio de reúso: {result['mean_reuse_time']:.2f} referências")
+
+    # Sem --reuse-distance a tabela mostra o tempo de reúso, que sai de graça
+    if result['reuse_distance_histogram'] is not None:
+        title, histogram = 'Distância de reúso', result['reuse_distance_histogram']
+    else:
+        title, histogram = 'Tempo de reúso', result['reuse_time_histogram']
+    print()
+    print(f"{title:<24} | {'Quantidade':<12}")
+    print("-" * 40)
+    for bucket in histogram:
+        print(f"{str(bucket['from']) + ' - ' + str(bucket['to']):<24} | {bucket['count']:<12}")
+
+    print()
+    print(f"{'Janela (τ / w)':<15} | {'|W(t,τ)| médio':<16} | {'Footprint':<12}")
+    print("-" * 50)
+    for ws, fp in zip(result['working_set'], result['footprint']):
+        print(f"{ws['tau']:<15} | {ws['mean_size']:<16.2f} | {fp['pages']:<12.2f}")
+
+    if json_path:
+        print(f"Análise exportada para '{json_path}'")
+
+def convert_main(argv):
+    """
+    Subcomando 'convert': grava o trace no formato binário (lido depois via mmap)
+    """
+    parser = argparse.ArgumentParser(prog='pager.py convert', description='Converte um trace para o formato binário')
+    parser.add_argument('source', help='Trace de entrada (texto ou binário)')
+    parser.add_argument('output', help='Arquivo binário de saída')
+    parser.add_argument('--width', type=int, choices=[4, 8], help='Bytes por página (padrão: o menor que comporta a maior página)')
+    args = parser.parse_args(argv)
+
+    try:
+        count, width, max_page = write_binary_trace(args.source, args.output, args.width)
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{args.source}' não foi encontrado.")
+        sys.exit(1)
+    except TraceFormatError as exc:
+        print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
+        sys.exit(1)
+    except ValueError as exc:
+        print(f"Erro: {exc}.")
+        sys.exit(1)
+
+    print(f"Convertidas {count} referências para '{args.output}' ({width} bytes por página, maior página {max_page})")
+
+def format_ratio_ci(ratio, half_width):
+    """Taxa em porcentagem com a meia-largura do IC de 95% (quando há réplicas)."""
+    if half_width is None:
+        return f"{ratio * 100:.2f}%"
+    return f"{ratio * 100:.2f}% ± {half_width * 100:.2f}%"
+
+def run_sampled(algo_name, trace_path, frame_options, rate, replicas, seed, options):
+    """
+    Modo amostrado (SHARDS): uma passada em fluxo filtra o trace pelas páginas cujo
+    hash cai abaixo do limiar, e o algoritmo roda só na amostra com a capacidade
+    escalada. Mostra a taxa de faltas estimada com o IC de 95% entre as réplicas.
+    """
+    from sampling import effective_rate, estimate, sample_trace, scaled_capacity
+
+    start_time = time.perf_counter_ns()
+    samples, total_refs = sample_trace(iter_trace_records(trace_path), rate, replicas, seed)
+    results = estimate(algo_name, samples, frame_options, rate, total_refs, options)
+    duration_ns = time.perf_counter_ns() - start_time
+
+    sampled_refs = sum(len(pages) for pages, _writes in samples) / replicas
+    print(f"Simulação amostrada (SHARDS): {algo_name}, taxa {effective_rate(rate) * 100:.3f}%, {replicas} réplica(s)")
+    print(f"Referências: {total_refs} (amostra média: {sampled_refs:.0f} por réplica)")
+    print(f"{'Frames':<10} | {'Frames amostra':<15} | {'Taxa estimada (IC 95%)':<24} | {'Faltas estimadas':<16}")
+    print("-" * 75)
+    for num_frames, (ratio, half_width) in zip(frame_options, results):
+        print(f"{num_frames:<10} | {scaled_capacity(num_frames, rate):<15} | "
+              f"{format_ratio_ci(ratio, half_width):<24} | {ratio * total_refs:<16.0f}")
+    if replicas < 2:
+        print("Sem intervalo de confiança: use --sample-replicas 2 ou mais.")
+    print(f"Tempo de execução: {duration_ns / 1e6:.3f} ms")
+
+def sample_check_main(argv):
+    """
+    Subcomando 'sample-check': compara a curva de faltas estimada pela amostragem
+    com a exata no mesmo trace (erro absoluto médio/máximo e cobertura do IC)
+    """
+    from sampling import estimate, exact_miss_ratios, sample_trace
+
+    parser = argparse.ArgumentParser(prog='pager.py sample-check', description='Valida a simulação amostrada contra a exata')
+    parser.add_argument('trace', help='Trace (texto ou binário)')
+    parser.add_argument('--algo', required=True, help='Algoritmo de substituição (FIFO, LRU, ...)')
+    parser.add_argument('--frames-range', required=True, help='Frames INICIO:FIM[:PASSO] da curva')
+    parser.add_argument('--sample-rate', type=float, default=0.01, help='Fração das páginas amostradas (padrão: 0.01)')
+    parser.add_argument('--sample-replicas', type=int, default=5, help='Amostras independentes para o IC (padrão: 5)')
+    parser.add_argument('--sample-seed', type=int, default=0, help='Semente do hash de amostragem (padrão: 0)')
+    args = parser.parse_args(argv)
+
+    if not 0 < args.sample_rate <= 1 or args.sample_replicas < 1:
+        print("Erro: use 0 < --sample-rate <= 1 e --sample-replicas >= 1.")
+        sys.exit(1)
+    try:
+        spec = registry.get_spec(args.algo)
+    except KeyError:
+        print(f"Erro: O algoritmo '{args.algo.upper()}' ainda não foi implementado.")
+        sys.exit(1)
+    try:
+        frame_options = parse_frames_range(args.frames_range)
+    except ValueError:
+        print(f"Erro: faixa de frames inválida '{args.frames_range}' (use INICIO:FIM[:PASSO]).")
+        sys.exit(1)
+    try:
+        references, writes = load_trace_records(args.trace)
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{args.trace}' não foi encontrado.")
+        sys.exit(1)
+    except TraceFormatError as exc:
+        print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
+        sys.exit(1)
+
+    start_time = time.perf_counter_ns()
+    exact = exact_miss_ratios(spec.name, references, writes, frame_options)
+    exact_ns = time.perf_counter_ns() - start_time
+
+    start_time = time.perf_counter_ns()
+    samples, _total_refs = sample_trace(((references, writes),), args.sample_rate, args.sample_replicas, args.sample_seed)
+    estimated = estimate(spec.name, samples, frame_options, args.sample_rate, len(references))
+    sampled_ns = time.perf_counter_ns() - start_time
+
+    print(f"Validação da amostragem: {spec.name}, taxa {args.sample_rate * 100:g}%, {args.sample_replicas} réplica(s)")
+    print(f"{'Frames':<10} | {'Exata':<10} | {'Estimada (IC 95%)':<24} | {'Erro abs.':<10}")
+    print("-" * 64)
+    errors = []
+    covered = 0
+    for num_frames, exact_ratio, (ratio, half_width) in zip(frame_options, exact, estimated):
+        error = abs(ratio - exact_ratio)
+        errors.append(error)
+        if half_width is not None and error <= half_width:
+            covered += 1
+        print(f"{num_frames:<10} | {f'{exact_ratio * 100:.2f}%':<10} | "
+              f"{format_ratio_ci(ratio, half_width):<24} | {error * 100:.2f}%")
+    print("-" * 64)
+    print(f"Erro absoluto médio (MAE): {sum(errors) / len(errors) * 100:.3f}%, máximo {max(errors) * 100:.3f}%")
+    if args.sample_replicas > 1:
+        print(f"Exata dentro do IC 95%: {covered} de {len(frame_options)} pontos")
+    print(f"Tempo: exata {exact_ns / 1e6:.3f} ms, amostrada {sampled_ns / 1e6:.3f} ms")
+
+def specs_from_arg(text, allow_lookahead=False, refusal='olha o futuro e não vale aqui'):
+    """
+    Políticas do --algo: ALL ou nomes separados por vírgula. Sem allow_lookahead o
+    ALL deixa de fora as que precisam do trace inteiro (OTIMO) e pedir uma delas
+    pelo nome é erro, com `refusal` completando a mensagem.
+    """
+    if text.upper() == 'ALL':
+        return [spec for spec in registry.available() if allow_lookahead or not spec.needs_trace]
+    specs = []
+    for name in text.split(','):
+        try:
+            spec = registry.get_spec(name.strip())
+        except KeyError:
+            print(f"Erro: O algoritmo '{name.strip().upper()}' ainda não foi implementado.")
+            sys.exit(1)
+        if spec.needs_trace and not allow_lookahead:
+            print(f"Erro: {spec.name} {refusal}.")
+            sys.exit(1)
+        specs.append(spec)
+    return specs
+
+def format_size_mib(size):
+    return f"{size / (1 << 20):.2f} MiB"
+
+def addr_main(argv):
+    """
+    Subcomando 'addr': trace de endereços virtuais, varrendo tamanhos de página com
+    a memória física fixa em bytes
+    """
+    try:
+        from addresses import (DEFAULT_PAGE_SIZES, address_pages, distinct_page_counts, format_size,
+                               load_address_records, parse_page_sizes, parse_size)
+    except ImportError:
+        print("Erro: o subcomando addr requer o NumPy (pip install numpy).")
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(prog='pager.py addr', description='Simulação a partir de endereços virtuais')
+    parser.add_argument('trace', help='Trace de endereços (um por linha, decimal ou 0x..., opcionalmente com R/W; ou binário)')
+    parser.add_argument('--memory', required=True, help='Memória física em bytes (ex.: 64M); com páginas de P bytes cabem MEMÓRIA // P frames')
+    parser.add_argument('--page-sizes', default=DEFAULT_PAGE_SIZES, help=f'Tamanhos de página separados por vírgula (padrão: {DEFAULT_PAGE_SIZES})')
+    parser.add_argument('--algo', default='ALL', help='Algoritmos separados por vírgula ou ALL (padrão: ALL)')
+    parser.add_argument('--hex', action='store_true', help='Endereços sem prefixo são hexadecimais')
+    parser.add_argument('--va-bits', type=int, default=64, help='Bits do endereço virtual considerados (máscara; padrão: 64)')
+    parser.add_argument('--csv', help='Exporta os resultados em CSV (page_size,algo,frames,faults,miss_ratio,memory_time_bytes)')
+    args = parser.parse_args(argv)
+
+    try:
+        memory = parse_size(args.memory)
+        page_sizes = parse_page_sizes(args.page_sizes)
+    except ValueError as exc:
+        print(f"Erro: {exc}.")
+        sys.exit(1)
+    if not 1 <= args.va_bits <= 64:
+        print("Erro: --va-bits deve estar entre 1 e 64.")
+        sys.exit(1)
+    too_big = [format_size(size) for size in page_sizes if size > memory]
+    if too_big:
+        print(f"Erro: --memory {args.memory} não comporta nem uma página de {', '.join(too_big)}.")
+        sys.exit(1)
+
+    specs = specs_from_arg(args.algo, allow_lookahead=True)
+
+    try:
+        addresses, writes = load_address_records(args.trace, args.hex)
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{args.trace}' não foi encontrado.")
+        sys.exit(1)
+    except TraceFormatError as exc:
+        print(f"Erro: formato de endereço inválido ({exc}).")
+        sys.exit(1)
+
+    total_refs = len(addresses)
+    print(f"Trace de endereços: {total_refs} referências, memória física {format_size(memory)}")
+    rows = []
+    # O mesmo buffer de endereços serve a todos os tamanhos de página
+    distinct_counts = distinct_page_counts(addresses, page_sizes, args.va_bits)
+    for page_size, distinct in zip(page_sizes, distinct_counts):
+        references = address_pages(addresses, page_size, args.va_bits)
+        num_frames = memory // page_size
+        print()
+        print(f"Página {format_size(page_size)}: {num_frames} frames, {distinct} páginas distintas "
+              f"(footprint {format_size_mib(distinct * page_size)})")
+        print(f"{'Algoritmo':<10} | {'Faltas':<12} | {'Taxa':<8} | {'Residente médio':<16} | {'Memória x tempo':<18}")
+        print("-" * 78)
+        for spec in specs:
+            # PFF cresce no máximo até a memória física
+            simulator = spec.create(num_frames, references, max_frames=num_frames)
+            simulator.run_metered(references, writes=writes)
+            taxa = (simulator.page_faults / total_refs) * 100 if total_refs else 0.0
+            memory_time = simulator.resident_time * page_size
+            print(f"{spec.label:<10} | {simulator.page_faults:<12} | {f'{taxa:.2f}%':<8} | "
+                  f"{format_size_mib(simulator.average_resident() * page_size):<16} | "
+                  f"{memory_time / (1 << 20):,.0f} MiB x ref")
+            rows.append((page_size, spec.name, num_frames, simulator.page_faults,
+                         simulator.page_faults / total_refs if total_refs else 0.0, memory_time))
+
+    if args.csv:
+        with open(args.csv, 'w') as f:
+            f.write("page_size,algo,frames,faults,miss_ratio,memory_time_bytes\n")
+            for page_size, name, num_frames, faults, ratio, memory_time in rows:
+                f.write(f"{page_size},{name},{num_frames},{faults},{ratio:.6f},{memory_time}\n")
+        print(f"Resultados exportados para '{args.csv}'")
+
+def prefetch_main(argv):
+    """
+    Subcomando 'prefetch': cada política sem pré-busca e com cada modo de readahead,
+    lado a lado (faltas de demanda, acertos de pré-busca, desperdício, E/S extra)
+    """
+    from prefetch import PREFETCH_MODES, Prefetcher
+
+    parser = argparse.ArgumentParser(prog='pager.py prefetch', description='Pré-busca (readahead) sobre as políticas')
+    parser.add_argument('trace', help='Trace (texto ou binário)')
+    parser.add_argument('--frames', type=int, required=True, help='Frames da memória física')
+    parser.add_argument('--algo', default='ALL', help='Algoritmos separados por vírgula ou ALL (padrão: ALL, menos os que olham o futuro)')
+    parser.add_argument('--mode', default='all', help=f"Modos separados por vírgula ({', '.join(PREFETCH_MODES)}) ou all (padrão: all)")
+    parser.add_argument('--window', type=int, default=4, help='Páginas por disparo (janela inicial no ondemand; padrão: 4)')
+    parser.add_argument('--max-window', type=int, default=32, help='ondemand: tamanho máximo da janela (padrão: 32)')
+    args = parser.parse_args(argv)
+
+    modes = PREFETCH_MODES if args.mode.lower() == 'all' else [mode.strip().lower() for mode in args.mode.split(',')]
+    unknown = [mode for mode in modes if mode not in PREFETCH_MODES]
+    if unknown:
+        print(f"Erro: modo de pré-busca desconhecido '{unknown[0]}' (use {', '.join(PREFETCH_MODES)} ou all).")
+        sys.exit(1)
+    if args.frames < 1 or args.window < 1 or args.max_window < args.window:
+        print("Erro: use --frames >= 1 e 1 <= --window <= --max-window.")
+        sys.exit(1)
+
+    specs = specs_from_arg(args.algo, refusal='olha o futuro e não aceita pré-busca')
+
+    try:
+        references, writes = load_trace_records(args.trace)
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{args.trace}' não foi encontrado.")
+        sys.exit(1)
+    except TraceFormatError as exc:
+        print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
+        sys.exit(1)
+
+    total_refs = len(references)
+    print(f"Pré-busca: {total_refs} referências, {args.frames} frames, janela {args.window} (máx. {args.max_window})")
+    print(f"{'Algoritmo':<10} | {'Modo':<9} | {'Faltas demanda':<14} | {'Taxa':<8} | {'Pré-buscas':<10} | "
+          f"{'Acertos':<8} | {'Desperdício':<11} | {'E/S extra':<10}")
+    print("-" * 105)
+    for spec in specs:
+        # Memória fixa de --frames frames: o PFF não pode crescer além dela
+        simulator = spec.create(args.frames, max_frames=args.frames)
+        simulator.run(references, writes=writes)
+        plain_faults = simulator.page_faults
+        taxa = (plain_faults / total_refs) * 100 if total_refs else 0.0
+        print(f"{spec.label:<10} | {'-':<9} | {plain_faults:<14} | {f'{taxa:.2f}%':<8} | {0:<10} | "
+              f"{'-':<8} | {'-':<11} | {0:<10}")
+        for mode in modes:
+            prefetcher = Prefetcher(spec.create(args.frames, max_frames=args.frames), mode, args.window, args.max_window)
+            prefetcher.run(references, writes=writes)
+            prefetcher.finish()
+            taxa = (prefetcher.demand_faults / total_refs) * 100 if total_refs else 0.0
+            # Leituras do disco (demanda + pré-busca) além das da política pura
+            extra_io = prefetcher.demand_faults + prefetcher.prefetches - plain_faults
+            print(f"{'':<10} | {mode:<9} | {prefetcher.demand_faults:<14} | {f'{taxa:.2f}%':<8} | "
+                  f"{prefetcher.prefetches:<10} | {prefetcher.prefetch_hits:<8} | {prefetcher.wasted:<11} | {extra_io:<+10}")
+
+def load_processes(trace_paths, pid_column):
+    """Monta a lista de multiprog.Process a partir dos traces da linha de comando."""
+    from multiprog import Process
+
+    if pid_column:
+        processes = []
+        for path in trace_paths:
+            for pid, (pages, writes) in load_pid_trace(path).items():
+                processes.append(Process(f"pid {pid}", pages, writes))
+        return processes
+
+    return [Process(os.path.basename(path), *load_trace_records(path)) for path in trace_paths]
+
+def print_multiprog_result(allocation, algo_name, total_frames, quantum, processes, result):
+    print(f"Alocação: {allocation} ({algo_name}, {total_frames} frames, quantum {quantum})")
+    frames_header = 'Residentes' if allocation == 'global' else 'Frames'
+    print(f"{'Processo':<20} | {'Referências':<12} | {frames_header:<10} | {'Faltas':<10} | {'Taxa de faltas':<14}")
+    print("-" * 78)
+    for proc, refs, frames, faults in zip(processes, result['references'], result['frames'], result['faults']):
+        taxa = (faults / refs) * 100 if refs else 0.0
+        print(f"{proc.name:<20} | {refs:<12} | {frames:<10} | {faults:<10} | {taxa:.2f}%")
+    total_refs = sum(result['references'])
+    total_faults = sum(result['faults'])
+    taxa = (total_faults / total_refs) * 100 if total_refs else 0.0
+    print("-" * 78)
+    print(f"{'Total':<20} | {total_refs:<12} | {sum(result['frames']):<10} | {total_faults:<10} | {taxa:.2f}%")
+    print(f"Gravações de páginas sujas (writebacks): {result['writebacks']}")
+
+def multi_main(argv):
+    """
+    Subcomando 'multi': vários processos intercalados por round-robin disputando a
+    memória, com substituição global ou local (cota fixa ou proporcional)
+    """
+    from multiprog import ALLOCATIONS, simulate
+
+    parser = argparse.ArgumentParser(prog='pager.py multi', description='Simulação de multiprogramação')
+    parser.add_argument('traces', nargs='+', help='Um trace por processo (ou traces com coluna pid, ver --pid-column)')
+    parser.add_argument('--algo', required=True, help='Algoritmo de substituição (FIFO, LRU, ...)')
+    parser.add_argument('--frames', type=int, help='Frames da memória física (total)')
+    parser.add_argument('--frames-range', help='Varre o total de frames INICIO:FIM[:PASSO] e mostra a taxa de faltas total')
+    parser.add_argument('--alloc', choices=ALLOCATIONS + ('all',), default='all',
+                        help='Substituição global ou local com cota fixa/proporcional (padrão: all, as três)')
+    parser.add_argument('--quantum', type=int, default=1, help='Referências por fatia de tempo do round-robin (padrão: 1)')
+    parser.add_argument('--pid-column', action='store_true', help='Cada linha do trace é "<pid> <página> [R/W]"')
+    args = parser.parse_args(argv)
+
+    if args.quantum < 1:
+        print("Erro: --quantum deve ser pelo menos 1.")
+        sys.exit(1)
+    if args.frames is None and not args.frames_range:
+        print("Erro: informe --frames ou --frames-range.")
+        sys.exit(1)
+    try:
+        spec = registry.get_spec(args.algo)
+    except KeyError:
+        print(f"Erro: O algoritmo '{args.algo.upper()}' ainda não foi implementado.")
+        sys.exit(1)
+    frame_options = [args.frames]
+    if args.frames_range:
+        try:
+            frame_options = parse_frames_range(args.frames_range)
+        except ValueError:
+            print(f"Erro: faixa de frames inválida '{args.frames_range}' (use INICIO:FIM[:PASSO]).")
+            sys.exit(1)
+
+    try:
+        processes = load_processes(args.traces, args.pid_column)
+    except FileNotFoundError as exc:
+        print(f"Erro: O arquivo '{exc.filename}' não foi encontrado.")
+        sys.exit(1)
+    except TraceFormatError as exc:
+        print(f"Erro: formato de trace inválido ({exc}).")
+        sys.exit(1)
+
+    allocations = ALLOCATIONS if args.alloc == 'all' else (args.alloc,)
+    try:
+        if not args.frames_range:
+            for allocation in allocations:
+                result = simulate(processes, spec.name, args.frames, allocation, args.quantum)
+                print_multiprog_result(allocation, spec.name, args.frames, args.quantum, processes, result)
+                print()
+            return
+
+        # Varredura: taxa de faltas total por quantidade de frames (procura o ponto de thrashing)
+        total_refs = sum(len(proc.pages) for proc in processes)
+        print(f"Taxa de faltas total: {spec.name}, {len(processes)} processos, quantum {args.quantum}")
+        header = " | ".join(f"{allocation:<14}" for allocation in allocations)
+        print(f"{'Frames':<10} | {header} |")
+        print("-" * (13 + 17 * len(allocations)))
+        for total_frames in frame_options:
+            rates = []
+            for allocation in allocations:
+                result = simulate(processes, spec.name, total_frames, allocation, args.quantum)
+                rates.append(sum(result['faults']) / total_refs * 100 if total_refs else 0.0)
+            row = " | ".join(f"{f'{rate:.2f}%':<14}" for rate in rates)
+            print(f"{total_frames:<10} | {row} |")
+    except ValueError as exc:
+        print(f"Erro: {exc}.")
+        sys.exit(1)
+
+def run_incremental(simulator, trace_path, checkpoint_path, header, every=None, resume=False):
+    """
+    Laço de simulação com checkpoint: continua do checkpoint (resume), grava um
+    novo a cada `every` referências (no fim do bloco que passa do limite) e sempre
+    ao terminar, para a próxima execução pegar só o que for acrescentado ao trace.
+    Devolve (referências, duração em ns) acumuladas desde o início do trace.
+    """
+    from checkpoint import load_checkpoint, save_checkpoint
+
+    position = 0
+    marked = False
+    total_refs = 0
+    duration_ns = 0
+    if resume:
+        payload = load_checkpoint(checkpoint_path, header)
+        simulator.restore(payload['state'])
+        position = payload['position']
+        marked = payload['marked']
+        total_refs = payload['total_refs']
+        duration_ns = payload['duration_ns']
+        print(f"Retomando de '{checkpoint_path}': {total_refs} referências já simuladas")
+
+    chunk_size = min(CHUNK_SIZE, every) if every else CHUNK_SIZE
+    since_checkpoint = 0
+    for pages, chunk_writes, position in iter_trace_segments(trace_path, position, marked, chunk_size):
+        start_time = time.perf_counter_ns()
+        simulator.run_metered(pages, writes=chunk_writes)
+        duration_ns += time.perf_counter_ns() - start_time
+        total_refs += len(pages)
+        marked = marked or chunk_writes is not None
+
+        since_checkpoint += len(pages)
+        if every and since_checkpoint >= every:
+            save_checkpoint(checkpoint_path, simulator, header, position, marked, total_refs, duration_ns)
+            since_checkpoint = 0
+
+    save_checkpoint(checkpoint_path, simulator, header, position, marked, total_refs, duration_ns)
+    print(f"Checkpoint gravado em '{checkpoint_path}' ({total_refs} referências)")
+    return total_refs, duration_ns
+
+def options_of(args):
+    """Opções das políticas vindas da linha de comando (ver AlgorithmSpec.params)."""
+    return {
+        'tie_break': args.tie_break,
+        'reset_interval': args.nru_reset,
+        'write_predicate': args.nru_writes,
+        'tau': args.tau,
+        'pff_window': args.pff_window,
+        'pff_low': args.pff_low,
+        'pff_high': args.pff_high,
+    }
+
+def listen_main(args, options):
+    """
+    --listen: vários simuladores (--algo A,B,... ou ALL) no mesmo fluxo ao vivo,
+    com as taxas de faltas publicadas a cada --report-every referências
+    """
+    import asyncio
+    from live import LiveSession, parse_endpoint, serve
+
+    if args.algo is None or args.frames is None:
+        print("Erro: --listen precisa de --algo e --frames.")
+        sys.exit(1)
+    if args.report_every < 1 or args.max_pending < 1:
+        print("Erro: --report-every e --max-pending devem ser pelo menos 1.")
+        sys.exit(1)
+    try:
+        endpoint = parse_endpoint(args.listen)
+    except ValueError as exc:
+        print(f"Erro: {exc}.")
+        sys.exit(1)
+
+    specs = specs_from_arg(args.algo, refusal='precisa do trace inteiro e não roda ao vivo')
+
+    json_out = None
+    if args.json:
+        json_out = sys.stdout if args.json == '-' else open(args.json, 'w')
+    simulators = [(spec.label, spec.create(args.frames, **options, max_frames=args.frames)) for spec in specs]
+    session = LiveSession(simulators, args.report_every, args.max_pending, json_out=json_out)
+    ready = lambda: print(f"Escutando em {args.listen} ({args.frames} frames)", file=sys.stderr, flush=True)
+    try:
+        asyncio.run(serve(session, endpoint, args.keep_listening, ready))
+    except KeyboardInterrupt:
+        pass
+    except TraceFormatError as exc:
+        print(f"Erro: formato de referência inválido ({exc}).")
+        sys.exit(1)
+    except OSError as exc:
+        print(f"Erro: não foi possível escutar em {args.listen} ({exc.strerror or exc}).")
+        sys.exit(1)
+    finally:
+        if json_out is not None and json_out is not sys.stdout:
+            json_out.close()
+    session.print_summary()
+
+def feed_main(argv):
+    """
+    Subcomando 'feed': produtor de teste para o --listen (trace ou carga sintética)
+    """
+    import asyncio
+    from live import feed, parse_endpoint
+    from workloads import WORKLOADS, generate
+
+    parser = argparse.ArgumentParser(prog='pager.py feed', description='Manda referências para um pager.py --listen')
+    parser.add_argument('target', help="Destino: '-' (stdout), unix:CAMINHO ou tcp:PORTA")
+    parser.add_argument('--trace', help='Trace a enviar (texto ou binário)')
+    parser.add_argument('--workload', choices=list(WORKLOADS), help='Carga sintética a enviar (em vez de --trace)')
+    parser.add_argument('--refs', type=int, default=100000, help='Referências da carga sintética (padrão: 100000)')
+    parser.add_argument('--pages', type=int, default=1024, help='Páginas distintas da carga sintética (padrão: 1024)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente da carga sintética (padrão: 42)')
+    parser.add_argument('--rate', type=float, help='Limita o envio a N referências por segundo')
+    args = parser.parse_args(argv)
+
+    if (args.trace is None) == (args.workload is None):
+        print("Erro: informe --trace ou --workload.")
+        sys.exit(1)
+    try:
+        endpoint = parse_endpoint(args.target)
+        if args.trace:
+            references, writes = load_trace_records(args.trace)
+        else:
+            references, writes = generate(args.workload, args.refs, args.pages, args.seed), None
+        asyncio.run(feed(endpoint, references, writes, args.rate))
+    except FileNotFoundError as exc:
+        print(f"Erro: O arquivo '{exc.filename}' não foi encontrado.")
+        sys.exit(1)
+    except TraceFormatError as exc:
+        print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
+        sys.exit(1)
+    except BrokenPipeError:
+        # O --listen do outro lado fechou antes do fim
+        sys.exit(1)
+    except (ValueError, OSError) as exc:
+        print(f"Erro: {exc}.")
+        sys.exit(1)
+
 def main():
+    # SUBCOMANDOS (antes do argparse principal, para não mudar a linha de comando original)
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        convert_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'multi':
+        multi_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'sample-check':
+        sample_check_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'feed':
+        feed_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'addr':
+        addr_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'prefetch':
+        prefetch_main(sys.argv[2:])
+        return
+
     #CONFIGURAÇÃO DO ARGPARSE
     parser = argparse.ArgumentParser(description='Simulador de Algoritmos de Substituição de Páginas')
     
     # --algo, --frames e --trace
     # flag -> atributo
-    parser.add_argument('--algo', required=True, help='O algoritmo a ser usado (FIFO, LRU, OTIMO, etc.)')
-    parser.add_argument('--frames', type=int, required=True, help='A quantidade de molduras de memória (ex: 3 ou 4)')
-    parser.add_argument('--trace', required=True, help='Caminho do arquivo com a sequência de páginas')
+    parser.add_argument('--algo', help='O algoritmo a ser usado (FIFO, LRU, OTIMO, etc.)')
+    parser.add_argument('--frames', type=int, help='A quantidade de molduras de memória (ex: 3 ou 4)')
+    parser.add_argument('--trace', help='Caminho do arquivo com a sequência de páginas (texto ou binário, detectado automaticamente)')
     parser.add_argument('--visual', action='store_true', help='Exibe execução passo a passo em vez do resumo')
+    parser.add_argument('--visual-rate', type=int, default=500, help='--visual: no máximo N linhas por segundo, o resto é resumido (padrão: 500; 0 = sem limite)')
+    parser.add_argument('--events', metavar='ARQUIVO', help='Grava os eventos HIT/FAULT/EVICT em formato colunar (.pgev) ou CSV (.csv)')
+    parser.add_argument('--frames-range', help='Faixa de frames INICIO:FIM[:PASSO] para --curve e para a tabela ALL')
+    parser.add_argument('--curve', action='store_true', help='Curva de faltas de LRU/OTIMO para toda a faixa de frames numa única passada')
+    parser.add_argument('--curve-out', help='Exporta a curva de faltas em CSV (frames,faults,miss_ratio)')
+    parser.add_argument('--jobs', type=int, default=1, help='Processos usados pela tabela ALL (padrão: 1, sequencial)')
+    parser.add_argument('--tie-break', choices=['frame', 'fifo'], default='frame',
+                        help="Desempate do LFU/MFU: 'frame' (menor frame, padrão) ou 'fifo' (há mais tempo no contador, O(1))")
+    parser.add_argument('--nru-reset', type=int, default=10, help='NRU: zera os bits R a cada N referências (padrão: 10)')
+    parser.add_argument('--nru-writes', choices=WRITE_PREDICATE_NAMES, default='even',
+                        help="NRU: quais páginas são escritas (M=1): even (padrão), odd, all ou none")
+    parser.add_argument('--tau', type=int, default=100, help='WS: janela do conjunto de trabalho em referências (padrão: 100)')
+    parser.add_argument('--pff-window', type=int, default=100, help='PFF: referências por janela de medição (padrão: 100)')
+    parser.add_argument('--pff-low', type=float, default=0.02, help='PFF: taxa de faltas abaixo da qual perde frames (padrão: 0.02)')
+    parser.add_argument('--pff-high', type=float, default=0.10, help='PFF: taxa de faltas acima da qual ganha frames (padrão: 0.10)')
+    parser.add_argument('--read-latency', type=float, default=10.0, help='Custo de ler uma página do disco em ms (padrão: 10)')
+    parser.add_argument('--write-latency', type=float, default=10.0, help='Custo de gravar uma página suja em ms (padrão: 10)')
+    parser.add_argument('--sample-rate', type=float,
+                        help='Simulação amostrada (SHARDS): fração das páginas mantidas, ex.: 0.01')
+    parser.add_argument('--sample-replicas', type=int, default=5, help='Amostras independentes para o IC de 95%% (padrão: 5)')
+    parser.add_argument('--sample-seed', type=int, default=0, help='Semente do hash de amostragem (padrão: 0)')
+    parser.add_argument('--checkpoint-every', type=int, metavar='N',
+                        help='Grava um checkpoint do simulador a cada N referências (e no fim)')
+    parser.add_argument('--resume', action='store_true', help='Continua do checkpoint, a partir da posição salva no trace')
+    parser.add_argument('--checkpoint', help='Arquivo de checkpoint (padrão: <trace>.ckpt)')
+    parser.add_argument('--listen', metavar='ORIGEM',
+                        help="Simula ao vivo lendo de '-' (stdin), unix:CAMINHO ou tcp:PORTA (localhost); --algo aceita vários separados por vírgula")
+    parser.add_argument('--report-every', type=int, default=10000, metavar='K', help='--listen: publica as taxas de faltas a cada K referências (padrão: 10000)')
+    parser.add_argument('--max-pending', type=int, default=8, help='--listen: blocos em fila por simulador antes de segurar o produtor (padrão: 8)')
+    parser.add_argument('--keep-listening', action='store_true', help='--listen: continua aceitando produtores depois que o primeiro desconecta')
+    parser.add_argument('--analyze', action='store_true', help='Analisa o trace (reúso, conjunto de trabalho, footprint) em vez de simular')
+    parser.add_argument('--reuse-distance', action='store_true',
+                        help='--analyze: calcula também a distância de reúso exata (pilha do LRU). É a parte cara: '
+                             'O(N log N), cerca de 10x o resto da análise (7 s de 8 s com 5M referências)')
+    parser.add_argument('--windows', help='Janelas τ/w da análise separadas por vírgula (padrão: potências de 2)')
+    parser.add_argument('--json', help="Grava o resultado da análise (ou as métricas do --listen, em JSON lines) em JSON ('-' para a saída padrão)")
     args = parser.parse_args()
 
+    if args.nru_reset < 1:
+        print("Erro: --nru-reset deve ser pelo menos 1.")
+        sys.exit(1)
+    if args.tau < 1 or args.pff_window < 1:
+        print("Erro: --tau e --pff-window devem ser pelo menos 1.")
+        sys.exit(1)
+    if not 0 <= args.pff_low <= args.pff_high:
+        print("Erro: use 0 <= --pff-low <= --pff-high.")
+        sys.exit(1)
+    if args.visual_rate < 0:
+        print("Erro: --visual-rate não pode ser negativo.")
+        sys.exit(1)
+    if args.checkpoint_every is not None and args.checkpoint_every < 1:
+        print("Erro: --checkpoint-every deve ser pelo menos 1.")
+        sys.exit(1)
+    if args.sample_rate is not None and (not 0 < args.sample_rate <= 1 or args.sample_replicas < 1):
+        print("Erro: use 0 < --sample-rate <= 1 e --sample-replicas >= 1.")
+        sys.exit(1)
+
+    # INGESTÃO AO VIVO (sem arquivo de trace)
+    if args.listen:
+        listen_main(args, options_of(args))
+        sys.exit(0)
+    if args.trace is None:
+        print("Erro: informe --trace (ou use --listen).")
+        sys.exit(1)
+
+    # ANÁLISE DO TRACE (não simula nenhum algoritmo)
+    if args.analyze:
+        run_analysis(args.trace, args.windows, args.json, args.reuse_distance)
+        sys.exit(0)
+
+    if args.algo is None:
+        print("Erro: informe --algo (ou use --analyze).")
+        sys.exit(1)
+
+    frame_options = None
+    if args.frames_range:
+        try:
+            frame_options = parse_frames_range(args.frames_range)
+        except ValueError:
+            print(f"Erro: faixa de frames inválida '{args.frames_range}' (use INICIO:FIM[:PASSO]).")
+            sys.exit(1)
+
+    algo_name = args.algo.upper()
+    spec = None
+    if algo_name != 'ALL':
+        try:
+            spec = registry.get_spec(algo_name)
+        except KeyError:
+            print(f"Erro: O algoritmo '{algo_name}' ainda não foi implementado.")
+            sys.exit(1)
+        algo_name = spec.name
+    options = options_of(args)
+
+    # SIMULAÇÃO AMOSTRADA (lê o trace em fluxo, só a amostra fica em memória)
+    if args.sample_rate is not None and spec is not None:
+        if args.frames is None and frame_options is None:
+            print("Erro: informe --frames ou --frames-range.")
+            sys.exit(1)
+        try:
+            run_sampled(algo_name, args.trace, frame_options or [args.frames], args.sample_rate,
+                        args.sample_replicas, args.sample_seed, options)
+        except FileNotFoundError:
+            print(f"Erro: O arquivo '{args.trace}' não foi encontrado.")
+            sys.exit(1)
+        except TraceFormatError as exc:
+            print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
+            sys.exit(1)
+        sys.exit(0)
+
     # LEITURA DO ARQUIVO
+    # O trace só é carregado inteiro (array compacto) quando o modo precisa do futuro
+    # (OTIMO, curva) ou de várias passadas (ALL). Os demais consomem blocos em fluxo.
     try:
-        with open(args.trace, 'r') as f:
-            references = [int(line.strip()) for line in f if line.strip()]
+        if spec is None or spec.needs_trace or args.curve:
+            references, writes = load_trace_records(args.trace)
+            records = ((references, writes),)
+        else:
+            references = writes = None
+            records = iter_trace_records(args.trace)
     except FileNotFoundError:
         print(f"Erro: O arquivo '{args.trace}' não foi encontrado.")
         sys.exit(1)
-    except ValueError:
-        print("Erro: O arquivo de trace deve conter apenas números inteiros.")
+    except TraceFormatError as exc:
+        print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
         sys.exit(1)
 
     # TABELA
-    if args.algo.upper() == 'ALL':
-        run_comparison_table(references)
+    if algo_name == 'ALL':
+        run_comparison_table(references, frame_options or (3, 4), args.jobs, args.trace, writes, options)
         sys.exit(0) # Encerra o programa após imprimir a tabela
 
-    # SELEÇÃO DO ALGORITMO
-    algo_name = args.algo.upper()
-    simulator = None
-    
-    if algo_name == 'FIFO':
-        simulator = FIFO(args.frames)
-    elif algo_name == 'LRU':
-        simulator = LRU(args.frames)
-    elif algo_name == 'OTIMO':       
-        simulator = OTIMO(args.frames, references)
-    elif algo_name == 'SEGUNDACHANCE':       
-        simulator = SECONDCHANCE(args.frames)
-    elif algo_name == 'CLOCK':       
-        simulator = CLOCK(args.frames)
-    elif algo_name == 'NRU':       
-        simulator = NRU(args.frames)
-    elif algo_name == 'LFU':
-        simulator = LFU(args.frames) 
-    elif algo_name == 'MFU':
-        simulator = MFU(args.frames)
-    else:
-        print(f"Erro: O algoritmo '{algo_name}' ainda não foi implementado.")
+    # CURVA DE FALTAS (uma passada para todas as quantidades de frames)
+    if args.curve:
+        if not spec.stack:
+            stack_names = ', '.join(s.name for s in registry.available() if s.stack)
+            print(f"Erro: --curve só vale para algoritmos de pilha ({stack_names}).")
+            sys.exit(1)
+        if frame_options is None:
+            # Sem faixa: de 1 frame até o número de páginas distintas (a partir daí só há faltas compulsórias)
+            frame_options = list(range(1, max(len(set(references)), 1) + 1))
+        run_curve(algo_name, references, frame_options, args.curve_out)
+        sys.exit(0)
+
+    if args.frames is None:
+        print("Erro: informe --frames (ou use --curve / --algo ALL).")
         sys.exit(1)
 
-    #PASSO A PASSO
-    if args.visual:
-        run_visual_simulation(simulator, references)
-        sys.exit(0)
+    # SELEÇÃO DO ALGORITMO (pelo registro)
+    simulator = spec.create(args.frames, references, **options)
 
-    # LOOP DE SIMULAÇÃO PADRAO
-    print(f"Executando {algo_name} com {args.frames} frames...")
-    
-    start_time = time.perf_counter_ns()
+    # CHECKPOINT / RETOMADA (laço em fluxo com a posição no trace)
+    incremental = args.checkpoint_every is not None or args.resume
+    if incremental and spec.needs_trace:
+        print(f"Erro: --checkpoint-every/--resume não valem para {algo_name} (precisa do trace inteiro).")
+        sys.exit(1)
+    if incremental and args.visual:
+        print("Erro: --checkpoint-every/--resume não valem com --visual.")
+        sys.exit(1)
+    if args.events and args.visual:
+        print("Erro: --events não vale com --visual (o passo a passo já mostra os eventos).")
+        sys.exit(1)
 
-    for page in references:
-        simulator.access(page)
-    
-    end_time = time.perf_counter_ns()
-    duration_ms = (end_time - start_time)
+    try:
+        #PASSO A PASSO
+        if args.visual:
+            run_visual_simulation(simulator, records, args.visual_rate)
+            sys.exit(0)
+
+        # LOOP DE SIMULAÇÃO PADRAO
+        print(f"Executando {algo_name} com {args.frames} frames...")
+        
+        # Só o laço de acesso entra no tempo (a leitura dos blocos fica de fora)
+        duration_ns = 0
+        total_refs = 0
+
+        # LOG DE EVENTOS (opcional): cada bloco cheio do log vai direto para o arquivo
+        event_writer = None
+        if args.events:
+            from events import EventLog, EventWriter
+            event_writer = EventWriter(args.events)
+            event_log = EventLog(flush=event_writer.write)
+            simulator.attach_events(event_log)
+
+        if incremental:
+            # Só as opções que a política usa identificam a simulação
+            used_options = {}
+            for param in spec.params:
+                option = param[1] if isinstance(param, tuple) else param
+                used_options[option] = options.get(option)
+            header = {'algo': algo_name, 'frames': args.frames, 'options': used_options,
+                      'trace': os.path.abspath(args.trace)}
+            total_refs, duration_ns = run_incremental(simulator, args.trace, args.checkpoint or f"{args.trace}.ckpt",
+                                                      header, args.checkpoint_every, args.resume)
+        else:
+            for pages, chunk_writes in records:
+                start_time = time.perf_counter_ns()
+                simulator.run_metered(pages, writes=chunk_writes)
+                end_time = time.perf_counter_ns()
+                duration_ns += (end_time - start_time)
+                total_refs += len(pages)
+        if event_writer is not None:
+            event_writer.close(event_log)
+            print(f"{len(event_log)} eventos gravados em '{args.events}'")
+    except TraceFormatError as exc:
+        print(f"Erro: O arquivo de trace deve conter apenas números inteiros ({exc}).")
+        sys.exit(1)
+    except FileNotFoundError as exc:
+        print(f"Erro: O arquivo '{exc.filename}' não foi encontrado.")
+        sys.exit(1)
+    except ValueError as exc:
+        # Checkpoint de outra simulação ou posição salva além do fim do trace
+        print(f"Erro: {exc}.")
+        sys.exit(1)
 
     # EXIBIÇÃO DOS RESULTADOS
-    total_refs = len(references)
-    taxa = (simulator.page_faults / total_refs) * 100
+    taxa = (simulator.page_faults / total_refs) * 100 if total_refs else 0.0
 
     print("-" * 30)
     print(f"Algoritmo: {algo_name}")
     print(f"Frames: {args.frames}")
+    if simulator.capacity != args.frames:
+        print(f"Frames no fim: {simulator.capacity}")
     print(f"Referências: {total_refs}")
     print(f"Faltas de página: {simulator.page_faults}")
     print(f"Taxa de faltas: {taxa:.2f}%")
     print(f"Evicções: {simulator.evictions}")
+    print(f"Gravações de páginas sujas (writebacks): {simulator.writebacks}")
+    print(f"Conjunto residente: médio {simulator.average_resident():.2f}, pico {simulator.peak_resident} páginas")
+    print(f"Produto memória x tempo: {simulator.resident_time} páginas x referências")
+    io_ms = simulator.io_time(args.read_latency, args.write_latency)
+    print(f"Tempo estimado de E/S: {io_ms:.2f} ms (leitura {args.read_latency} ms, escrita {args.write_latency} ms)")
     print("Conjunto residente final:")
     
     # Imprime os IDs dos frames
@@ -162,7 +1064,8 @@ def main():
     print("page_ids:  ", end="")
     valid_pages = [str(page) for page in simulator.memory if page != -1]
     print(" ".join(valid_pages))
-    print(f"Tempo de execução: {duration_ms:.4f} ns")
+    refs_per_sec = total_refs / (duration_ns / 1e9) if duration_ns else 0.0
+    print(f"Tempo de execução: {duration_ns / 1e6:.3f} ms ({refs_per_sec:,.0f} referências/s)")
     print("-" * 30)
 
 
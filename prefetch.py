@@ -0,0 +1,176 @@
+from algorithms import PageReplacementAlgorithm
+
+'''
+-------------------------------------------------------------------------------------
+ PRÉ-BUSCA (READAHEAD) SOBRE QUALQUER POLÍTICA
+
+ - Prefetcher embrulha um simulador qualquer: cada referência passa pela política
+   normalmente e, conforme o modo, páginas vizinhas são lidas antes de serem pedidas.
+   A página pré-buscada entra pelo admit() da política, que não conta referência:
+   nada de falta, tempo virtual (WS), contador do NRU ou janela do PFF; ela entra
+   sem bit R e com contador 0 (LFU/MFU). Se a memória está cheia, a vítima é a da
+   própria política, nunca a página que acabou de ser pedida. Onde "não usada" é o
+   pior estado (LFU com contador 0, NRU na classe 0, CLOCK/SC com R = 0) a
+   pré-buscada é a primeira vítima, inclusive da pré-busca seguinte.
+ - fixed: em cada falta de demanda na página p lê p+1 .. p+janela.
+ - ondemand (estilo Linux): uma falta fora de um fluxo sequencial não dispara nada;
+   uma falta logo depois da página anterior abre uma janela de `window` páginas. A
+   página do meio da janela fica marcada (PG_readahead): quando o programa chega
+   nela, a próxima janela, com o dobro do tamanho (até max_window e até um quarto
+   da memória), é lida antes de a atual acabar. O teto de um quarto deixa caber a
+   janela atual, a próxima e as páginas já usadas que o LRU ainda considera mais
+   recentes que o fim da janela atual.
+   Uma falta numa página pré-buscada que foi expulsa sem uso (thrashing) corta a
+   janela pela metade.
+ - stride: referência a referência (ignorando repetições da mesma página) guarda o
+   passo entre páginas; depois de ver o mesmo passo d duas vezes seguidas lê
+   p+d .. p+janela*d.
+ - Contagem: faltas de demanda são as referências que não acharam a página; acerto
+   de pré-busca é a primeira referência a uma página pré-buscada que ainda está na
+   memória; desperdício é a página pré-buscada expulsa sem ter sido usada. E/S extra
+   = leituras totais (demanda + pré-busca) menos as faltas da política sem pré-busca.
+ - No máximo capacity - 1 páginas por disparo: mais que isso só expulsaria as
+   páginas lidas no mesmo disparo. Políticas que olham o futuro (OTIMO) ficam de
+   fora: a pré-busca mudaria a sequência que elas conhecem.
+-------------------------------------------------------------------------------------
+'''
+
+PREFETCH_MODES = ('fixed', 'ondemand', 'stride')
+
+class Prefetcher:
+    """
+    Pré-busca `mode` sobre `simulator`. window: páginas por disparo (janela inicial
+    no ondemand); max_window: teto da janela do ondemand.
+    """
+    # O laço genérico só chama access(): serve igual para o embrulho
+    run = PageReplacementAlgorithm.run
+
+    def __init__(self, simulator, mode='ondemand', window=4, max_window=32):
+        if mode not in PREFETCH_MODES:
+            raise ValueError(f"modo de pré-busca desconhecido '{mode}'")
+        if window < 1 or max_window < window:
+            raise ValueError("a pré-busca precisa de 1 <= janela <= janela máxima")
+        if simulator.spec.needs_trace:
+            raise ValueError(f"{simulator.spec.name} olha o futuro e não aceita pré-busca")
+        self.simulator = simulator
+        self.mode = mode
+        self.window = window
+        self.max_window = max_window
+        self.demand_faults = 0
+        self.prefetches = 0       # Páginas lidas por pré-busca (E/S a mais)
+        self.prefetch_hits = 0
+        self.wasted = 0
+        self.pending = set()      # Pré-buscadas ainda não referenciadas
+        self.last_page = None
+        # ondemand: janela atual [ra_start, ra_start + ra_size) e página marcada
+        self.ra_start = 0
+        self.ra_size = 0
+        self.marker = None
+        # stride: último passo e quantas vezes seguidas apareceu
+        self.stride = 0
+        self.stride_seen = 0
+
+    def access(self, page_id, is_write=None):
+        simulator = self.simulator
+        prefetched = thrashed = False
+        if page_id in self.pending:
+            self.pending.discard(page_id)
+            if page_id in simulator.page_table:
+                self.prefetch_hits += 1
+                prefetched = True
+            else:
+                self.wasted += 1
+                thrashed = True
+
+        hit = simulator.access(page_id, is_write)
+        if not hit:
+            self.demand_faults += 1
+
+        if self.mode == 'fixed':
+            if not hit:
+                self._read_ahead(page_id + 1, self.window, page_id)
+        elif self.mode == 'ondemand':
+            self._ondemand(page_id, hit, prefetched, thrashed)
+        elif page_id != self.last_page:
+            self._detect_stride(page_id)
+        self.last_page = page_id
+
+        # Pré-buscadas esquecidas (expulsas sem uso e nunca mais pedidas) não podem
+        # acumular: a varredura custa O(pendentes), amortizada pelo dobro da memória
+        if len(self.pending) > 2 * simulator.capacity:
+            self._collect_wasted()
+        return hit
+
+    def _read_ahead(self, start, count, keep, step=1):
+        # Lê `count` páginas a partir de start (passo step) que ainda não estão na
+        # memória, sem expulsar keep (a página que disparou a leitura). Devolve
+        # quantas posições foram cobertas (count limitado pela memória)
+        simulator = self.simulator
+        page_table = simulator.page_table
+        count = max(0, min(count, simulator.capacity - 1))
+        page_id = start
+        for _ in range(count):
+            if page_id >= 0 and page_id not in page_table:
+                if page_id in self.pending:
+                    self.wasted += 1  # Já tinha sido pré-buscada e saiu sem uso
+                if simulator.admit(page_id, keep):
+                    self.prefetches += 1
+                    self.pending.add(page_id)
+            page_id += step
+        return count
+
+    def _ondemand(self, page_id, hit, prefetched, thrashed):
+        if not hit:
+            if self.last_page is not None and page_id == self.last_page + 1:
+                # Falta sequencial: janela nova (ou a próxima, se o fluxo continua)
+                if thrashed:
+                    # A página lida antes foi expulsa sem uso: a janela não cabe na memória
+                    size = max(1, self.ra_size // 2)
+                elif self.ra_size and self.ra_start <= page_id < self.ra_start + self.ra_size + 1:
+                    size = min(self.ra_size * 2, self.max_window)
+                else:
+                    size = self.window
+                self._open_window(page_id, size)
+            return
+        if prefetched and page_id == self.marker:
+            # Chegou na página marcada: lê a próxima janela antes de a atual acabar
+            self._open_window(self.ra_start + self.ra_size, min(self.ra_size * 2, self.max_window), page_id)
+
+    def _open_window(self, start, size, keep=None):
+        # Janela [start, start + size); sem keep a primeira página é a da falta, com
+        # keep a janela é lida à frente da página marcada (keep). A janela fica em
+        # até um quarto da memória (ver o cabeçalho) e ra_size e marker saem do que
+        # foi de fato lido
+        size = min(size, max(2, self.simulator.capacity // 4))
+        if keep is not None:
+            size = self._read_ahead(start, size, keep)
+        else:
+            size = 1 + self._read_ahead(start + 1, size - 1, start)
+        self.ra_start = start
+        self.ra_size = size
+        self.marker = start + size - max(1, size // 2) if size else None
+
+    def _detect_stride(self, page_id):
+        if self.last_page is None:
+            return
+        delta = page_id - self.last_page
+        if delta == self.stride:
+            self.stride_seen += 1
+        else:
+            self.stride = delta
+            self.stride_seen = 1
+        if self.stride_seen >= 2:
+            self._read_ahead(page_id + delta, self.window, page_id, delta)
+
+    def _collect_wasted(self):
+        page_table = self.simulator.page_table
+        evicted = [page_id for page_id in self.pending if page_id not in page_table]
+        self.wasted += len(evicted)
+        self.pending.difference_update(evicted)
+
+    def finish(self):
+        """
+        Fecha a contagem: pré-buscadas expulsas sem uso viram desperdício (as que
+        continuam na memória sem uso ficam em pending).
+        """
+        self._collect_wasted()
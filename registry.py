@@ -0,0 +1,122 @@
+import importlib
+import sys
+from importlib.metadata import entry_points
+
+'''
+-------------------------------------------------------------------------------------
+ REGISTRO DE ALGORITMOS
+
+ - Cada política se registra com o decorador @register na própria classe, dizendo
+   nome, apelidos, se precisa do trace inteiro no construtor (olha o futuro, como o
+   OTIMO), quais opções da linha de comando aceita e se é um algoritmo de pilha
+   (curva de faltas numa passada, ver stack_distance.py).
+ - CLI, tabela ALL, workers paralelos e bench constroem os simuladores por aqui
+   (create), sem cadeias de if/elif.
+ - Carga preguiçosa: nenhum módulo de algoritmos é importado até alguém procurar
+   um nome. Os módulos embutidos (ENGINE_MODULES) são importados em ordem até o nome
+   aparecer; plugins externos entram pelo grupo de entry points 'pager.algorithms'
+   (o objeto apontado é importado, e se for uma classe sem @register ela é
+   registrada com o nome do entry point).
+-------------------------------------------------------------------------------------
+'''
+
+ENGINE_MODULES = ['algorithms', 'adaptive', 'dynamic']
+ENTRY_POINT_GROUP = 'pager.algorithms'
+
+class AlgorithmSpec:
+    """Descrição de uma política registrada."""
+    def __init__(self, name, cls, aliases=(), label=None, needs_trace=False, params=(), stack=False):
+        self.name = name
+        self.cls = cls
+        self.aliases = tuple(aliases)
+        self.label = label or name      # Nome curto usado na tabela ALL
+        self.needs_trace = needs_trace  # O construtor recebe o trace inteiro (lookahead)
+        # Opções aceitas pelo construtor: nome do kwarg, ou (kwarg, nome da opção)
+        # quando a opção da linha de comando tem outro nome
+        self.params = tuple(params)
+        self.stack = stack              # Algoritmo de pilha: tem curva em uma passada
+
+    @property
+    def batch(self):
+        # Tem run() próprio (laço apertado) em vez do genérico que chama access()
+        from algorithms import PageReplacementAlgorithm
+        return self.cls.run is not PageReplacementAlgorithm.run
+
+    def create(self, capacity, references=None, **options):
+        kwargs = {}
+        for param in self.params:
+            kwarg, option = param if isinstance(param, tuple) else (param, param)
+            if options.get(option) is not None:
+                kwargs[kwarg] = options[option]
+        if self.needs_trace:
+            return self.cls(capacity, references, **kwargs)
+        return self.cls(capacity, **kwargs)
+
+
+_specs = {}      # nome canônico -> AlgorithmSpec (ordem de registro)
+_names = {}      # nome ou apelido (maiúsculo) -> nome canônico
+_loaded_modules = set()
+_plugins_loaded = False
+
+
+def register(name, aliases=(), label=None, needs_trace=False, params=(), stack=False):
+    """Decorador de classe: registra a política sob `name` (e apelidos)."""
+    def decorator(cls):
+        spec = AlgorithmSpec(name.upper(), cls, [a.upper() for a in aliases], label, needs_trace, params, stack)
+        for key in (spec.name,) + spec.aliases:
+            owner = _names.get(key)
+            if owner is not None and _specs[owner].cls is not cls:
+                raise ValueError(f"algoritmo '{key}' já registrado por {_specs[owner].cls.__name__}")
+            _names[key] = spec.name
+        _specs[spec.name] = spec
+        cls.spec = spec
+        return cls
+    return decorator
+
+
+def _load_module(module_name):
+    if module_name not in _loaded_modules:
+        _loaded_modules.add(module_name)
+        importlib.import_module(module_name)
+
+
+def _load_plugins():
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            target = entry_point.load()
+        except Exception as exc:
+            # Plugin quebrado não derruba o simulador, só fica de fora
+            print(f"Aviso: plugin '{entry_point.name}' não carregou ({exc}).", file=sys.stderr)
+            continue
+        if isinstance(target, type) and 'spec' not in vars(target):
+            register(entry_point.name)(target)
+
+
+def get_spec(name):
+    """Procura a política pelo nome ou apelido; KeyError se não existir."""
+    key = name.upper()
+    if key in _names:
+        return _specs[_names[key]]
+    for module_name in ENGINE_MODULES:
+        _load_module(module_name)
+        if key in _names:
+            return _specs[_names[key]]
+    _load_plugins()
+    return _specs[_names[key]]
+
+
+def available():
+    """Todas as políticas registradas (embutidas e plugins), na ordem de registro."""
+    for module_name in ENGINE_MODULES:
+        _load_module(module_name)
+    _load_plugins()
+    return list(_specs.values())
+
+
+def create(name, capacity, references=None, **options):
+    """Instancia a política `name` com `capacity` frames (ver AlgorithmSpec.create)."""
+    return get_spec(name).create(capacity, references, **options)
@@ -0,0 +1,170 @@
+import math
+from array import array
+
+import registry
+
+'''
+-------------------------------------------------------------------------------------
+ SIMULAÇÃO AMOSTRADA (SHARDS, Waldspurger et al., 2015)
+
+ - Amostragem espacial: a referência fica na amostra se hash(página) < T, com
+   T = taxa * P. Como a decisão é por página, uma página amostrada aparece com
+   TODAS as suas referências, e a localidade entre elas é preservada.
+ - Uma amostra à taxa R enxerga ~R das páginas distintas, então a memória também
+   é escalada: c frames viram c * R frames na simulação amostrada.
+ - Estimador ajustado (SHARDS_adj): as faltas da amostra divididas por R estimam
+   as faltas do trace inteiro, e a taxa é essa estimativa sobre as N referências
+   reais, e não sobre as da amostra. Em cargas concentradas (zipf), pegar ou não
+   uma página muito quente muda bastante o tamanho da amostra, mas quase só em
+   acertos; dividir pela quantidade esperada N * R corrige esse desvio.
+ - Intervalo de confiança: `replicas` amostras independentes (hash com sementes
+   diferentes), uma passada pelo trace para todas; o IC de 95% vem da t de Student
+   sobre as taxas das réplicas.
+ - Algoritmos de pilha (LRU, OTIMO) usam o histograma de distâncias da amostra
+   com as distâncias escaladas por 1 / R (sem arredondar a capacidade); os demais
+   rodam a simulação normal com a capacidade arredondada (pelo menos 1 frame).
+-------------------------------------------------------------------------------------
+'''
+
+SAMPLE_BITS = 24
+SAMPLE_SPACE = 1 << SAMPLE_BITS
+MASK64 = (1 << 64) - 1
+
+# t de Student bicaudal (95%) por graus de liberdade; acima de 30 usa a normal
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+        9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042}
+
+
+def mix64(value):
+    """Finalizador do splitmix64: espalha bem IDs de página sequenciais."""
+    z = (value + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def t_quantile(df):
+    usable = [k for k in T_95 if k <= df]
+    return T_95[max(usable)] if df <= 30 else 1.96
+
+
+def sample_trace(records, rate, replicas=1, seed=0):
+    """
+    Filtra os blocos (páginas, escritas) numa única passada.
+    Devolve (amostras, total de referências lidas); cada amostra é (páginas, escritas),
+    com escritas None se o trace não informa R/W.
+    A decisão de cada página é calculada uma vez e guardada (bitmask das réplicas).
+    """
+    if not 0 < rate <= 1:
+        raise ValueError("a taxa de amostragem deve estar em (0, 1]")
+    threshold = max(1, round(rate * SAMPLE_SPACE))
+    salts = [mix64(seed * 1000003 + replica) for replica in range(replicas)]
+    samples = [(array('q'), bytearray()) for _ in range(replicas)]
+    membership = {}
+    has_writes = False
+    total_refs = 0
+
+    for pages, writes in records:
+        total_refs += len(pages)
+        if writes is not None:
+            has_writes = True
+        for i, page in enumerate(pages):
+            mask = membership.get(page)
+            if mask is None:
+                mask = 0
+                for replica, salt in enumerate(salts):
+                    if mix64(page ^ salt) >> (64 - SAMPLE_BITS) < threshold:
+                        mask |= 1 << replica
+                membership[page] = mask
+            if mask:
+                is_write = writes[i] if writes is not None else 0
+                for replica in range(replicas):
+                    if mask >> replica & 1:
+                        sample_pages, sample_writes = samples[replica]
+                        sample_pages.append(page)
+                        sample_writes.append(is_write)
+
+    return [(pages, writes if has_writes else None) for pages, writes in samples], total_refs
+
+
+def effective_rate(rate):
+    """Taxa realmente usada: o limiar é inteiro dentro de SAMPLE_SPACE."""
+    return max(1, round(rate * SAMPLE_SPACE)) / SAMPLE_SPACE
+
+
+def scaled_capacity(frames, rate):
+    return max(1, round(frames * effective_rate(rate)))
+
+
+def sample_miss_ratios(algo_name, samples, frame_options, rate, total_refs, options=None):
+    """
+    Taxa de faltas estimada por cada amostra para cada quantidade de frames do
+    trace inteiro (total_refs referências). Retorna uma lista (uma por réplica) de
+    listas (uma por frames).
+    """
+    spec = registry.get_spec(algo_name)
+    rate = effective_rate(rate)
+    expected_refs = total_refs * rate
+    ratios = []
+    for pages, writes in samples:
+        if not len(pages):
+            ratios.append([0.0] * len(frame_options))
+            continue
+
+        if spec.stack:
+            from stack_distance import STACK_ENGINES
+
+            histogram, cold_misses = STACK_ENGINES[spec.name](pages)
+            # Falta com c frames <=> distância escalada d / R > c
+            scaled = sorted((distance / rate, count) for distance, count in histogram.items())
+            row = []
+            for frames in frame_options:
+                misses = cold_misses + sum(count for distance, count in scaled if distance > frames)
+                row.append(min(1.0, misses / expected_refs))
+            ratios.append(row)
+            continue
+
+        row = []
+        for frames in frame_options:
+            capacity = scaled_capacity(frames, rate)
+            simulator = spec.create(capacity, pages, **(options or {}), max_frames=capacity)
+            simulator.run(pages, writes=writes)
+            row.append(min(1.0, simulator.page_faults / expected_refs))
+        ratios.append(row)
+    return ratios
+
+
+def confidence_interval(values):
+    """(média, meia-largura do IC de 95%); meia-largura None com uma réplica só."""
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return mean, None
+    variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+    return mean, t_quantile(len(values) - 1) * math.sqrt(variance / len(values))
+
+
+def estimate(algo_name, samples, frame_options, rate, total_refs, options=None):
+    """Para cada quantidade de frames: (taxa estimada, meia-largura do IC 95% ou None)."""
+    ratios = sample_miss_ratios(algo_name, samples, frame_options, rate, total_refs, options)
+    return [confidence_interval([row[i] for row in ratios]) for i in range(len(frame_options))]
+
+
+def exact_miss_ratios(algo_name, references, writes, frame_options, options=None):
+    """Curva exata no trace inteiro (uma passada para algoritmos de pilha)."""
+    spec = registry.get_spec(algo_name)
+    total = len(references)
+    if not total:
+        return [0.0] * len(frame_options)
+    if spec.stack:
+        from stack_distance import STACK_ENGINES, fault_curve
+
+        histogram, cold_misses = STACK_ENGINES[spec.name](references)
+        faults = fault_curve(histogram, cold_misses, max(frame_options))
+        return [faults[frames] / total for frames in frame_options]
+
+    ratios = []
+    for frames in frame_options:
+        simulator = spec.create(frames, references, **(options or {}), max_frames=frames)
+        simulator.run(references, writes=writes)
+        ratios.append(simulator.page_faults / total)
+    return ratios
@@ -0,0 +1,142 @@
+from array import array
+
+'''
+-------------------------------------------------------------------------------------
+ DISTÂNCIA DE PILHA (Mattson et al., 1970)
+
+ - LRU e OTIMO são "algoritmos de pilha": o conjunto residente com c frames está
+   sempre contido no conjunto residente com c + 1 frames.
+ - Por isso basta uma passada no trace calculando, para cada referência, a sua
+   profundidade na pilha: a referência é falta com c frames se e somente se a
+   profundidade for maior que c. Um único histograma dá as faltas para TODOS os c.
+ - O LFU deste projeto zera o contador da vítima, então não tem a propriedade de
+   inclusão e continua precisando de uma simulação por quantidade de frames.
+-------------------------------------------------------------------------------------
+'''
+
+class FenwickTree:
+    """
+    Árvore de Fenwick (Binary Indexed Tree) sobre posições 0..size-1.
+    Soma de prefixo e atualização pontual em O(log n).
+    """
+    def __init__(self, size):
+        self.size = size
+        self.tree = array('l', [0]) * (size + 1)
+
+    def add(self, pos, delta):
+        pos += 1
+        tree = self.tree
+        while pos <= self.size:
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def prefix_sum(self, pos):
+        # Soma das posições 0..pos (inclusive)
+        pos += 1
+        total = 0
+        tree = self.tree
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+
+def lru_stack_histogram(references):
+    """
+    Distâncias de pilha do LRU em O(N log N).
+    A árvore marca com 1 a posição do último acesso de cada página; a distância de
+    uma referência é 1 + o número de páginas distintas acessadas desde o último
+    acesso à mesma página (marcas depois dessa posição).
+    Retorna (histograma {distância: quantidade}, faltas compulsórias).
+    """
+    references = references if hasattr(references, '__len__') else list(references)
+    tree = FenwickTree(len(references))
+    last_access = {}
+    histogram = {}
+    cold_misses = 0
+
+    for t, page in enumerate(references):
+        previous = last_access.get(page)
+        if previous is None:
+            cold_misses += 1
+        else:
+            distance = len(last_access) - tree.prefix_sum(previous) + 1
+            histogram[distance] = histogram.get(distance, 0) + 1
+            tree.add(previous, -1)
+        tree.add(t, 1)
+        last_access[page] = t
+
+    return histogram, cold_misses
+
+
+def opt_stack_histogram(references):
+    """
+    Distâncias de pilha do OTIMO pelo algoritmo de prioridade de Mattson.
+    A prioridade de uma página é o seu próximo uso (quanto mais cedo, maior).
+    Ao referenciar a página na profundidade d, ela vai para o topo e as páginas
+    das posições 1..d-1 descem "disputando" cada posição: fica a de maior prioridade
+    e a outra continua descendo até ocupar o buraco deixado na profundidade d.
+    Custo O(N * D), D = profundidade média; não existe versão O(N log N) simples.
+    Retorna (histograma {distância: quantidade}, faltas compulsórias).
+    """
+    references = references if hasattr(references, '__len__') else list(references)
+    trace_len = len(references)
+
+    # Próximo uso de cada referência (mesma passada de trás pra frente do OTIMO)
+    next_use = array('q', [trace_len]) * trace_len
+    last_seen = {}
+    for i in range(trace_len - 1, -1, -1):
+        page = references[i]
+        next_use[i] = last_seen.get(page, trace_len)
+        last_seen[page] = i
+
+    stack = []      # stack[0] é o topo
+    priority = {}   # página -> próximo uso
+    histogram = {}
+    cold_misses = 0
+
+    for t, page in enumerate(references):
+        if page in priority:
+            depth = stack.index(page)  # 0-based
+            histogram[depth + 1] = histogram.get(depth + 1, 0) + 1
+        else:
+            cold_misses += 1
+            depth = len(stack)
+            stack.append(page)
+        priority[page] = next_use[t]
+
+        if depth > 0:
+            carried = stack[0]
+            stack[0] = page
+            for i in range(1, depth):
+                resident = stack[i]
+                # Fica na posição quem será usado antes; a outra continua descendo
+                if priority[carried] < priority[resident]:
+                    stack[i] = carried
+                    carried = resident
+            stack[depth] = carried
+
+    return histogram, cold_misses
+
+
+def fault_curve(histogram, cold_misses, max_frames):
+    """
+    Converte o histograma de distâncias em faltas por quantidade de frames.
+    Retorna uma lista onde o índice c (1..max_frames) tem as faltas com c frames;
+    o índice 0 fica com o total de referências (com 0 frames tudo é falta).
+    """
+    total_refs = cold_misses + sum(histogram.values())
+    faults = [0] * (max_frames + 1)
+    faults[0] = total_refs
+
+    # faltas(c) = faltas(c - 1) - referências com distância exatamente c
+    for frames in range(1, max_frames + 1):
+        faults[frames] = faults[frames - 1] - histogram.get(frames, 0)
+
+    return faults
+
+
+STACK_ENGINES = {
+    'LRU': lru_stack_histogram,
+    'OTIMO': opt_stack_histogram,
+}
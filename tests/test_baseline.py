@@ -0,0 +1,86 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import baseline_algorithms as baseline
+import registry
+from traces import load_trace
+
+'''
+-------------------------------------------------------------------------------------
+ REGRESSÃO CONTRA A VERSÃO ORIGINAL
+
+ - baseline_algorithms.py é a cópia congelada das classes originais (listas com
+   varredura linear). As otimizações não podem mudar nenhum resultado: com o trace
+   do livro e com traces aleatórios, cada política termina com as mesmas faltas,
+   evicções e memória (frame a frame) que a original.
+ - O access() é comparado referência a referência e o run() (os laços rápidos) no
+   fim do trace, numa instância nova.
+ - Rodar da raiz: python -m pytest tests  (ou python -m unittest discover -s tests)
+-------------------------------------------------------------------------------------
+'''
+
+# Política atual -> (classe original, opções que reproduzem o comportamento original)
+CASES = {
+    'FIFO': (baseline.FIFO, {}),
+    'LRU': (baseline.LRU, {}),
+    'OTIMO': (baseline.OTIMO, {}),
+    'SC': (baseline.SECONDCHANCE, {}),
+    'CLOCK': (baseline.CLOCK, {}),
+    'NRU': (baseline.NRU, {'reset_interval': 10, 'write_predicate': 'even'}),
+    'LFU': (baseline.LFU, {'tie_break': 'frame'}),
+    'MFU': (baseline.MFU, {'tie_break': 'frame'}),
+}
+
+
+def create_baseline(name, capacity, references):
+    cls = CASES[name][0]
+    return cls(capacity, list(references)) if name == 'OTIMO' else cls(capacity)
+
+
+def create_current(name, capacity, references):
+    return registry.create(name, capacity, references, **CASES[name][1])
+
+
+class BaselineRegressionTest(unittest.TestCase):
+    def assert_same_replay(self, name, capacity, references):
+        original = create_baseline(name, capacity, references)
+        current = create_current(name, capacity, references)
+        context = f"{name}, {capacity} frames"
+        for step, page_id in enumerate(references):
+            original_hit = bool(original.access(page_id))
+            current_hit = current.access(page_id)
+            self.assertEqual(current_hit, original_hit, f"{context}, referência {step}")
+            self.assertEqual(list(current.memory), original.memory, f"{context}, referência {step}")
+
+        batched = create_current(name, capacity, references)
+        batched.run(references)
+        for simulator in (current, batched):
+            self.assertEqual(simulator.page_faults, original.page_faults, context)
+            self.assertEqual(simulator.evictions, original.evictions, context)
+            self.assertEqual(list(simulator.memory), original.memory, context)
+
+    def test_shipped_trace(self):
+        references = list(load_trace(ROOT / 'silberschatz2001.trace'))
+        for name in CASES:
+            for capacity in range(1, 8):
+                with self.subTest(policy=name, frames=capacity):
+                    self.assert_same_replay(name, capacity, references)
+
+    def test_random_traces(self):
+        rng = random.Random(2001)
+        for trial in range(40):
+            pages = rng.randint(2, 40)
+            references = [rng.randrange(pages) for _ in range(rng.randint(1, 300))]
+            capacity = rng.randint(1, 10)
+            for name in CASES:
+                with self.subTest(policy=name, trial=trial, frames=capacity):
+                    self.assert_same_replay(name, capacity, references)
+
+
+if __name__ == '__main__':
+    unittest.main()
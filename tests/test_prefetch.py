@@ -0,0 +1,50 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import registry
+from prefetch import Prefetcher
+
+'''
+-------------------------------------------------------------------------------------
+ PRÉ-BUSCA
+
+ - Num trace puramente sequencial (o melhor caso do ondemand) a janela tem de caber
+   na memória: com poucos frames quase nenhuma página pré-buscada pode sair sem uso.
+ - A leitura antecipada nunca expulsa a página que acabou de ser pedida.
+-------------------------------------------------------------------------------------
+'''
+
+SEQUENTIAL = list(range(1000))
+
+
+class OnDemandTest(unittest.TestCase):
+    def test_sequential_trace_wastes_almost_nothing(self):
+        for name in ('FIFO', 'LRU', '2Q', 'WS'):
+            for frames in (4, 8, 16, 40):
+                with self.subTest(policy=name, frames=frames):
+                    prefetcher = Prefetcher(registry.create(name, frames), 'ondemand', 4, 32)
+                    prefetcher.run(SEQUENTIAL)
+                    prefetcher.finish()
+                    self.assertLessEqual(prefetcher.demand_faults, 10)
+                    self.assertLessEqual(prefetcher.wasted, prefetcher.prefetches // 100)
+
+
+class AdmitTest(unittest.TestCase):
+    def test_demanded_page_stays_resident(self):
+        references = [100, 200, 300, 100, 200, 300, 100, 200, 300, 500]
+        for name in ('LFU', 'MFU'):
+            for tie_break in ('frame', 'fifo'):
+                with self.subTest(policy=name, tie_break=tie_break):
+                    simulator = registry.create(name, 4, tie_break=tie_break)
+                    prefetcher = Prefetcher(simulator, 'fixed', 3)
+                    for page_id in references:
+                        prefetcher.access(page_id)
+                        self.assertIn(page_id, simulator.page_table)
+                    self.assertEqual(simulator.page_faults, prefetcher.demand_faults)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,419 @@
+import io
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+
+'''
+-------------------------------------------------------------------------------------
+ LEITURA DE TRACES
+
+ - Formato texto: um número de página (inteiro) por linha, opcionalmente seguido de
+   R (leitura) ou W (escrita): "7", "7 R", "7 W". Linhas vazias são ignoradas.
+   Trace sem nenhuma marca não informa escritas (escritas = None); se o arquivo
+   tem alguma marca, toda linha sem marca conta como leitura, esteja antes ou
+   depois da primeira marca. Os leitores em fluxo procuram uma marca no arquivo
+   antes de começar (busca em C sobre o mmap), então a regra é a mesma em todos.
+   Um pipe (--trace <(zcat trace.gz)) não pode ser percorrido antes: como na
+   leitura ao vivo, os blocos anteriores à primeira marca ficam sem escritas.
+ - Formato binário: cabeçalho de 32 bytes seguido das páginas como inteiros sem sinal
+   little-endian de largura fixa (4 ou 8 bytes) e, se o trace tem escritas, de um
+   byte por referência (1 = escrita). É lido via mmap + memoryview, sem nenhum
+   parsing nem cópia (vindo de um pipe, é lido inteiro para a memória). O formato
+   é detectado pelos bytes mágicos do cabeçalho, espiados (peek) no mesmo arquivo
+   aberto que depois é lido, então nada se perde numa entrada que não volta atrás.
+ - iter_trace_records: lê o arquivo em blocos (páginas, escritas), com as páginas em
+   array('q') (8 bytes por referência) e as escritas em bytearray (1 = escrita), ou
+   None enquanto o trace não trouxe nenhuma marca R/W. Os algoritmos que não olham
+   o futuro rodam em memória constante consumindo os blocos; iter_trace_chunks
+   entrega só as páginas.
+ - load_trace / load_trace_records: carregam o trace inteiro em arrays compactos,
+   para quem precisa do futuro (OTIMO, curva de faltas) ou de várias passadas (ALL).
+ - iter_trace_segments: como iter_trace_records, mas a partir de uma posição salva
+   (índice da referência no binário, byte no texto) e devolvendo a posição depois
+   de cada bloco, para retomar a leitura de um trace que ainda está crescendo.
+ - load_pid_trace: trace texto de vários processos ("<pid> <página> [R/W]"), já
+   separado por processo para o simulador de multiprogramação.
+-------------------------------------------------------------------------------------
+'''
+
+CHUNK_SIZE = 1 << 16
+
+# Cabeçalho binário: mágica, versão, largura (bytes por página), flags,
+# quantidade de referências e maior ID de página
+BINARY_MAGIC = b'PGTRACE\0'
+BINARY_VERSION = 1
+HEADER = struct.Struct('<8sHHIQQ')
+WIDTH_CODES = {4: 'I', 8: 'Q'}
+FLAG_WRITES = 0x1  # Depois das páginas vem um byte R/W por referência
+# Num trace de páginas válido as únicas letras são as marcas R/W
+MARK_PATTERN = re.compile(rb'[RWrw]')
+
+class TraceFormatError(ValueError):
+    """Linha do trace que não é um número inteiro (seguido ou não de R/W)."""
+    def __init__(self, line_number, line):
+        super().__init__(f"linha {line_number}: {line!r}")
+        self.line_number = line_number
+        self.line = line
+
+
+def open_trace(path):
+    """
+    Abre o trace uma única vez e detecta o formato espiando o buffer (peek), sem
+    consumir nada: serve também para pipes. Devolve (arquivo aberto em binário,
+    é binário?).
+    """
+    trace_file = open(path, 'rb')
+    return trace_file, trace_file.peek(len(BINARY_MAGIC))[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+
+def is_binary_trace(path):
+    """
+    Detecta o formato binário pelos bytes mágicos do início do arquivo. Pipes e
+    FIFOs não são abertos de novo (a leitura consumiria a entrada): para eles use
+    open_trace.
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def read_binary_header(path):
+    """Retorna (quantidade, largura, maior página, flags) do cabeçalho binário."""
+    with open(path, 'rb') as f:
+        return _parse_header(f.read(HEADER.size))
+
+
+def _parse_header(raw):
+    if len(raw) < HEADER.size:
+        raise TraceFormatError(0, 'cabeçalho binário truncado')
+    magic, version, width, flags, count, max_page = HEADER.unpack(raw)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION or width not in WIDTH_CODES:
+        raise TraceFormatError(0, 'cabeçalho binário inválido')
+    return count, width, max_page, flags
+
+
+def map_binary_records(path):
+    """
+    Mapeia o trace binário em memória e devolve (páginas, escritas):
+    páginas é uma memoryview de inteiros (indexável, fatiável, len() em O(1))
+    apontando direto para o arquivo; escritas é uma memoryview de bytes ou None.
+    O mmap fica vivo enquanto as memoryviews existirem.
+    """
+    with open(path, 'rb') as f:
+        return map_binary_file(f)
+
+
+def map_binary_file(trace_file):
+    """
+    map_binary_records sobre um arquivo já aberto (open_trace). O que não pode ser
+    mapeado (pipe) é lido inteiro para a memória.
+    """
+    try:
+        mapped = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        mapped = trace_file.read()
+    count, width, _max_page, flags = _parse_header(mapped[:HEADER.size])
+
+    pages_end = HEADER.size + count * width
+    end = pages_end + (count if flags & FLAG_WRITES else 0)
+    if len(mapped) < end:
+        raise TraceFormatError(0, 'trace binário truncado')
+
+    view = memoryview(mapped)
+    writes = view[pages_end:end] if flags & FLAG_WRITES else None
+    pages = view[HEADER.size:pages_end]
+    if sys.byteorder == 'little':
+        return pages.cast(WIDTH_CODES[width]), writes
+
+    # Máquina big-endian: não dá para usar os bytes direto, faz uma cópia invertida
+    references = array(WIDTH_CODES[width])
+    references.frombytes(pages)
+    references.byteswap()
+    return references, writes
+
+
+def map_binary_trace(path):
+    """Só as páginas do trace binário (memoryview sobre o mmap)."""
+    return map_binary_records(path)[0]
+
+
+def write_binary_trace(source_path, output_path, width=None):
+    """
+    Converte um trace (texto ou binário) para o formato binário.
+    Primeira passada em fluxo descobre a quantidade, a maior página (para escolher
+    a largura quando não informada) e se há escritas; a segunda grava tudo.
+    Retorna (quantidade, largura, maior página).
+    """
+    return _write_binary(lambda: iter_trace_records(source_path), output_path, width)
+
+
+def dump_binary_trace(references, output_path, width=None, writes=None):
+    """Grava uma sequência de páginas (e escritas) já em memória no formato binário."""
+    return _write_binary(lambda: ((references, writes),), output_path, width)
+
+
+def _write_binary(open_records, output_path, width):
+    count = 0
+    max_page = 0
+    has_writes = False
+    for pages, writes in open_records():
+        count += len(pages)
+        if len(pages):
+            max_page = max(max_page, max(pages))
+            if min(pages) < 0:
+                raise TraceFormatError(0, 'páginas negativas não cabem no formato binário')
+        if writes is not None:
+            has_writes = True
+
+    if width is None:
+        width = 4 if max_page < (1 << 32) else 8
+    if width not in WIDTH_CODES or max_page >= (1 << (8 * width)):
+        raise ValueError(f"largura de {width} bytes não comporta a página {max_page}")
+
+    flags = FLAG_WRITES if has_writes else 0
+    with open(output_path, 'wb') as out:
+        out.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, width, flags, count, max_page))
+
+        # Páginas e escritas ficam em regiões diferentes do arquivo: cada bloco é
+        # gravado na posição corrente de cada região
+        page_pos = HEADER.size
+        write_pos = HEADER.size + count * width
+        for pages, writes in open_records():
+            packed = array(WIDTH_CODES[width], pages)
+            if sys.byteorder != 'little':
+                packed.byteswap()
+            out.seek(page_pos)
+            out.write(packed.tobytes())
+            page_pos += len(packed) * width
+            if has_writes:
+                out.seek(write_pos)
+                out.write(bytes(writes) if writes is not None else bytes(len(pages)))
+                write_pos += len(pages)
+
+    return count, width, max_page
+
+
+def iter_trace_records(path, chunk_size=CHUNK_SIZE):
+    """
+    Gera blocos (páginas, escritas) com até chunk_size referências: array('q') e
+    bytearray para o formato texto, fatias (sem cópia) das memoryviews para o binário.
+    O arquivo é aberto já na chamada, então FileNotFoundError sai aqui e não no
+    meio da simulação; TraceFormatError sai ao chegar na linha inválida.
+    """
+    trace_file, binary = open_trace(path)
+    if binary:
+        with trace_file:
+            references, writes = map_binary_file(trace_file)
+        return ((references[i:i + chunk_size], writes[i:i + chunk_size] if writes is not None else None)
+                for i in range(0, len(references), chunk_size))
+
+    marked = has_marks(trace_file)
+    return _read_records(io.TextIOWrapper(trace_file), chunk_size, marked)
+
+
+def has_marks(trace_file, position=0):
+    """
+    O trace texto (aberto em binário) tem alguma marca R/W a partir de `position`?
+    Busca sobre o mmap, sem mexer na posição de leitura; onde não há mmap, varre
+    em blocos e volta para onde estava. Um pipe não pode ser percorrido antes da
+    leitura: devolve False e vale a regra da leitura ao vivo.
+    """
+    try:
+        mapped = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        return False  # Arquivo vazio não pode ser mapeado
+    except OSError:
+        if not trace_file.seekable():
+            return False
+        return _scan_marks(trace_file, position)
+    with mapped:
+        return MARK_PATTERN.search(mapped, position) is not None
+
+
+def _scan_marks(trace_file, position):
+    start = trace_file.tell()
+    trace_file.seek(position)
+    try:
+        for block in iter(lambda: trace_file.read(1 << 20), b''):
+            if MARK_PATTERN.search(block):
+                return True
+        return False
+    finally:
+        trace_file.seek(start)
+
+
+def _read_records(trace_file, chunk_size, marked):
+    with trace_file:
+        chunk = array('q')
+        write_positions = []
+        for line_number, line in enumerate(trace_file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                chunk.append(int(line))
+            except ValueError:
+                # Linha com marca de acesso: "<página> R" ou "<página> W"
+                parts = line.split()
+                if len(parts) != 2 or parts[1].upper() not in ('R', 'W'):
+                    raise TraceFormatError(line_number, line) from None
+                try:
+                    page = int(parts[0])
+                except ValueError:
+                    raise TraceFormatError(line_number, line) from None
+                if parts[1].upper() == 'W':
+                    write_positions.append(len(chunk))
+                marked = True
+                chunk.append(page)
+            if len(chunk) >= chunk_size:
+                yield chunk, _writes_of(len(chunk), write_positions) if marked else None
+                chunk = array('q')
+                write_positions = []
+        if chunk:
+            yield chunk, _writes_of(len(chunk), write_positions) if marked else None
+
+
+def _writes_of(length, write_positions):
+    writes = bytearray(length)
+    for pos in write_positions:
+        writes[pos] = 1
+    return writes
+
+
+def iter_trace_segments(path, position=0, marked=False, chunk_size=CHUNK_SIZE):
+    """
+    Gera blocos (páginas, escritas, posição) a partir de `position`; a posição
+    devolvida é onde a leitura continua depois do bloco (referência no binário,
+    byte no texto). marked diz se a parte já lida tinha marcas R/W; senão o resto
+    do arquivo é procurado (has_marks), como em iter_trace_records. Linhas já
+    processadas antes de uma marca acrescentada depois não são revistas.
+    No texto, uma última linha sem quebra de linha fica de fora: pode ser uma linha
+    que o produtor ainda está gravando. Números de linha nos erros contam a partir
+    de `position`.
+    """
+    trace_file, binary = open_trace(path)
+    if not trace_file.seekable():
+        trace_file.close()
+        raise ValueError("o checkpoint guarda uma posição no trace, que precisa ser um arquivo (não um pipe)")
+    if binary:
+        with trace_file:
+            references, writes = map_binary_file(trace_file)
+        if position > len(references):
+            raise ValueError(f"posição {position} além do fim do trace ({len(references)} referências)")
+        return ((references[i:i + chunk_size], writes[i:i + chunk_size] if writes is not None else None,
+                 min(i + chunk_size, len(references)))
+                for i in range(position, len(references), chunk_size))
+
+    trace_file.seek(0, 2)
+    if position > trace_file.tell():
+        trace_file.close()
+        raise ValueError(f"posição {position} além do fim do arquivo (o trace foi truncado?)")
+    trace_file.seek(position)
+    return _read_segments(trace_file, position, marked or has_marks(trace_file, position), chunk_size)
+
+
+def _read_segments(trace_file, position, marked, chunk_size):
+    # Mesmo parsing de _read_records, em bytes (int() aceita bytes com espaços)
+    with trace_file:
+        chunk = array('q')
+        write_positions = []
+        for line_number, line in enumerate(trace_file, 1):
+            if not line.endswith(b'\n'):
+                break
+            position += len(line)
+            if not line.strip():
+                continue
+            try:
+                chunk.append(int(line))
+            except ValueError:
+                parts = line.split()
+                if len(parts) != 2 or parts[1].upper() not in (b'R', b'W'):
+                    raise TraceFormatError(line_number, line.decode(errors='replace').strip()) from None
+                try:
+                    page = int(parts[0])
+                except ValueError:
+                    raise TraceFormatError(line_number, line.decode(errors='replace').strip()) from None
+                if parts[1].upper() == b'W':
+                    write_positions.append(len(chunk))
+                marked = True
+                chunk.append(page)
+            if len(chunk) >= chunk_size:
+                yield chunk, _writes_of(len(chunk), write_positions) if marked else None, position
+                chunk = array('q')
+                write_positions = []
+        if chunk:
+            yield chunk, _writes_of(len(chunk), write_positions) if marked else None, position
+
+
+def iter_trace_chunks(path, chunk_size=CHUNK_SIZE):
+    """Gera só as páginas de cada bloco (ignora as marcas R/W)."""
+    records = iter_trace_records(path, chunk_size)
+    return (pages for pages, _writes in records)
+
+
+def iter_trace(path):
+    """Gera as páginas uma a uma (em fluxo, memória constante)."""
+    chunks = iter_trace_chunks(path)
+    return (page for chunk in chunks for page in chunk)
+
+
+def load_trace_records(path):
+    """
+    Trace inteiro indexável: (páginas, escritas). Binário: memoryviews sobre o mmap
+    (sem parsing); texto: array('q') e bytearray montados em fluxo.
+    escritas é None quando o trace não tem nenhuma escrita.
+    """
+    trace_file, binary = open_trace(path)
+    if binary:
+        with trace_file:
+            return map_binary_file(trace_file)
+
+    references = array('q')
+    writes = None
+    marked = has_marks(trace_file)
+    for pages, chunk_writes in _read_records(io.TextIOWrapper(trace_file), CHUNK_SIZE, marked):
+        if chunk_writes is not None and writes is None:
+            writes = bytearray(len(references))
+        if writes is not None:
+            writes.extend(chunk_writes if chunk_writes is not None else bytes(len(pages)))
+        references.extend(pages)
+    return references, writes
+
+
+def load_trace(path):
+    """Só as páginas do trace inteiro (ver load_trace_records)."""
+    return load_trace_records(path)[0]
+
+
+def load_pid_trace(path):
+    """
+    Trace de vários processos em texto: "<pid> <página>" ou "<pid> <página> R/W" por
+    linha. Devolve {pid: (páginas, escritas)} na ordem em que os pids aparecem, com
+    as mesmas regras de load_trace_records (escritas None sem nenhuma marca R/W).
+    """
+    processes = {}
+    marked = False
+    with open(path, 'r') as trace_file:
+        for line_number, line in enumerate(trace_file, 1):
+            parts = line.split()
+            if not parts:
+                continue
+            if len(parts) not in (2, 3) or (len(parts) == 3 and parts[2].upper() not in ('R', 'W')):
+                raise TraceFormatError(line_number, line.strip())
+            try:
+                pid, page = int(parts[0]), int(parts[1])
+            except ValueError:
+                raise TraceFormatError(line_number, line.strip()) from None
+
+            if pid not in processes:
+                processes[pid] = (array('q'), bytearray())
+            pages, writes = processes[pid]
+            pages.append(page)
+            writes.append(1 if len(parts) == 3 and parts[2].upper() == 'W' else 0)
+            marked = marked or len(parts) == 3
+
+    return {pid: (pages, writes if marked else None) for pid, (pages, writes) in processes.items()}
@@ -0,0 +1,80 @@
+import bisect
+import itertools
+import random
+from array import array
+
+'''
+-------------------------------------------------------------------------------------
+ CARGAS SINTÉTICAS
+
+ Geradores de traces reprodutíveis (mesma semente -> mesmo trace) para medir os
+ algoritmos sem depender de arquivos. Todos devolvem array('q') com `length`
+ referências sobre as páginas 0..pages-1.
+
+ - uniform: páginas sorteadas uniformemente (sem localidade nenhuma).
+ - zipf: página de posto k sorteada com probabilidade proporcional a 1 / k^skew;
+   skew = 0 é uniforme, skew ~1 é o caso típico de cache, maior = mais concentrado.
+ - seq: varredura sequencial 0, 1, 2, ... (recomeça do 0 depois da última página).
+ - loop: laço sobre `loop_size` páginas repetido (padrão: um quarto de `pages`, para
+   não repetir a seq); com frames < loop_size o LRU e o FIFO erram todas as
+   referências, o pior caso clássico.
+ - phases: o conjunto de trabalho (`working_set` páginas) muda a cada `phase`
+   referências; dentro da fase os acessos são uniformes (Denning).
+-------------------------------------------------------------------------------------
+'''
+
+def uniform(length, pages, seed=42):
+    rng = random.Random(seed)
+    return array('q', (rng.randrange(pages) for _ in range(length)))
+
+
+def zipf(length, pages, skew=1.0, seed=42):
+    """Zipf truncado em `pages` páginas; os postos são embaralhados entre as páginas."""
+    rng = random.Random(seed)
+    cumulative = list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, pages + 1)))
+    total = cumulative[-1]
+
+    # Sem embaralhar, a página 0 seria sempre a mais quente
+    ranked_pages = list(range(pages))
+    rng.shuffle(ranked_pages)
+
+    search = bisect.bisect_left
+    draw = rng.random
+    return array('q', (ranked_pages[search(cumulative, draw() * total)] for _ in range(length)))
+
+
+def sequential(length, pages, seed=42):
+    return array('q', (i % pages for i in range(length)))
+
+
+def loop(length, pages, loop_size=None, seed=42):
+    loop_size = min(loop_size or max(pages // 4, 1), pages)
+    return array('q', (i % loop_size for i in range(length)))
+
+
+def phases(length, pages, working_set=None, phase=None, seed=42):
+    """Cada fase sorteia um novo conjunto de trabalho entre as `pages` páginas."""
+    rng = random.Random(seed)
+    working_set = min(working_set or max(pages // 8, 1), pages)
+    phase = phase or max(length // 10, 1)
+
+    references = array('q')
+    while len(references) < length:
+        current = rng.sample(range(pages), working_set)
+        count = min(phase, length - len(references))
+        references.extend(current[rng.randrange(working_set)] for _ in range(count))
+    return references
+
+
+WORKLOADS = {
+    'uniform': uniform,
+    'zipf': zipf,
+    'seq': sequential,
+    'loop': loop,
+    'phases': phases,
+}
+
+
+def generate(name, length, pages, seed=42, **params):
+    """Gera a carga `name` (ver WORKLOADS); params extras vão para o gerador."""
+    return WORKLOADS[name](length, pages, seed=seed, **params)